@@ -34,10 +34,9 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
-import ipaddress
-import signal
 
 """nrfutil command line tool."""
+import json
 import os
 import sys
 import click
@@ -46,17 +45,12 @@ import logging
 import re
 sys.path.append(os.getcwd())
 
-from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
-from nordicsemi.dfu.dfu import Dfu
+# Only lightweight modules are imported here. The commands import the modules they use
+# themselves, so that short commands like 'version' or 'pkg display' start quickly.
 from nordicsemi.dfu.dfu_transport import DfuEvent, TRANSPORT_LOGGING_LEVEL
-from nordicsemi.dfu.dfu_transport_serial import DfuTransportSerial
-from nordicsemi.dfu.package import Package
 from nordicsemi import version as nrfutil_version
-from nordicsemi.dfu.signing import Signing
 from nordicsemi.zigbee.prod_config import ProductionConfig, ProductionConfigWrongException, ProductionConfigTooLargeException
 from pc_ble_driver_py.exceptions import NordicSemiException
-from nordicsemi.lister.device_lister import DeviceLister
-import spinel.util as util
 
 logger = logging.getLogger(__name__)
 
@@ -203,6 +197,13 @@ BOOT_VALIDATION_ARGS = [
 ]
 DEFAULT_BOOT_VALIDATION = 'VALIDATE_GENERATED_CRC'
 
+# Keys of Package.ZIP_COMPRESSION_TYPES
+ZIP_COMPRESSION_ARGS = [
+    'stored',
+    'deflated',
+]
+DEFAULT_ZIP_COMPRESSION = 'stored'
+
 KEY_CHOICE = ['pk', 'sk']
 KEY_FORMAT = [
     'hex',
@@ -326,6 +327,11 @@ def settings():
               help='The private (signing) key in PEM format. Needed for ECDSA Boot Validation.',
               required=False,
               type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--signing-socket',
+              help='Sign through the signing service listening on this socket (see "keys serve"), '
+                   'instead of using --key-file.',
+              required=False,
+              type=click.Path(dir_okay=False))
 def generate(hex_file,
              family,
              application,
@@ -339,7 +345,9 @@ def generate(hex_file,
              app_boot_validation,
              sd_boot_validation,
              softdevice,
-             key_file):
+             key_file,
+             signing_socket):
+    from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
 
     # The user can specify the application version with two different
     # formats. As an integer, e.g. 102130, or as a string
@@ -375,12 +383,9 @@ def generate(hex_file,
 
     # load signing key (if needed) only once
     if 'VALIDATE_ECDSA_P256_SHA256' in (app_boot_validation, sd_boot_validation):
-        if not os.path.isfile(key_file):
+        if signing_socket is None and (key_file is None or not os.path.isfile(key_file)):
             raise click.UsageError("Key file must be given when 'VALIDATE_ECDSA_P256_SHA256' boot validation is used")
-        signer = Signing()
-        default_key = signer.load_key(key_file)
-        if default_key:
-            display_sec_warning()
+        signer = load_signer(key_file, signing_socket)
     else:
         signer = None
 
@@ -407,10 +412,69 @@ def generate(hex_file,
 
     click.echo("{0}".format(str(sett)))
 
+@settings.command(name='generate-batch', short_help='Generate several .hex files with Bootloader DFU settings from a spec file.')
+@click.argument('spec_file',
+                required=True,
+                type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.option('-j', '--jobs',
+              help='Number of worker processes. If not specified, the number of CPUs is used.',
+              type=click.IntRange(1, None),
+              required=False)
+@click.option('--index',
+              help='Store a JSON summary of the generated settings in this file.',
+              type=click.Path(),
+              required=False)
+def generate_batch(spec_file, jobs, index):
+    """
+    Generate a settings .hex file for each entry of a JSON or YAML spec file, using a pool of worker processes.
+    Each distinct application and SoftDevice image is converted and hashed only once.
+
+    SPEC_FILE holds a list of settings specs. Each spec uses the option names of 'settings generate',
+    with '_' instead of '-', and the output filename as 'hex_file'. Relative paths are resolved
+    against the directory of SPEC_FILE. Example YAML content:
+
+    \b
+        - hex_file: settings_app3.hex
+          family: NRF52840
+          application: app.hex
+          application_version: 3
+          bootloader_version: 1
+          bl_settings_version: 2
+    """
+    from nordicsemi.dfu.settings_batch import load_settings_spec, generate_settings
+    from nordicsemi.dfu.package_batch import PackageSpecException
+    from nordicsemi.dfu.signing import Signing
+
+    try:
+        specs = load_settings_spec(spec_file)
+        for key_file in sorted(set(spec['key_file'] for spec in specs if spec.get('key_file'))):
+            if os.path.isfile(key_file) and Signing().load_key(key_file):
+                display_sec_warning()
+        for signing_socket in sorted(set(spec['signing_socket'] for spec in specs if spec.get('signing_socket'))):
+            load_signer(None, signing_socket)
+        results = generate_settings(specs, jobs=jobs, index_file=index)
+    except PackageSpecException as e:
+        raise click.UsageError(str(e))
+
+    failed = 0
+    for result in results:
+        if 'error' in result:
+            failed += 1
+            click.echo("Failed to generate {0}: {1}".format(result['hex_file'], result['error']))
+        else:
+            click.echo("Generated Bootloader DFU settings .hex file and stored it in: {0}".format(result['hex_file']))
+
+    if index:
+        click.echo("Settings index stored in {0}".format(index))
+
+    if failed:
+        raise click.ClickException("{0} of {1} settings failed".format(failed, len(results)))
+
 @settings.command(short_help='Display the contents of a .hex file with Bootloader DFU settings.')
 @click.argument('hex_file', required=True, type=click.Path())
 
 def display(hex_file):
+    from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
 
     sett = BLDFUSettings()
     try:
@@ -421,6 +485,228 @@ def display(hex_file):
     click.echo("{0}".format(str(sett)))
 
 
+@settings.command(short_help='Find and decode the Bootloader DFU settings in many flash dumps.')
+@click.argument('paths', metavar='PATH...', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--base-address',
+              help='Flash address of the first byte of the .bin dumps. Default: 0.',
+              type=BASED_INT_OR_NONE,
+              required=False)
+@click.option('-j', '--jobs',
+              help='Number of worker processes. If not specified, the number of CPUs is used.',
+              type=click.IntRange(1, None),
+              required=False)
+@click.option('--report',
+              help='Store a JSON report with the result and timing of every dump in this file.',
+              type=click.Path(),
+              required=False)
+def inspect(paths, base_address, jobs, report):
+    """
+    Find the Bootloader DFU settings in flash dumps and display them as one JSON object per dump.
+    PATH is a .bin or .hex flash dump, or a directory that is searched for dumps.
+
+    The settings page and backup page addresses of every nRF IC family are probed, and only
+    pages with a valid CRC are reported.
+    """
+    from nordicsemi.dfu.settings_inspect import find_dumps, inspect_dumps
+
+    dumps = find_dumps(paths)
+    if not dumps:
+        raise click.UsageError("No flash dumps found.")
+
+    results = inspect_dumps(dumps, base_address=base_address or 0, jobs=jobs)
+
+    for result in results['dumps']:
+        click.echo(json.dumps(result, sort_keys=True))
+
+    if report is not None:
+        with open(report, 'w') as f:
+            json.dump(results, f, sort_keys=True, indent=4, separators=(',', ': '))
+        click.echo("Inspection report stored in {0}".format(report), err=True)
+
+
+@cli.command(name='production-image',
+             short_help='Merge SoftDevice, bootloader, settings and application into one production .hex or .bin file.')
+@click.argument('output', required=True, type=click.Path())
+@click.option('--family',
+              help='nRF IC family: NRF51 or NRF52 or NRF52QFAB or NRF52810 or NRF52840',
+              type=click.Choice(['NRF51', 'NRF52', 'NRF52QFAB', 'NRF52810', 'NRF52840']),
+              required=True)
+@click.option('--softdevice',
+              help='The SoftDevice firmware file, including the MBR.',
+              type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--bootloader',
+              help='The bootloader firmware file.',
+              type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--application',
+              help='The application firmware file.',
+              type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--application-version',
+              help='The application version.',
+              type=BASED_INT_OR_NONE)
+@click.option('--application-version-string',
+              help='The application version string, e.g. "2.7.31". Will be converted to an integer, e.g. 20731.',
+              type=click.STRING)
+@click.option('--bootloader-version',
+              help='The bootloader version. Required with --bl-settings-version.',
+              type=BASED_INT_OR_NONE)
+@click.option('--bl-settings-version',
+              help='The Bootloader settings version. If given, a settings page is generated for the '
+                   'application and SoftDevice, as "settings generate" does.',
+              type=BASED_INT_OR_NONE)
+@click.option('--start-address',
+              help='Custom start address for the settings page. If not specified, '
+                   'then the last page of the flash is used.',
+              type=BASED_INT_OR_NONE)
+@click.option('--no-backup',
+              help='Do not include the DFU settings backup page.',
+              type=click.BOOL,
+              is_flag=True,
+              required=False)
+@click.option('--backup-address',
+              help='Address of the DFU settings backup page inside flash. '
+                   'By default, the backup page address is placed one page below DFU settings.',
+              type=BASED_INT_OR_NONE)
+@click.option('--app-boot-validation',
+              help='The method of boot validation for application.',
+              required=False,
+              type=click.Choice(BOOT_VALIDATION_ARGS))
+@click.option('--sd-boot-validation',
+              help='The method of boot validation for SoftDevice.',
+              required=False,
+              type=click.Choice(BOOT_VALIDATION_ARGS))
+@click.option('--key-file',
+              help='The private (signing) key in PEM format. Needed for ECDSA Boot Validation.',
+              required=False,
+              type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--signing-socket',
+              help='Sign through the signing service listening on this socket (see "keys serve"), '
+                   'instead of using --key-file.',
+              required=False,
+              type=click.Path(dir_okay=False))
+@click.option('--zigbee-production-config',
+              help='A Zigbee Production Config YAML file (see "zigbee production_config") to include.',
+              required=False,
+              type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.option('--zigbee-production-config-offset',
+              help='Offset of the Zigbee Production Config. By default, the value for {0} {1} is used.'.format(
+                  ProductionConfig.DEFAULT_OFFSET_SDK, ProductionConfig.DEFAULT_OFFSET_CHIP),
+              type=BASED_INT_OR_NONE)
+@click.option('--format',
+              help='(hex|bin) Output format. By default, it is taken from the OUTPUT file extension.',
+              type=click.Choice(['hex', 'bin']),
+              required=False)
+@click.option('--layout',
+              help='Store the layout and free flash of the image as JSON in this file.',
+              type=click.Path(),
+              required=False)
+def production_image(output,
+                     family,
+                     softdevice,
+                     bootloader,
+                     application,
+                     application_version,
+                     application_version_string,
+                     bootloader_version,
+                     bl_settings_version,
+                     start_address,
+                     no_backup,
+                     backup_address,
+                     app_boot_validation,
+                     sd_boot_validation,
+                     key_file,
+                     signing_socket,
+                     zigbee_production_config,
+                     zigbee_production_config_offset,
+                     format,
+                     layout):
+    """
+    Merge the SoftDevice, bootloader, bootloader settings, application and an optional Zigbee Production
+    Config into one image, as 'settings generate' followed by mergehex would. The components are checked
+    for overlaps, and the layout of the image and the free flash between components are displayed.
+    """
+    from nordicsemi.dfu.production_image import ProductionImage, ProductionImageException
+
+    if format is None:
+        format = 'bin' if output.endswith('.bin') else 'hex'
+
+    if application_version_string:
+        application_version = convert_version_string_to_int(application_version_string)
+
+    if bl_settings_version is None:
+        if bootloader_version is not None or app_boot_validation or sd_boot_validation:
+            raise click.UsageError("--bl-settings-version is required to generate bootloader settings.")
+    else:
+        if bootloader_version is None:
+            raise click.UsageError("--bootloader-version required with --bl-settings-version.")
+        if application is not None and application_version is None:
+            raise click.UsageError('--application-version or --application-version-string'
+                                   ' required with application image.')
+        if no_backup and backup_address is not None:
+            raise click.BadParameter("Bootloader DFU settings backup page cannot be specified if backup is disabled.",
+                                     param_hint='backup_address')
+        if bl_settings_version == 1 and (app_boot_validation or sd_boot_validation):
+            raise click.BadParameter("Bootloader settings version 1 does not support boot validation.",
+                                     param_hint='bl_settings_version')
+        if app_boot_validation and not application:
+            raise click.UsageError("--application hex file must be set when using --app_boot_validation")
+        if sd_boot_validation and not softdevice:
+            raise click.UsageError("--softdevice hex file must be set when using --sd_boot_validation")
+
+        # Default boot validation cases
+        if app_boot_validation is None and application is not None and bl_settings_version == 2:
+            app_boot_validation = DEFAULT_BOOT_VALIDATION
+        if sd_boot_validation is None and softdevice is not None and bl_settings_version == 2:
+            sd_boot_validation = DEFAULT_BOOT_VALIDATION
+
+    if 'VALIDATE_ECDSA_P256_SHA256' in (app_boot_validation, sd_boot_validation):
+        if signing_socket is None and key_file is None:
+            raise click.UsageError("Key file must be given when 'VALIDATE_ECDSA_P256_SHA256' boot validation is used")
+        signer = load_signer(key_file, signing_socket)
+    else:
+        signer = None
+
+    try:
+        image = ProductionImage(family)
+        for name, hex_file in (('softdevice', softdevice), ('bootloader', bootloader), ('application', application)):
+            if hex_file is not None:
+                image.add_hex(name, hex_file)
+
+        if bl_settings_version is not None:
+            image.add_settings(app_ver=application_version, bl_ver=bootloader_version, bl_sett_ver=bl_settings_version,
+                               custom_bl_sett_addr=start_address, no_backup=no_backup, backup_address=backup_address,
+                               app_boot_validation_type=app_boot_validation,
+                               sd_boot_validation_type=sd_boot_validation, signer=signer)
+
+        if zigbee_production_config is not None:
+            try:
+                production_config = ProductionConfig(zigbee_production_config).tobytes()
+            except ProductionConfigWrongException:
+                raise click.UsageError("Zigbee Production Config YAML file format wrong.")
+            except ProductionConfigTooLargeException as e:
+                raise click.UsageError(f"Production Config too large: {e.length} bytes")
+            if zigbee_production_config_offset is None:
+                zigbee_production_config_offset = ProductionConfig.DEFAULT_OFFSET
+            image.add_bytes('zigbee production config', zigbee_production_config_offset, production_config)
+
+        image.check()
+    except ProductionImageException as e:
+        raise click.UsageError(str(e))
+
+    if format == 'hex':
+        with open(output, 'w') as f:
+            image.write_hex(f)
+    else:
+        with open(output, 'wb') as f:
+            image.write_bin(f)
+
+    click.echo("Production image stored in: {0}\n".format(output))
+    click.echo(image.layout_str())
+
+    if layout:
+        with open(layout, 'w') as f:
+            json.dump(image.to_dict(), f, indent=4, separators=(',', ': '))
+
+
 @cli.group(short_help='Generate and display private and public keys.')
 def keys():
     """
@@ -434,6 +720,8 @@ def keys():
 @click.argument('key_file', required=True, type=click.Path())
 
 def generate(key_file):
+    from nordicsemi.dfu.signing import Signing
+
     signer = Signing()
 
     if os.path.exists(key_file):
@@ -459,6 +747,8 @@ def generate(key_file):
               type=click.STRING)
 
 def display(key_file, key, format, out_file):
+    from nordicsemi.dfu.signing import Signing
+
     signer = Signing()
 
     if not os.path.isfile(key_file):
@@ -489,6 +779,59 @@ def display(key_file, key, format, out_file):
         with open(out_file, "w") as kfile:
             kfile.write(kstr)
 
+@keys.command(short_help='Serve signing requests with a private key kept in memory.')
+@click.argument('key_file', required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--socket', 'socket_path',
+              help='Path of the Unix domain socket to listen on.',
+              type=click.Path(dir_okay=False),
+              required=True)
+
+def serve(key_file, socket_path):
+    """
+    Run a local signing service. The private key is loaded once and kept in memory, and the
+    'pkg generate' and 'settings generate' commands can sign through the service with
+    --signing-socket instead of reading the key file. Stop the service with Ctrl-C.
+    """
+    import socket
+    if not hasattr(socket, 'AF_UNIX'):
+        raise click.UsageError("The signing service requires Unix domain sockets, which this platform lacks.")
+
+    from nordicsemi.dfu.signing import Signing
+    from nordicsemi.dfu.signing_service import serve as serve_signing
+
+    if Signing().load_key(key_file):
+        display_sec_warning()
+
+    click.echo("Signing service listening on {0}".format(socket_path))
+    serve_signing(socket_path, key_file)
+
+def load_signer(key_file, signing_socket):
+    """
+    Create the signer for the --key-file or --signing-socket option, and warn about the default key.
+    Returns None if neither is given.
+    """
+    if key_file is not None and signing_socket is not None:
+        raise click.UsageError("--key-file and --signing-socket can not be used together.")
+
+    if signing_socket is not None:
+        from nordicsemi.dfu.signing_service import SigningClient, SigningServiceException
+        signer = SigningClient(signing_socket)
+        try:
+            default_key = signer.is_default_key()
+        except SigningServiceException as e:
+            raise click.UsageError(str(e))
+    elif key_file is not None:
+        from nordicsemi.dfu.signing import Signing
+        signer = Signing()
+        default_key = signer.load_key(key_file)
+    else:
+        return None
+
+    if default_key:
+        display_sec_warning()
+
+    return signer
+
 
 @cli.group(short_help='Display or generate a DFU package (zip file).')
 def pkg():
@@ -599,6 +942,11 @@ def pkg():
               help='The private (signing) key in PEM format.',
               required=False,
               type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--signing-socket',
+              help='Sign through the signing service listening on this socket (see "keys serve"), '
+                   'instead of using --key-file.',
+              required=False,
+              type=click.Path(dir_okay=False))
 @click.option('--external-app',
               help='Indicates that the FW upgrade is intended to be passed through '
                    '(not applied on the receiving device)',
@@ -635,6 +983,21 @@ def pkg():
               help='The zigbee OTA maximum hw version of Zigbee OTA Client.',
               required=False,
               type=BASED_INT_OR_NONE)
+@click.option('-j', '--jobs',
+              help='Number of worker processes used to convert and sign the images. Default: 1',
+              type=click.IntRange(1, None),
+              default=1,
+              required=False)
+@click.option('--compression',
+              help='Compression of the zip members: stored (fastest to extract) or deflated (smallest). '
+                   'Default: stored',
+              type=click.Choice(ZIP_COMPRESSION_ARGS),
+              default=DEFAULT_ZIP_COMPRESSION,
+              required=False)
+@click.option('--compression-level',
+              help='Deflate level, from 0 (fastest) to 9 (smallest). Requires --compression deflated.',
+              type=click.IntRange(0, 9),
+              required=False)
 def generate(zipfile,
            debug_mode,
            application,
@@ -649,6 +1012,7 @@ def generate(zipfile,
            sd_boot_validation,
            app_boot_validation,
            key_file,
+           signing_socket,
            external_app,
            zigbee,
            zigbee_manufacturer_id,
@@ -657,7 +1021,10 @@ def generate(zipfile,
            zigbee_ota_hw_version,
            zigbee_ota_fw_version,
            zigbee_ota_min_hw_version,
-           zigbee_ota_max_hw_version):
+           zigbee_ota_max_hw_version,
+           jobs,
+           compression,
+           compression_level):
     """
     Generate a zip package for distribution to apps that support Nordic DFU OTA.
     The application, bootloader, and SoftDevice files are converted to .bin if supplied as .hex files.
@@ -680,12 +1047,16 @@ def generate(zipfile,
 
     * SD + APP: Supported (SD of same Major Version).
     """
+    from nordicsemi.dfu.package import Package
     zipfile_path = zipfile
 
     # Check combinations
     if bootloader is not None and application is not None and softdevice is None:
         raise click.UsageError("Invalid combination: use two .zip packages instead.")
 
+    if compression_level is not None and compression != 'deflated':
+        raise click.UsageError("--compression-level requires --compression deflated.")
+
     if debug_mode is None:
         debug_mode = False
 
@@ -824,14 +1195,9 @@ def generate(zipfile,
     else:
         sd_id_list = sd_req_list
 
-    if key_file is None:
+    signer = load_signer(key_file, signing_socket)
+    if signer is None:
         display_nokey_warning()
-        signer = None
-    else:
-        signer = Signing()
-        default_key = signer.load_key(key_file)
-        if default_key:
-            display_sec_warning()
 
     if zigbee_comment is None:
         zigbee_comment = ''
@@ -896,7 +1262,7 @@ def generate(zipfile,
                       zigbee_ota_min_hw_version,
                       zigbee_ota_max_hw_version)
 
-    package.generate_package(zipfile_path)
+    package.generate_package(zipfile_path, jobs=jobs, compression=compression, compress_level=compression_level)
 
     if zigbee:
         from shutil import copyfile
@@ -924,21 +1290,160 @@ def generate(zipfile,
                           signer,
                           True)
 
-        package.generate_package(zipfile_path)
+        package.generate_package(zipfile_path, compression=compression, compress_level=compression_level)
         remove(binfile)
 
     log_message = "Zip created at {0}".format(zipfile_path)
     click.echo(log_message)
 
+@pkg.command(name='generate-batch', short_help='Generate several zip files for performing DFU from a spec file.')
+@click.argument('spec_file',
+                required=True,
+                type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.option('-j', '--jobs',
+              help='Number of worker processes. If not specified, the number of CPUs is used.',
+              type=click.IntRange(1, None),
+              required=False)
+@click.option('--index',
+              help='Store a JSON summary of the generated packages in this file.',
+              type=click.Path(),
+              required=False)
+def generate_batch(spec_file, jobs, index):
+    """
+    Generate a zip package for each entry of a JSON or YAML spec file, using a pool of worker processes.
+
+    SPEC_FILE holds a list of package specs. Each spec uses the option names of 'pkg generate',
+    with '_' instead of '-', and the package filename as 'zipfile'. Relative paths are resolved
+    against the directory of SPEC_FILE. Example YAML content:
+
+    \b
+        - zipfile: app_hw52.zip
+          application: app.hex
+          application_version: 3
+          hw_version: 52
+          sd_req: [0xAE, 0xB6]
+          key_file: private.pem
+    """
+    from nordicsemi.dfu.package_batch import load_batch_spec, generate_packages, PackageSpecException
+    from nordicsemi.dfu.signing import Signing
+
+    try:
+        specs = load_batch_spec(spec_file)
+        for key_file in sorted(set(spec['key_file'] for spec in specs if spec.get('key_file'))):
+            if os.path.isfile(key_file) and Signing().load_key(key_file):
+                display_sec_warning()
+        for signing_socket in sorted(set(spec['signing_socket'] for spec in specs if spec.get('signing_socket'))):
+            load_signer(None, signing_socket)
+        results = generate_packages(specs, jobs=jobs, index_file=index)
+    except PackageSpecException as e:
+        raise click.UsageError(str(e))
+
+    failed = 0
+    for result in results:
+        if 'error' in result:
+            failed += 1
+            click.echo("Failed to create {0}: {1}".format(result['zipfile'], result['error']))
+        else:
+            click.echo("Zip created at {0}".format(result['zipfile']))
+
+    if index:
+        click.echo("Package index stored in {0}".format(index))
+
+    if failed:
+        raise click.ClickException("{0} of {1} packages failed".format(failed, len(results)))
+
 @pkg.command(short_help='Display the contents of a .zip package file.')
-@click.argument('zip_file', required=True, type=click.Path())
+@click.argument('zip_files', metavar='ZIP_FILE...', nargs=-1, required=True, type=click.Path())
+@click.option('--format',
+              help='(text|json) Display the packages as text, or as one JSON object per line.',
+              type=click.Choice(['text', 'json']),
+              default='text',
+              required=False)
+
+def display(zip_files, format):
+    """
+    Display the init packets of one or more DFU packages. Only the manifest and the init packets
+    are read from the zip files, the firmware images are not extracted.
+    """
+    from nordicsemi.dfu.package import Package, PackageException
 
-def display(zip_file):
+    for zip_file in zip_files:
+        package = Package()
+        try:
+            package.read_package(zip_file)
+        except PackageException as err:
+            raise click.UsageError(str(err))
+
+        if format == 'json':
+            click.echo(json.dumps(package.to_dict(), sort_keys=True))
+        else:
+            click.echo("{0}".format(str(package)))
 
-    package = Package()
-    package.parse_package(zip_file, preserve_work_dir=True)
+@pkg.command(short_help='Verify the hashes, sizes and signatures of .zip package files.')
+@click.argument('paths', metavar='PATH...', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--key-file',
+              help='The private (signing) key in PEM format to verify the signatures with.',
+              required=False,
+              type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('--public-key',
+              help='The public (verification) key in PEM format to verify the signatures with.',
+              required=False,
+              type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False))
+@click.option('-j', '--jobs',
+              help='Number of worker processes. If not specified, the number of CPUs is used.',
+              type=click.IntRange(1, None),
+              required=False)
+@click.option('--report',
+              help='Store a JSON report with the result and timing of every package in this file.',
+              type=click.Path(),
+              required=False)
+def verify(paths, key_file, public_key, jobs, report):
+    """
+    Verify DFU packages. PATH is a package, or a directory that is searched for packages.
 
-    click.echo("{0}".format(str(package)))
+    For every image, the hash and the declared size in the init packet are checked against the
+    binary image. With --key-file or --public-key, the init packet signature and the ECDSA boot
+    validation signatures are verified too, and unsigned packages fail.
+    """
+    from nordicsemi.dfu.package_verify import find_packages, verify_packages, PASSED
+
+    if key_file is not None and public_key is not None:
+        raise click.UsageError("--key-file and --public-key can not be used together.")
+
+    packages = find_packages(paths)
+    if not packages:
+        raise click.UsageError("No packages found.")
+
+    results = verify_packages(packages, key_file=key_file, public_key_file=public_key, jobs=jobs)
+
+    for result in results['packages']:
+        if result['ok']:
+            click.echo("OK      {0}".format(result['package']))
+            continue
+
+        click.echo("FAILED  {0}".format(result['package']))
+        if 'error' in result:
+            click.echo("        {0}".format(result['error']))
+        for image in result['images']:
+            checks = image['checks']
+            failures = ["{0}: {1}".format(name, checks[name]) for name in ('hash', 'size', 'signature')
+                        if checks[name] not in PASSED]
+            failures += ["boot_validation[{0}]: {1}".format(i, x) for i, x in enumerate(checks['boot_validation'])
+                         if x not in PASSED]
+            if failures:
+                click.echo("        {0}: {1}".format(image['bin_file'], ', '.join(failures)))
+
+    if report is not None:
+        with open(report, 'w') as f:
+            json.dump(results, f, sort_keys=True, indent=4, separators=(',', ': '))
+        click.echo("Verification report stored in {0}".format(report))
+
+    if not results['signatures_checked']:
+        click.echo("Note: signatures were not verified, use --key-file or --public-key to check them.")
+
+    if results['failed']:
+        raise click.ClickException("{0} of {1} packages failed verification".format(results['failed'],
+                                                                                     len(results['packages'])))
 
 global_bar = None
 def update_progress(progress=0):
@@ -954,6 +1459,8 @@ def dfu():
 
 def do_serial(package, port, connect_delay, flow_control, packet_receipt_notification, baud_rate, serial_number, ping,
               timeout):
+    from nordicsemi.dfu.dfu import Dfu
+    from nordicsemi.dfu.dfu_transport_serial import DfuTransportSerial
 
     if flow_control is None:
         flow_control = DfuTransportSerial.DEFAULT_FLOW_CONTROL
@@ -964,6 +1471,8 @@ def do_serial(package, port, connect_delay, flow_control, packet_receipt_notific
     if ping is None:
         ping = False
     if port is None:
+        from nordicsemi.lister.device_lister import DeviceLister
+
         device_lister = DeviceLister()
         device = device_lister.get_device(serial_number=serial_number)
         if device is None:
@@ -1075,6 +1584,8 @@ def serial(package, port, connect_delay, flow_control, packet_receipt_notificati
 
 
 def enumerate_ports():
+    from nordicsemi.lister.device_lister import DeviceLister
+
     device_lister = DeviceLister()
     descs = device_lister.enumerate()
     if len(descs) == 0:
@@ -1095,6 +1606,8 @@ def enumerate_ports():
 
 
 def get_port_by_snr(snr):
+    from nordicsemi.lister.device_lister import DeviceLister
+
     device_lister = DeviceLister()
     device = device_lister.get_device(serial_number=snr)
     if not device:
@@ -1104,6 +1617,8 @@ def get_port_by_snr(snr):
 
 
 def port_is_jlink(port):
+    from nordicsemi.lister.device_lister import DeviceLister
+
     device_lister = DeviceLister()
     device = device_lister.get_device(com=port)
     if not device:
@@ -1154,6 +1669,9 @@ def ble(package, conn_ic_id, port, connect_delay, name, address, jlink_snr, flas
     loaded. The connectivity device will perform the DFU procedure onto the target device.
     """
     ble_driver_init(conn_ic_id)
+    from nordicsemi.dfu.dfu import Dfu
+    from nordicsemi.dfu.dfu_transport_serial import DfuTransportSerial
+
     if name is None and address is None:
         name = 'DfuTarg'
         click.echo("No target selected. Default device name: {} is used.".format(name))
@@ -1270,6 +1788,7 @@ def ant(package, port, connect_delay, packet_receipt_notification, period,
 
     # This import needs to happen only if the platform is supported.
     from nordicsemi.dfu.dfu_transport_ant import DfuTransportAnt, AntParams
+    from nordicsemi.dfu.dfu import Dfu
 
     ant_config = AntParams()
     if port is None:
@@ -1320,9 +1839,11 @@ def convert_version_string_to_int(s):
 
 @dfu.command(short_help="Update the firmware on a device over a Thread connection.")
 @click.option('-pkg', '--package',
-              help='Filename of the DFU package.',
+              help='Filename of the DFU package. Repeat the option to serve the images of several '
+                   'packages at once, nodes select an image by its type or init packet CRC.',
               type=click.Path(exists=True, resolve_path=True, file_okay=True, dir_okay=False),
-              required=True)
+              required=True,
+              multiple=True)
 @click.option('-p', '--port',
               help='Serial port COM port to which the NCP is connected.',
               type=click.STRING)
@@ -1355,6 +1876,26 @@ def convert_version_string_to_int(s):
 @click.option('-r', '--rate',
               help="Multicast upload rate in blocks per second.",
               type=click.FLOAT)
+@click.option('--max-rate',
+              help="Highest multicast upload rate in blocks per second. The rate starts at --rate, "
+                   "ramps up to this value while the nodes report little loss and backs off when "
+                   "the loss rises. Default: --rate, that is a fixed rate.",
+              type=click.FLOAT)
+@click.option('--rate-stats',
+              help="Store the effective upload rate and the loss per superblock in this JSON file.",
+              type=click.Path(dir_okay=False))
+@click.option('--metrics',
+              help="Store a timeline of the upload events, such as triggers, block requests, bitmap "
+                   "reports and retransmissions, followed by a summary per node, in this JSON Lines file.",
+              type=click.Path(dir_okay=False))
+@click.option('--block-size',
+              help="Multicast block size in bytes. Larger blocks carry less overhead per byte on good "
+                   "links. Nodes updated by unicast choose their block size themselves. Default: 64.",
+              type=click.Choice(['16', '32', '64', '128', '256', '512', '1024']))
+@click.option('--max-nodes',
+              help="Largest number of nodes fetching an image by unicast at once. The other nodes "
+                   "are asked to retry later. Default: no limit.",
+              type=click.IntRange(min=1))
 @click.option('-rs', '--reset_suppress',
               help='Suppress device reset after finishing DFU for a given number of milliseconds. ' +
                    'If -1 is given then suppress indefinatelly.',
@@ -1365,13 +1906,17 @@ def convert_version_string_to_int(s):
               type=click.STRING)
 
 def thread(package, port, address, server_port, panid, channel, jlink_snr, flash_connectivity,
-           sim, rate, reset_suppress, masterkey):
+           sim, rate, max_rate, rate_stats, metrics, block_size, max_nodes, reset_suppress, masterkey):
     """
     Perform a Device Firmware Update on a device that supports Thread DFU.
     This requires a second nRF device, connected to this computer, with Thread Network
     CoProcessor (NCP) firmware loaded. The NCP device will perform the DFU procedure onto
     the target device.
     """
+    import ipaddress
+    import signal
+    import spinel.util as util
+
     ble_driver_init('NRF52')
     from nordicsemi.thread import tncp
     from nordicsemi.thread.dfu_thread import create_dfu_server
@@ -1434,6 +1979,11 @@ def thread(package, port, address, server_port, panid, channel, jlink_snr, flash
 
     opts = type('DFUServerOptions', (object,), {})()
     opts.rate = rate
+    opts.max_rate = max_rate
+    opts.rate_stats = rate_stats
+    opts.metrics = metrics
+    opts.block_size = int(block_size) if block_size else None
+    opts.max_nodes = max_nodes
     opts.reset_suppress = reset_suppress
     opts.mcast_dfu = mcast_dfu
 
@@ -1446,9 +1996,11 @@ def thread(package, port, address, server_port, panid, channel, jlink_snr, flash
         signal.signal(signal.SIGTERM, sighandler)
 
         transport.open()
-        # Delay DFU trigger until NCP promotes to a router (6 seconds by default)
+        # Delay DFU trigger until NCP promotes to a router
         click.echo("Waiting for NCP to promote to a router...")
-        time.sleep(6.0)
+        if not transport.wait_for_role((NCPTransport.ROLE_ROUTER, NCPTransport.ROLE_LEADER),
+                                       NCPTransport.ROUTER_TIMEOUT):
+            click.echo("NCP is not a router after {}s, triggering DFU anyway".format(NCPTransport.ROUTER_TIMEOUT))
         dfu.trigger(address, 3)
         click.echo("Thread DFU server is running... Press <Ctrl + D> to stop.")
         pause()
@@ -1458,6 +2010,9 @@ def thread(package, port, address, server_port, panid, channel, jlink_snr, flash
         logger.exception(e)
     finally:
         transport.close()
+        dfu.metrics.close()
+        if metrics:
+            click.echo("Thread DFU metrics stored in {}".format(metrics))
 
 @dfu.command(short_help="Update the firmware on a device over a Zigbee connection.")
 @click.option('-f', '--file',
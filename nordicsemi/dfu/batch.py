@@ -0,0 +1,198 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Shared plumbing of the batch generators: spec loading and value conversion, and a process pool whose
+workers share a firmware cache and set up each signer once.
+"""
+
+# Python standard library
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+# Nordic libraries
+from nordicsemi.dfu.signing import Signing
+from nordicsemi.dfu.signing_service import SigningClient
+
+
+class PackageSpecException(Exception):
+    pass
+
+
+# Per worker process state, set up once by init_worker
+_worker_firmware_cache = None
+_worker_signers = {}
+
+
+def to_int(value, key):
+    """Convert an integer spec value, given as a number or as a string in any base, e.g. '0x10'."""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(str(value), 0)
+    except ValueError:
+        raise PackageSpecException("{0}: {1} is not a valid integer".format(key, value))
+
+
+def to_int_list(value, key):
+    """Convert a list spec value, given as a list, a comma separated string or a single value."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    elif not isinstance(value, list):
+        value = [value]
+    return [to_int(x, key) for x in value]
+
+
+def version_string_to_int(s):
+    """Convert from semver string "1.2.3", to integer 10203"""
+    numbers = s.split(".")
+    if len(numbers) != 3:
+        raise PackageSpecException("application_version_string: Must be on the format x.y.z")
+    js = [10000, 100, 1]
+    return sum([js[i] * int(numbers[i]) for i in range(3)])
+
+
+def signer_ref(spec):
+    """Return a hashable reference to the signer of a spec, None if the spec is not signed."""
+    if spec.get('key_file'):
+        return ('key_file', spec['key_file'])
+    if spec.get('signing_socket'):
+        return ('signing_socket', spec['signing_socket'])
+    return None
+
+
+def create_signer(ref):
+    """Create the signer a reference returned by signer_ref stands for."""
+    kind, path = ref
+    if kind == 'signing_socket':
+        return SigningClient(path)
+
+    signer = Signing()
+    signer.load_key(path)
+    return signer
+
+
+def load_specs(spec_file, spec_keys, path_keys, list_key):
+    """
+    Loads a list of specs from a JSON or YAML file.
+
+    The file contains either a list of specs, or a mapping with the list under list_key.
+    Relative paths are resolved against the spec file directory.
+
+    :param str spec_file: Path to the spec file
+    :param list spec_keys: Keys accepted in a spec
+    :param list path_keys: Keys holding paths, resolved against the spec file directory
+    :param str list_key: Key of the spec list when the file holds a mapping
+    :return: list of spec dictionaries
+    """
+    with open(spec_file, 'r') as f:
+        if spec_file.endswith('.json'):
+            data = json.load(f)
+        else:
+            import yaml
+            data = yaml.safe_load(f)
+
+    if isinstance(data, dict):
+        data = data.get(list_key)
+
+    if not isinstance(data, list):
+        raise PackageSpecException("{0}: expected a list of specs".format(spec_file))
+
+    base_dir = os.path.dirname(os.path.abspath(spec_file))
+    specs = []
+    for i, spec in enumerate(data):
+        if not isinstance(spec, dict):
+            raise PackageSpecException("Spec #{0} is not a mapping".format(i))
+
+        unknown = set(spec) - set(spec_keys)
+        if unknown:
+            raise PackageSpecException("Spec #{0}: unknown keys {1}".format(i, ', '.join(sorted(unknown))))
+
+        spec = dict(spec)
+        for key in path_keys:
+            if spec.get(key) is not None:
+                spec[key] = os.path.join(base_dir, spec[key])
+        specs.append(spec)
+
+    return specs
+
+
+def init_worker(firmware_cache, signer_refs):
+    """Set up the state of a worker process: the shared firmware cache and one signer per reference."""
+    global _worker_firmware_cache
+    _worker_firmware_cache = firmware_cache
+
+    for ref in signer_refs:
+        _worker_signers[ref] = create_signer(ref)
+
+
+def _run_task(generate, output, args, ref):
+    signer = _worker_signers[ref] if ref is not None else None
+    return generate(output, args, signer, _worker_firmware_cache)
+
+
+def run_batch(generate, tasks, firmware_cache, jobs=None):
+    """
+    Runs generate(output, args, signer, firmware_cache) for each (output, args, signer_ref) task in a
+    process pool. generate must be a module level function, it is handed to the workers by name.
+
+    :param generate: The function generating one output, returning its result dictionary
+    :param list tasks: Tasks of output path, generate arguments and signer reference
+    :param firmware_cache: The firmware cache, filled up front, handed to every worker
+    :param int jobs: Number of worker processes, None for the number of CPUs and 1 to run in this process
+    :return: list of the results, in task order
+    """
+    signer_refs = sorted(set(ref for _, _, ref in tasks if ref is not None))
+
+    if jobs == 1:
+        init_worker(firmware_cache, signer_refs)
+        return [_run_task(generate, *task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=init_worker,
+                             initargs=(firmware_cache, signer_refs)) as executor:
+        futures = [executor.submit(_run_task, generate, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def write_index(index_file, list_key, results):
+    """Store the results of a batch as a JSON summary, under list_key."""
+    with open(index_file, 'w') as f:
+        json.dump({list_key: results}, f, sort_keys=True, indent=4, separators=(',', ': '))
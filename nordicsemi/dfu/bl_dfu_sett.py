@@ -37,11 +37,11 @@
 
 # Python standard library
 import os
-import shutil
 import logging
-import tempfile
 import struct
+import hashlib
 import binascii
+from collections import namedtuple
 
 # 3rd party libraries
 import intelhex
@@ -97,6 +97,68 @@ class BLDFUSettingsStructV2:
         self.last_addr            = settings_address + 0x322
 
 
+# Sizes of the boot validation bytes, per boot validation type
+BOOT_VALIDATION_SIZES = {0: 0, 1: 4, 2: 32, 3: 64}
+
+
+def decode_settings(buf, offset=0):
+    """
+    Decodes a bootloader settings page held in a buffer, without copying it.
+
+    :param buf: Buffer with the settings page, e.g. bytes or an mmap
+    :param int offset: Offset of the settings page in buf
+    :return: dict with the settings fields. 'boot_validation_crc_ok' tells if the boot validation CRC of
+             a version 2 page matches.
+    :raises RuntimeError: If the version is unknown, the page is truncated, or the CRC does not match
+    """
+    if offset < 0 or offset + 8 > len(buf):
+        raise RuntimeError("No Bootloader DFU settings at offset 0x{0:X}".format(offset))
+
+    crc, ver = struct.unpack_from('<II', buf, offset)
+
+    if crc == 0xffffffff and ver == 0xffffffff:
+        raise RuntimeError("No Bootloader DFU settings, the flash is erased")
+    elif ver == 1:
+        setts = BLDFUSettingsStructV1(offset)
+    elif ver == 2:
+        setts = BLDFUSettingsStructV2(offset)
+    else:
+        raise RuntimeError("Unknown Bootloader DFU settings version: {0}".format(ver))
+
+    if offset + setts.bytes_count > len(buf):
+        raise RuntimeError("Bootloader DFU settings truncated at offset 0x{0:X}".format(offset))
+
+    with memoryview(buf) as view:
+        # calculate the CRC32 over the data
+        _crc = binascii.crc32(view[offset + 4:setts.init_cmd]) & 0xffffffff
+        if _crc != crc:
+            raise RuntimeError("CRC32 mismtach: flash: {0} calculated: {1}".format(hex(crc), hex(_crc)))
+
+        settings = dict(zip(('bl_sett_ver', 'app_ver', 'bl_ver', 'bank_layout', 'bank_current',
+                             'app_sz', 'app_crc', 'bank0_bank_code'),
+                            struct.unpack_from('<8I', buf, setts.sett_ver)))
+        settings['crc'] = crc
+
+        if ver == 2:
+            settings['sd_sz'], = struct.unpack_from('<I', buf, setts.sd_sz)
+            settings['boot_validation_crc'], = struct.unpack_from('<I', buf, setts.boot_validataion_crc)
+            settings['sd_boot_validation_type'], = struct.unpack_from('<b', buf, setts.sd_validation_type)
+            settings['app_boot_validation_type'], = struct.unpack_from('<b', buf, setts.app_validation_type)
+            settings['sd_boot_validation_bytes'] = bytes(view[setts.sd_validation_bytes:setts.sd_validation_bytes +
+                BOOT_VALIDATION_SIZES.get(settings['sd_boot_validation_type'], 0)])
+            settings['app_boot_validation_bytes'] = bytes(view[setts.app_validation_bytes:setts.app_validation_bytes +
+                BOOT_VALIDATION_SIZES.get(settings['app_boot_validation_type'], 0)])
+            settings['boot_validation_crc_ok'] = settings['boot_validation_crc'] == \
+                binascii.crc32(view[setts.sd_validation_type:setts.last_addr + 1]) & 0xffffffff
+        else:
+            settings['sd_sz'] = 0x0
+            settings['boot_validation_crc'] = 0x0
+            settings['sd_boot_validation_type'] = 0x0
+            settings['app_boot_validation_type'] = 0x0
+
+    return settings
+
+
 class BLDFUSettings:
     """ Class to abstract a bootloader and its settings """
 
@@ -109,22 +171,22 @@ class BLDFUSettings:
     bl_sett_52840_addr    = 0x000FF000
     bl_sett_backup_offset = 0x1000
 
+    # Known settings page addresses, in the order they are probed
+    bl_sett_addresses = [
+        ('NRF51', bl_sett_51_addr),
+        ('NRF52', bl_sett_52_addr),
+        ('NRF52QFAB', bl_sett_52_qfab_addr),
+        ('NRF52810', bl_sett_52810_addr),
+        ('NRF52840', bl_sett_52840_addr),
+    ]
+
     def __init__(self):
         """
         """
         # instantiate a hex object
         self.ihex = intelhex.IntelHex()
-        self.temp_dir = None
         self.hex_file = ""
 
-    def __del__(self):
-        """
-        Destructor removes the temporary directory
-        :return:
-        """
-        if self.temp_dir is not None:
-            shutil.rmtree(self.temp_dir)
-
     def set_arch(self, arch):
         if arch == 'NRF51':
             self.arch = nRFArch.NRF51
@@ -161,19 +223,49 @@ class BLDFUSettings:
         return struct.unpack(format, self.ihex.gets(addr, size))[0] & 0xffffffff
 
     def _calculate_crc32_from_hex(self, ih_object, start_addr=None, end_addr=None):
-        list = []
         if start_addr is None and end_addr is None:
+            # All the bytes present in the hex, in address order
             hex_dict = ih_object.todict()
-            for addr, byte in list(hex_dict.items()):
-                list.append(byte)
+            hex_dict.pop('start_addr', None)
+            data = bytes(hex_dict[addr] for addr in sorted(hex_dict))
         else:
-            for addr in range(start_addr, end_addr + 1):
-                list.append(ih_object[addr])
+            data = ih_object.tobinstr(start=start_addr, end=end_addr)
 
-        return binascii.crc32(bytearray(list)) & 0xFFFFFFFF
+        return binascii.crc32(data) & 0xFFFFFFFF
+
+    def _pack_into(self, page, addr, value, format='<I'):
+        struct.pack_into(format, page, addr - self.bl_sett_addr, value)
+
+    def _page_slice(self, page, start_addr, end_addr):
+        # Inclusive address range of the settings page, without copying
+        return memoryview(page)[start_addr - self.bl_sett_addr:end_addr - self.bl_sett_addr + 1]
+
+    @staticmethod
+    def softdevice_to_bytes(sd_file):
+        """
+        Converts a SoftDevice .hex file to the binary image covered by the settings, that is without the MBR.
+        The conversion is done in memory, so it is safe to run from concurrent processes and threads.
+
+        :param sd_file: Path to the SoftDevice .hex file, or an IntelHex object holding its contents
+        :return: bytes
+        """
+        if not isinstance(sd_file, intelhex.IntelHex):
+            sd_file = intelhex.IntelHex(sd_file)
+
+        # nRFHex removes the MBR, everything below 0x1000, and the UICR while converting the image
+        return Package.normalize_firmware_to_bytes(sd_file)
 
     def generate(self, arch, app_file, app_ver, bl_ver, bl_sett_ver, custom_bl_sett_addr, no_backup,
-                 backup_address, app_boot_validation_type, sd_boot_validation_type, sd_file, signer):
+                 backup_address, app_boot_validation_type, sd_boot_validation_type, sd_file, signer,
+                 firmware_cache=None):
+        """
+        Generates the settings page, and its backup unless no_backup is set.
+
+        firmware_cache is an optional SettingsFirmwareCache. Settings generated with a shared cache
+        only convert and hash each application and SoftDevice image once.
+        """
+        if firmware_cache is None:
+            firmware_cache = SettingsFirmwareCache()
 
         self.set_arch(arch)
 
@@ -195,14 +287,14 @@ class BLDFUSettings:
         else:
             self.app_ver = 0x0 & 0xffffffff
 
-        if app_file is not None:
-            # load application to find out size and CRC
-            self.temp_dir = tempfile.mkdtemp(prefix="nrf_dfu_bl_sett_")
-            self.app_bin = Package.normalize_firmware_to_bin(self.temp_dir, app_file)
+        # Images to sign for ECDSA boot validation, signed together below
+        to_sign = []
 
-            # calculate application size and CRC32
-            self.app_sz = int(Package.calculate_file_size(self.app_bin)) & 0xffffffff
-            self.app_crc = int(Package.calculate_crc(32, self.app_bin)) & 0xffffffff
+        if app_file is not None:
+            # load application to find out size and CRC32
+            app_image = firmware_cache.application(app_file)
+            self.app_sz = app_image.size & 0xffffffff
+            self.app_crc = app_image.crc & 0xffffffff
             self.bank0_bank_code = 0x1 & 0xffffffff
 
             # Calculate Boot validation fields for app
@@ -211,13 +303,10 @@ class BLDFUSettings:
                 self.app_boot_validation_bytes = struct.pack('<I', self.app_crc)
             elif app_boot_validation_type == 'VALIDATE_GENERATED_SHA256':
                 self.app_boot_validation_type = 2 & 0xffffffff
-                # Package.calculate_sha256_hash gives a reversed
-                # digest. It need to be reversed back to a normal
-                # sha256 digest.
-                self.app_boot_validation_bytes = Package.calculate_sha256_hash(self.app_bin)[::-1]
+                self.app_boot_validation_bytes = app_image.sha256
             elif app_boot_validation_type == 'VALIDATE_ECDSA_P256_SHA256':
                 self.app_boot_validation_type = 3 & 0xffffffff
-                self.app_boot_validation_bytes = Package.sign_firmware(signer, self.app_bin)
+                to_sign.append(('app_boot_validation_bytes', app_image.bin))
             else:  # This also covers 'NO_VALIDATION' case
                 self.app_boot_validation_type = 0 & 0xffffffff
                 self.app_boot_validation_bytes = bytes(0)
@@ -229,35 +318,20 @@ class BLDFUSettings:
             self.app_boot_validation_bytes = bytes(0)
 
         if sd_file is not None:
-            # Load SD to calculate CRC
-            self.temp_dir = tempfile.mkdtemp(prefix="nrf_dfu_bl_sett")
-            temp_sd_file = os.path.join(os.getcwd(), 'temp_sd_file.hex')
-
-            # Load SD hex file and remove MBR before calculating keys
-            ih_sd = intelhex.IntelHex(sd_file)
-            ih_sd_no_mbr = intelhex.IntelHex()
-            ih_sd_no_mbr.merge(ih_sd[0x1000:], overlap='error')
-            ih_sd_no_mbr.write_hex_file(temp_sd_file)
-
-            self.sd_bin = Package.normalize_firmware_to_bin(self.temp_dir, temp_sd_file)
-            os.remove(temp_sd_file)
-
-            self.sd_sz = int(Package.calculate_file_size(self.sd_bin)) & 0xffffffff
+            # Load SD, without the MBR, to calculate size and CRC
+            sd_image = firmware_cache.softdevice(sd_file)
+            self.sd_sz = sd_image.size & 0xffffffff
 
             # Calculate Boot validation fields for SD
             if sd_boot_validation_type == 'VALIDATE_GENERATED_CRC':
                 self.sd_boot_validation_type = 1 & 0xffffffff
-                sd_crc = int(Package.calculate_crc(32, self.sd_bin)) & 0xffffffff
-                self.sd_boot_validation_bytes = struct.pack('<I', sd_crc)
+                self.sd_boot_validation_bytes = struct.pack('<I', sd_image.crc)
             elif sd_boot_validation_type == 'VALIDATE_GENERATED_SHA256':
                 self.sd_boot_validation_type = 2 & 0xffffffff
-                # Package.calculate_sha256_hash gives a reversed
-                # digest. It need to be reversed back to a normal
-                # sha256 digest.
-                self.sd_boot_validation_bytes = Package.calculate_sha256_hash(self.sd_bin)[::-1]
+                self.sd_boot_validation_bytes = sd_image.sha256
             elif sd_boot_validation_type == 'VALIDATE_ECDSA_P256_SHA256':
                 self.sd_boot_validation_type = 3 & 0xffffffff
-                self.sd_boot_validation_bytes = Package.sign_firmware(signer, self.sd_bin)
+                to_sign.append(('sd_boot_validation_bytes', sd_image.bin))
             else:  # This also covers 'NO_VALIDATION_CASE'
                 self.sd_boot_validation_type = 0 & 0xffffffff
                 self.sd_boot_validation_bytes = bytes(0)
@@ -266,46 +340,49 @@ class BLDFUSettings:
             self.sd_boot_validation_type = 0 & 0xffffffff
             self.sd_boot_validation_bytes = bytes(0)
 
+        if to_sign:
+            signatures = Package.sign_firmware_batch(signer, [image for _, image in to_sign])
+            for (name, _), signature in zip(to_sign, signatures):
+                setattr(self, name, signature)
+
         # additional hardcoded values
         self.bank_layout = 0x0 & 0xffffffff
         self.bank_current = 0x0 & 0xffffffff
 
-        # Fill the entire settings page with 0's
-        for offset in range(0, self.setts.bytes_count):
-            self.ihex[self.bl_sett_addr + offset] = 0x00
-            
-        # Make sure the hex-file is 32bit-word-aligned
-        fill_bytes = ((self.setts.bytes_count + 4 - 1) & ~(4 - 1)) - self.setts.bytes_count
-        for offset in range(self.setts.bytes_count, self.setts.bytes_count + fill_bytes):
-            self.ihex[self.bl_sett_addr + offset] = 0xFF
-        
-        self._add_value_tohex(self.setts.sett_ver, self.bl_sett_ver)
-        self._add_value_tohex(self.setts.app_ver, self.app_ver)
-        self._add_value_tohex(self.setts.bl_ver, self.bl_ver)
-        self._add_value_tohex(self.setts.bank_layout, self.bank_layout)
-        self._add_value_tohex(self.setts.bank_current, self.bank_current)
-        self._add_value_tohex(self.setts.bank0_img_sz, self.app_sz)
-        self._add_value_tohex(self.setts.bank0_img_crc, self.app_crc)
-        self._add_value_tohex(self.setts.bank0_bank_code, self.bank0_bank_code)
-        self._add_value_tohex(self.setts.sd_sz, self.sd_sz)
+        # The settings page is assembled in memory, zero filled and padded with 0xFF to be 32bit-word-aligned
+        page_size = (self.setts.bytes_count + 4 - 1) & ~(4 - 1)
+        page = bytearray(page_size)
+        page[self.setts.bytes_count:] = b'\xFF' * (page_size - self.setts.bytes_count)
+
+        self._pack_into(page, self.setts.sett_ver, self.bl_sett_ver)
+        self._pack_into(page, self.setts.app_ver, self.app_ver)
+        self._pack_into(page, self.setts.bl_ver, self.bl_ver)
+        self._pack_into(page, self.setts.bank_layout, self.bank_layout)
+        self._pack_into(page, self.setts.bank_current, self.bank_current)
+        self._pack_into(page, self.setts.bank0_img_sz, self.app_sz)
+        self._pack_into(page, self.setts.bank0_img_crc, self.app_crc)
+        self._pack_into(page, self.setts.bank0_bank_code, self.bank0_bank_code)
+        self._pack_into(page, self.setts.sd_sz, self.sd_sz)
 
         self.boot_validation_crc = 0x0 & 0xffffffff
         if self.bl_sett_ver == 2:
-            self._add_value_tohex(self.setts.sd_validation_type, self.sd_boot_validation_type, '<b')
-            self.ihex.puts(self.setts.sd_validation_bytes, self.sd_boot_validation_bytes)
+            self._pack_into(page, self.setts.sd_validation_type, self.sd_boot_validation_type, '<b')
+            self._pack_into(page, self.setts.sd_validation_bytes, self.sd_boot_validation_bytes,
+                            '{0}s'.format(len(self.sd_boot_validation_bytes)))
+
+            self._pack_into(page, self.setts.app_validation_type, self.app_boot_validation_type, '<b')
+            self._pack_into(page, self.setts.app_validation_bytes, self.app_boot_validation_bytes,
+                            '{0}s'.format(len(self.app_boot_validation_bytes)))
 
-            self._add_value_tohex(self.setts.app_validation_type, self.app_boot_validation_type, '<b')
-            self.ihex.puts(self.setts.app_validation_bytes, self.app_boot_validation_bytes)
+            self.boot_validation_crc = binascii.crc32(self._page_slice(page,
+                                                                       self.setts.sd_validation_type,
+                                                                       self.setts.last_addr)) & 0xffffffff
+            self._pack_into(page, self.setts.boot_validataion_crc, self.boot_validation_crc)
 
-            self.boot_validation_crc = self._calculate_crc32_from_hex(self.ihex,
-                                                                      start_addr=self.setts.sd_validation_type,
-                                                                      end_addr=self.setts.last_addr) & 0xffffffff
-            self._add_value_tohex(self.setts.boot_validataion_crc, self.boot_validation_crc)
+        self.crc = binascii.crc32(self._page_slice(page, self.bl_sett_addr + 4, self.setts.init_cmd - 1)) & 0xffffffff
+        self._pack_into(page, self.setts.crc, self.crc)
 
-        self.crc = self._calculate_crc32_from_hex(self.ihex,
-                                                  start_addr=self.bl_sett_addr+4,
-                                                  end_addr=self.setts.init_cmd - 1) & 0xffffffff
-        self._add_value_tohex(self.setts.crc, self.crc)
+        self.ihex.puts(self.bl_sett_addr, bytes(page))
 
         if backup_address is None:
             self.backup_address = self.bl_sett_addr - self.bl_sett_backup_offset
@@ -313,80 +390,47 @@ class BLDFUSettings:
             self.backup_address = backup_address
 
         if not no_backup:
-            for offset in range(0, self.setts.bytes_count):
-                self.ihex[self.backup_address + offset] = self.ihex[self.bl_sett_addr + offset]
-            for offset in range(self.setts.bytes_count, self.setts.bytes_count + fill_bytes):
-                self.ihex[self.backup_address + offset] = 0xFF
+            self.ihex.puts(self.backup_address, bytes(page))
 
     def probe_settings(self, base):
-        # Unpack CRC and version
-        fmt = '<I'
-        crc = struct.unpack(fmt, self.ihex.gets(base + 0, 4))[0] & 0xffffffff
-        ver = struct.unpack(fmt, self.ihex.gets(base + 4, 4))[0] & 0xffffffff
+        # The largest settings page is read at once, missing bytes read as 0xFF
+        page = self.ihex.tobinstr(start=base, end=BLDFUSettingsStructV2(base).last_addr)
+        settings = decode_settings(page)
 
-        if ver == 1:
+        if settings['bl_sett_ver'] == 1:
             self.setts = BLDFUSettingsStructV1(base)
-        elif ver == 2:
-            self.setts = BLDFUSettingsStructV2(base)
         else:
-            raise RuntimeError("Unknown Bootloader DFU settings version: {0}".format(ver))
-
-        # calculate the CRC32 over the data
-        _crc = self._calculate_crc32_from_hex(self.ihex,
-                                              start_addr=base + 4,
-                                              end_addr=self.setts.init_cmd - 1) & 0xffffffff
-
-        if _crc != crc:
-            raise RuntimeError("CRC32 mismtach: flash: {0} calculated: {1}".format(hex(crc), hex(_crc)))
-
-        self.crc = crc
-        self.bl_sett_ver     = self._get_value_fromhex(self.setts.sett_ver)
-        self.app_ver         = self._get_value_fromhex(self.setts.app_ver)
-        self.bl_ver          = self._get_value_fromhex(self.setts.bl_ver)
-        self.bank_layout     = self._get_value_fromhex(self.setts.bank_layout)
-        self.bank_current    = self._get_value_fromhex(self.setts.bank_current)
-        self.app_sz          = self._get_value_fromhex(self.setts.bank0_img_sz)
-        self.app_crc         = self._get_value_fromhex(self.setts.bank0_img_crc)
-        self.bank0_bank_code = self._get_value_fromhex(self.setts.bank0_bank_code)
+            self.setts = BLDFUSettingsStructV2(base)
 
-        if self.bl_sett_ver == 2:
-            self.sd_sz                    = self._get_value_fromhex(self.setts.sd_sz)
-            self.boot_validation_crc      = self._get_value_fromhex(self.setts.boot_validataion_crc)
-            self.sd_boot_validation_type  = self._get_value_fromhex(self.setts.sd_validation_type, size=1, format='<b')
-            self.app_boot_validation_type = self._get_value_fromhex(self.setts.app_validation_type, size=1, format='<b')
-        else:
-            self.sd_sz                    = 0x0 & 0xffffffff
-            self.boot_validation_crc      = 0x0 & 0xffffffff
-            self.sd_boot_validation_type  = 0x0 & 0xffffffff
-            self.app_boot_validation_type = 0x0 & 0xffffffff
+        self.crc                      = settings['crc']
+        self.bl_sett_ver              = settings['bl_sett_ver']
+        self.app_ver                  = settings['app_ver']
+        self.bl_ver                   = settings['bl_ver']
+        self.bank_layout              = settings['bank_layout']
+        self.bank_current             = settings['bank_current']
+        self.app_sz                   = settings['app_sz']
+        self.app_crc                  = settings['app_crc']
+        self.bank0_bank_code          = settings['bank0_bank_code']
+        self.sd_sz                    = settings['sd_sz']
+        self.boot_validation_crc      = settings['boot_validation_crc']
+        self.sd_boot_validation_type  = settings['sd_boot_validation_type']
+        self.app_boot_validation_type = settings['app_boot_validation_type']
 
     def fromhexfile(self, f, arch=None):
         self.hex_file = f
         self.ihex.fromfile(f, format='hex')
 
-        # check the 3 possible addresses for CRC matches
-        try:
-            self.probe_settings(BLDFUSettings.bl_sett_51_addr)
-            self.set_arch('NRF51')
-        except Exception as e:
+        # check the possible addresses for CRC matches
+        error = None
+        for arch_name, address in BLDFUSettings.bl_sett_addresses:
             try:
-                self.probe_settings(BLDFUSettings.bl_sett_52_addr)
-                self.set_arch('NRF52')
+                self.probe_settings(address)
+                self.set_arch(arch_name)
+                break
             except Exception as e:
-                print(e)
-                try:
-                    self.probe_settings(BLDFUSettings.bl_sett_52_qfab_addr)
-                    self.set_arch('NRF52QFAB')
-                except Exception as e:
-                    try:
-                        self.probe_settings(BLDFUSettings.bl_sett_52810_addr)
-                        self.set_arch('NRF52810')
-                    except Exception as e:
-                        try:
-                            self.probe_settings(BLDFUSettings.bl_sett_52840_addr)
-                            self.set_arch('NRF52840')
-                        except Exception as e:
-                            raise NordicSemiException("Failed to parse .hex file: {0}".format(e))
+                error = e
+        else:
+            raise NordicSemiException("Failed to parse .hex file: {0}".format(error))
 
         self.bl_sett_addr = self.ihex.minaddr()
 
@@ -417,3 +461,46 @@ Bootloader DFU Settings:
     def tohexfile(self, f):
         self.hex_file = f
         self.ihex.tofile(f, format='hex')
+
+
+# A firmware image as covered by the settings, with the values the settings are computed from
+SettingsFirmwareImage = namedtuple('SettingsFirmwareImage', ['bin', 'size', 'crc', 'sha256'])
+
+
+class SettingsFirmwareCache:
+    """
+        Keeps the application and SoftDevice images used for settings generation in memory, together with
+        their size, CRC32 and SHA-256 digest. The cache can be pickled and handed to worker processes.
+    """
+
+    def __init__(self):
+        self._images = {}
+
+    def application(self, app_file, ihex=None):
+        """
+        Returns the SettingsFirmwareImage of an application file (.hex or .bin), converting it on first use.
+        If the caller has already loaded the .hex file, it can pass the IntelHex object as ihex.
+        """
+        if ihex is not None:
+            return self._load('application', app_file, lambda _: Package.normalize_firmware_to_bytes(ihex))
+        return self._load('application', app_file, Package.normalize_firmware_to_bytes)
+
+    def softdevice(self, sd_file, ihex=None):
+        """
+        Returns the SettingsFirmwareImage of a SoftDevice .hex file without the MBR, converting it on first use.
+        If the caller has already loaded the .hex file, it can pass the IntelHex object as ihex.
+        """
+        if ihex is not None:
+            return self._load('softdevice', sd_file, lambda _: BLDFUSettings.softdevice_to_bytes(ihex))
+        return self._load('softdevice', sd_file, BLDFUSettings.softdevice_to_bytes)
+
+    def _load(self, kind, firmware_path, convert):
+        key = (kind, os.path.abspath(firmware_path))
+        if key not in self._images:
+            firmware_bin = convert(firmware_path)
+            self._images[key] = SettingsFirmwareImage(bin=firmware_bin,
+                                                      size=len(firmware_bin),
+                                                      crc=binascii.crc32(firmware_bin) & 0xffffffff,
+                                                      sha256=hashlib.sha256(firmware_bin).digest())
+
+        return self._images[key]
@@ -0,0 +1,502 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Hand-written codec for the messages of dfu-cc.proto.
+
+The classes mirror the parts of the dfu_cc_pb2 API that nrfutil uses (field access,
+HasField, CopyFrom, SerializeToString, ParseFromString and the text format of str()),
+and serialize to the same bytes as the protobuf runtime. Init packets can thereby be
+created and read without importing protobuf.
+"""
+
+# Enum values, see dfu-cc.proto
+
+# OpCode
+RESET = 0
+INIT = 1
+
+# FwType
+APPLICATION = 0
+SOFTDEVICE = 1
+BOOTLOADER = 2
+SOFTDEVICE_BOOTLOADER = 3
+EXTERNAL_APPLICATION = 4
+
+# HashType
+NO_HASH = 0
+CRC = 1
+SHA128 = 2
+SHA256 = 3
+SHA512 = 4
+
+# ValidationType
+NO_VALIDATION = 0
+VALIDATE_GENERATED_CRC = 1
+VALIDATE_SHA256 = 2
+VALIDATE_ECDSA_P256_SHA256 = 3
+
+# SignatureType
+ECDSA_P256_SHA256 = 0
+ED25519 = 1
+
+_OP_CODES = {RESET: 'RESET', INIT: 'INIT'}
+_FW_TYPES = {APPLICATION: 'APPLICATION', SOFTDEVICE: 'SOFTDEVICE', BOOTLOADER: 'BOOTLOADER',
+             SOFTDEVICE_BOOTLOADER: 'SOFTDEVICE_BOOTLOADER', EXTERNAL_APPLICATION: 'EXTERNAL_APPLICATION'}
+_HASH_TYPES = {NO_HASH: 'NO_HASH', CRC: 'CRC', SHA128: 'SHA128', SHA256: 'SHA256', SHA512: 'SHA512'}
+_VALIDATION_TYPES = {NO_VALIDATION: 'NO_VALIDATION', VALIDATE_GENERATED_CRC: 'VALIDATE_GENERATED_CRC',
+                     VALIDATE_SHA256: 'VALIDATE_SHA256', VALIDATE_ECDSA_P256_SHA256: 'VALIDATE_ECDSA_P256_SHA256'}
+_SIGNATURE_TYPES = {ECDSA_P256_SHA256: 'ECDSA_P256_SHA256', ED25519: 'ED25519'}
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+
+class DecodeError(Exception):
+    pass
+
+
+class EncodeError(Exception):
+    pass
+
+
+def _encode_varint(value):
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decode_varint(buf, pos, end):
+    result = 0
+    shift = 0
+    while True:
+        if pos >= end:
+            raise DecodeError("Truncated message.")
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result & 0xFFFFFFFFFFFFFFFF, pos
+        shift += 7
+        if shift >= 64:
+            raise DecodeError("Too many bytes when decoding varint.")
+
+
+def _escape_bytes(value):
+    # C escaping as done by the protobuf text format
+    out = []
+    for b in value:
+        if b == 0x0A:
+            out.append('\\n')
+        elif b == 0x0D:
+            out.append('\\r')
+        elif b == 0x09:
+            out.append('\\t')
+        elif b == 0x22:
+            out.append('\\"')
+        elif b == 0x27:
+            out.append("\\'")
+        elif b == 0x5C:
+            out.append('\\\\')
+        elif 32 <= b < 127:
+            out.append(chr(b))
+        else:
+            out.append('\\{0:03o}'.format(b))
+    return ''.join(out)
+
+
+class _Field:
+    """
+        Description of a message field: number, name, kind and, for enums and messages, the value
+        names or the message class. kind is one of 'uint32', 'bool', 'enum', 'bytes', 'message',
+        'packed_uint32' (repeated) and 'messages' (repeated).
+    """
+
+    def __init__(self, number, name, kind, type_info=None, required=False, default=None):
+        self.number = number
+        self.name = name
+        self.kind = kind
+        self.type_info = type_info
+        self.required = required
+        self.default = default
+        self.repeated = kind in ('packed_uint32', 'messages')
+
+
+class _RepeatedField(list):
+    """
+        List of a repeated field. Adding elements marks the owning message as set in its parent.
+    """
+
+    def __init__(self, owner, field):
+        super().__init__()
+        self._owner = owner
+        self._field = field
+
+    def append(self, value):
+        super().append(self._owner._check(self._field, value))
+        self._owner._mark()
+
+    def extend(self, values):
+        super().extend([self._owner._check(self._field, value) for value in values])
+        self._owner._mark()
+
+    def add(self, **kwargs):
+        message = self._field.type_info(**kwargs)
+        self.append(message)
+        return message
+
+
+class _Message:
+    """
+        Base class of the messages. Subclasses list their fields in FIELDS, in field number order.
+    """
+
+    FIELDS = ()
+
+    def __init__(self, **kwargs):
+        object.__setattr__(self, '_values', {})
+        object.__setattr__(self, '_parent', None)
+        for field in self.FIELDS:
+            if field.repeated:
+                self._values[field.name] = _RepeatedField(self, field)
+        for name, value in kwargs.items():
+            if self._field(name).repeated:
+                getattr(self, name).extend(value)
+            else:
+                setattr(self, name, value)
+
+    @classmethod
+    def _field(cls, name):
+        for field in cls.FIELDS:
+            if field.name == name:
+                return field
+        raise AttributeError("{0} has no field {1}".format(cls.__name__, name))
+
+    @staticmethod
+    def _check(field, value):
+        if field.kind in ('uint32', 'packed_uint32'):
+            if not isinstance(value, int) or not 0 <= value <= 0xFFFFFFFF:
+                raise ValueError("Value out of range: {0}".format(value))
+        elif field.kind == 'enum':
+            if value not in field.type_info:
+                raise ValueError("Unknown enum value: {0}".format(value))
+        elif field.kind == 'bool':
+            value = bool(value)
+        elif field.kind == 'bytes':
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            value = bytes(value)
+        elif field.kind in ('message', 'messages'):
+            if not isinstance(value, field.type_info):
+                raise TypeError("Expected {0}".format(field.type_info.__name__))
+        return value
+
+    def _mark(self):
+        # A message becomes set in its parent when one of its fields is set
+        parent = self._parent
+        if parent is not None:
+            owner, name = parent
+            if name not in owner._values:
+                owner._values[name] = self
+            owner._mark()
+
+    def __getattr__(self, name):
+        field = self._field(name)
+        values = self._values
+        if name in values:
+            return values[name]
+        if field.kind == 'message':
+            # Not set until one of its fields is set, as with protobuf
+            message = field.type_info()
+            object.__setattr__(message, '_parent', (self, name))
+            return message
+        return field.default
+
+    def __setattr__(self, name, value):
+        field = self._field(name)
+        if field.kind == 'message' or field.repeated:
+            raise AttributeError("Assignment not allowed to composite field {0}".format(name))
+        self._values[name] = self._check(field, value)
+        self._mark()
+
+    def HasField(self, name):
+        field = self._field(name)
+        if field.repeated:
+            raise ValueError("Protocol message has no singular \"{0}\" field.".format(name))
+        return name in self._values
+
+    def Clear(self):
+        object.__setattr__(self, '_values', {})
+        for field in self.FIELDS:
+            if field.repeated:
+                self._values[field.name] = _RepeatedField(self, field)
+
+    def CopyFrom(self, other):
+        if other is self:
+            return
+        self.Clear()
+        self.MergeFromString(other.SerializePartialToString())
+        self._mark()
+
+    def __eq__(self, other):
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self.SerializePartialToString() == other.SerializePartialToString()
+
+    def IsInitialized(self):
+        for field in self.FIELDS:
+            value = self._values.get(field.name)
+            if field.required and value is None:
+                return False
+            if field.kind == 'message' and value is not None and not value.IsInitialized():
+                return False
+            if field.kind == 'messages' and not all(message.IsInitialized() for message in value):
+                return False
+        return True
+
+    def SerializeToString(self):
+        if not self.IsInitialized():
+            raise EncodeError("Message {0} is missing required fields".format(type(self).__name__))
+        return self.SerializePartialToString()
+
+    def SerializePartialToString(self):
+        out = bytearray()
+        for field in self.FIELDS:
+            if field.name not in self._values:
+                continue
+            value = self._values[field.name]
+            kind = field.kind
+
+            if kind in ('uint32', 'enum', 'bool'):
+                out += _encode_varint(field.number << 3 | _WIRE_VARINT)
+                out += _encode_varint(int(value))
+            elif kind == 'bytes':
+                out += _encode_varint(field.number << 3 | _WIRE_LENGTH_DELIMITED)
+                out += _encode_varint(len(value))
+                out += value
+            elif kind == 'message':
+                data = value.SerializePartialToString()
+                out += _encode_varint(field.number << 3 | _WIRE_LENGTH_DELIMITED)
+                out += _encode_varint(len(data))
+                out += data
+            elif kind == 'packed_uint32':
+                if value:
+                    data = b''.join(_encode_varint(x) for x in value)
+                    out += _encode_varint(field.number << 3 | _WIRE_LENGTH_DELIMITED)
+                    out += _encode_varint(len(data))
+                    out += data
+            elif kind == 'messages':
+                for message in value:
+                    data = message.SerializePartialToString()
+                    out += _encode_varint(field.number << 3 | _WIRE_LENGTH_DELIMITED)
+                    out += _encode_varint(len(data))
+                    out += data
+        return bytes(out)
+
+    def ParseFromString(self, data):
+        self.Clear()
+        length = self.MergeFromString(data)
+        if not self.IsInitialized():
+            raise DecodeError("Message {0} is missing required fields".format(type(self).__name__))
+        return length
+
+    def MergeFromString(self, data):
+        buf = memoryview(bytes(data) if isinstance(data, (bytearray, memoryview)) else data)
+        self._merge(buf, 0, len(buf))
+        return len(buf)
+
+    def _merge(self, buf, pos, end):
+        fields = {field.number: field for field in self.FIELDS}
+        values = self._values
+
+        while pos < end:
+            tag, pos = _decode_varint(buf, pos, end)
+            number, wire_type = tag >> 3, tag & 0x7
+            field = fields.get(number)
+
+            if wire_type == _WIRE_VARINT:
+                value, pos = _decode_varint(buf, pos, end)
+                if field is None:
+                    continue
+                if field.kind == 'packed_uint32':
+                    # Unpacked encoding of a packed field is also accepted
+                    values[field.name].append(value & 0xFFFFFFFF)
+                elif field.kind == 'uint32':
+                    values[field.name] = value & 0xFFFFFFFF
+                elif field.kind == 'bool':
+                    values[field.name] = bool(value)
+                elif field.kind == 'enum':
+                    # Unknown values of closed enums are dropped, as protobuf does
+                    if value in field.type_info:
+                        values[field.name] = value
+                else:
+                    raise DecodeError("Wrong wire type for field {0}".format(field.name))
+            elif wire_type == _WIRE_LENGTH_DELIMITED:
+                length, pos = _decode_varint(buf, pos, end)
+                if pos + length > end:
+                    raise DecodeError("Truncated message.")
+                start, pos = pos, pos + length
+                if field is None:
+                    continue
+                if field.kind == 'bytes':
+                    values[field.name] = bytes(buf[start:pos])
+                elif field.kind == 'message':
+                    message = values.get(field.name)
+                    if message is None:
+                        message = field.type_info()
+                        values[field.name] = message
+                    message._merge(buf, start, pos)
+                elif field.kind == 'messages':
+                    message = field.type_info()
+                    message._merge(buf, start, pos)
+                    list.append(values[field.name], message)
+                elif field.kind == 'packed_uint32':
+                    repeated = values[field.name]
+                    while start < pos:
+                        value, start = _decode_varint(buf, start, pos)
+                        list.append(repeated, value & 0xFFFFFFFF)
+                else:
+                    raise DecodeError("Wrong wire type for field {0}".format(field.name))
+            elif wire_type == _WIRE_FIXED64:
+                pos += 8
+            elif wire_type == _WIRE_FIXED32:
+                pos += 4
+            else:
+                raise DecodeError("Unsupported wire type {0}".format(wire_type))
+
+            if pos > end:
+                raise DecodeError("Truncated message.")
+
+        for message in values.values():
+            if isinstance(message, _Message):
+                object.__setattr__(message, '_parent', None)
+
+    def _text_lines(self, indent):
+        lines = []
+        prefix = '  ' * indent
+        for field in self.FIELDS:
+            if field.name not in self._values:
+                continue
+            value = self._values[field.name]
+            kind = field.kind
+
+            if kind == 'message':
+                lines.append('{0}{1} {{'.format(prefix, field.name))
+                lines.extend(value._text_lines(indent + 1))
+                lines.append('{0}}}'.format(prefix))
+            elif kind == 'messages':
+                for message in value:
+                    lines.append('{0}{1} {{'.format(prefix, field.name))
+                    lines.extend(message._text_lines(indent + 1))
+                    lines.append('{0}}}'.format(prefix))
+            elif kind == 'packed_uint32':
+                lines.extend('{0}{1}: {2}'.format(prefix, field.name, x) for x in value)
+            elif kind == 'enum':
+                lines.append('{0}{1}: {2}'.format(prefix, field.name, field.type_info[value]))
+            elif kind == 'bool':
+                lines.append('{0}{1}: {2}'.format(prefix, field.name, 'true' if value else 'false'))
+            elif kind == 'bytes':
+                lines.append('{0}{1}: "{2}"'.format(prefix, field.name, _escape_bytes(value)))
+            else:
+                lines.append('{0}{1}: {2}'.format(prefix, field.name, value))
+        return lines
+
+    def __str__(self):
+        return ''.join(line + '\n' for line in self._text_lines(0))
+
+
+class Hash(_Message):
+    FIELDS = (
+        _Field(1, 'hash_type', 'enum', _HASH_TYPES, required=True, default=NO_HASH),
+        _Field(2, 'hash', 'bytes', required=True, default=b''),
+    )
+
+
+class BootValidation(_Message):
+    FIELDS = (
+        _Field(1, 'type', 'enum', _VALIDATION_TYPES, required=True, default=NO_VALIDATION),
+        _Field(2, 'bytes', 'bytes', required=True, default=b''),
+    )
+
+
+class InitCommand(_Message):
+    FIELDS = (
+        _Field(1, 'fw_version', 'uint32', default=0),
+        _Field(2, 'hw_version', 'uint32', default=0),
+        _Field(3, 'sd_req', 'packed_uint32'),
+        _Field(4, 'type', 'enum', _FW_TYPES, default=APPLICATION),
+        _Field(5, 'sd_size', 'uint32', default=0),
+        _Field(6, 'bl_size', 'uint32', default=0),
+        _Field(7, 'app_size', 'uint32', default=0),
+        _Field(8, 'hash', 'message', Hash),
+        _Field(9, 'is_debug', 'bool', default=False),
+        _Field(10, 'boot_validation', 'messages', BootValidation),
+    )
+
+
+class ResetCommand(_Message):
+    FIELDS = (
+        _Field(1, 'timeout', 'uint32', required=True, default=0),
+    )
+
+
+class Command(_Message):
+    FIELDS = (
+        _Field(1, 'op_code', 'enum', _OP_CODES, default=RESET),
+        _Field(2, 'init', 'message', InitCommand),
+        _Field(3, 'reset', 'message', ResetCommand),
+    )
+
+
+class SignedCommand(_Message):
+    FIELDS = (
+        _Field(1, 'command', 'message', Command, required=True),
+        _Field(2, 'signature_type', 'enum', _SIGNATURE_TYPES, required=True, default=ECDSA_P256_SHA256),
+        _Field(3, 'signature', 'bytes', required=True, default=b''),
+    )
+
+
+class Packet(_Message):
+    FIELDS = (
+        _Field(1, 'command', 'message', Command),
+        _Field(2, 'signed_command', 'message', SignedCommand),
+    )
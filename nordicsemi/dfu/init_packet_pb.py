@@ -35,7 +35,7 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
-from . import dfu_cc_pb2 as pb
+from . import dfu_cc as pb
 from enum import Enum
 
 class SigningTypes(Enum):
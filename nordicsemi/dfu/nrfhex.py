@@ -58,10 +58,10 @@ class nRFHex(intelhex.IntelHex):
 
     def __init__(self, source, bootloader=None, arch=None):
         """
-        Constructor that requires a firmware file path.
+        Constructor that requires a firmware file path, or an already loaded IntelHex object.
         Softdevices can take an optional bootloader file path as parameter.
 
-        :param str source: The file path for the firmware
+        :param source: The file path for the firmware, or an IntelHex object holding .hex contents
         :param str bootloader: Optional file path to bootloader firmware
         :return: None
         """
@@ -69,10 +69,14 @@ class nRFHex(intelhex.IntelHex):
         self.arch = arch
         self.file_format = 'hex'
 
-        if source.endswith('.bin'):
-            self.file_format = 'bin'
+        if isinstance(source, intelhex.IntelHex):
+            self._buf = dict(source._buf)
+            self.start_addr = source.start_addr
+        else:
+            if source.endswith('.bin'):
+                self.file_format = 'bin'
 
-        self.loadfile(source, self.file_format)
+            self.loadfile(source, self.file_format)
 
         if self.file_format == 'hex':
             self._removeuicr()
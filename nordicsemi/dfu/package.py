@@ -37,14 +37,16 @@
 #
 
 # Python standard library
+import io
 import os
 import tempfile
 import shutil
 import binascii
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 # 3rd party libraries
-from zipfile import ZipFile
+from zipfile import ZipFile, ZipInfo, ZIP_STORED, ZIP_DEFLATED
 import hashlib
 
 
@@ -56,8 +58,6 @@ from nordicsemi.dfu.model import HexType, FirmwareKeys
 from nordicsemi.dfu.crc16 import calc_crc16
 from nordicsemi.zigbee.ota_file import OTA_file
 
-from .signing import Signing
-
 HexTypeToInitPacketFwTypemap = {
     HexType.APPLICATION:            DFUType.APPLICATION,
     HexType.BOOTLOADER:             DFUType.BOOTLOADER,
@@ -114,6 +114,11 @@ class Package:
     DEFAULT_DFU_VER = 0.5
     MANIFEST_FILENAME = "manifest.json"
     DEFAULT_BOOT_VALIDATION_TYPE = ValidationTypes.VALIDATE_GENERATED_CRC.name
+    ZIP_COMPRESSION_TYPES = {'stored': ZIP_STORED, 'deflated': ZIP_DEFLATED}
+    DEFAULT_ZIP_COMPRESSION = 'stored'
+    # All zip members get the same timestamp, the earliest one a zip file can hold,
+    # so that packages generated from the same input are identical.
+    ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
 
     def __init__(self,
                  debug_mode=DEFAULT_DEBUG_MODE,
@@ -134,7 +139,8 @@ class Package:
                  image_type=0,
                  comment='',
                  zigbee_ota_min_hw_version=None,
-                 zigbee_ota_max_hw_version=None):
+                 zigbee_ota_max_hw_version=None,
+                 firmware_cache=None):
 
         """
         Constructor that requires values used for generating a Nordic DFU package.
@@ -151,6 +157,7 @@ class Package:
         :param Signing signer: Instance of Signing() for Signing key file (PEM)
         :param int zigbee_ota_min_hw_version: Minimal zigbee ota hardware version
         :param int zigbee_ota_max_hw_version: Maximum zigbee ota hardware version
+        :param FirmwareCache firmware_cache: Cache of normalized firmware binaries shared between packages
         :return: None
         """
 
@@ -220,11 +227,17 @@ class Package:
                                      boot_validation_type=sd_boot_validation_type,
                                      init_packet_data=init_packet_vars)
 
-        assert(not signer or isinstance(signer, Signing))
+        if signer:
+            # Signing pulls in the crypto libraries, which reading a package does not need
+            from .signing import Signing
+            assert(isinstance(signer, Signing))
         self.signer = signer
 
+        self.firmware_cache = firmware_cache if firmware_cache is not None else FirmwareCache()
+
         self.work_dir = None
         self.manifest = None
+        self.init_packets = {}
 
         if zigbee_format:
             self.is_zigbee = True
@@ -265,7 +278,58 @@ class Package:
 
         self.rm_work_dir(preserve_work_dir)
 
-    def image_str(self, index, hex_type, img):
+    def read_package(self, filename):
+        """
+        Reads the manifest and the init packets of a package, without extracting it.
+
+        Only manifest.json and the .dat members are read from the zip file, the firmware images are
+        left untouched. This is all that is needed to display a package.
+
+        :param filename: Path of the package, or a readable file-like object.
+        :return: None
+        """
+        if isinstance(filename, str) and not os.path.isfile(filename):
+            raise PackageException("Package {0} not found.".format(filename))
+
+        self.zip_file = filename
+        self.zip_dir = None
+        self.init_packets = {}
+
+        with ZipFile(filename, 'r') as pkg:
+            try:
+                self.manifest = Manifest.from_json(pkg.read(Package.MANIFEST_FILENAME).decode())
+                for _, img in self.images():
+                    self.init_packets[img.dat_file] = pkg.read(img.dat_file)
+            except KeyError as e:
+                raise PackageException("Invalid package {0}: {1}".format(filename, e))
+
+    def images(self):
+        """
+        Returns the images of the parsed manifest, in the order they are transferred.
+
+        :return: List of (HexType, Firmware) tuples
+        """
+        imgs = []
+        if self.manifest.softdevice_bootloader:
+            imgs.append((HexType.SD_BL, self.manifest.softdevice_bootloader))
+
+        if self.manifest.softdevice:
+            imgs.append((HexType.SOFTDEVICE, self.manifest.softdevice))
+
+        if self.manifest.bootloader:
+            imgs.append((HexType.BOOTLOADER, self.manifest.bootloader))
+
+        if self.manifest.application:
+            imgs.append((HexType.APPLICATION, self.manifest.application))
+
+        return imgs
+
+    def image_info(self, hex_type, img):
+        """
+        Decodes the init packet of an image.
+
+        :return: dict with the image files and the init packet fields.
+        """
         type_strs = {HexType.SD_BL : "sd_bl",
                     HexType.SOFTDEVICE : "softdevice",
                     HexType.BOOTLOADER : "bootloader",
@@ -273,32 +337,53 @@ class Package:
                     HexType.EXTERNAL_APPLICATION : "external application"}
 
         # parse init packet
-        with open(os.path.join(self.zip_dir, img.dat_file), "rb") as imgf:
-            initp_bytes = imgf.read()
+        if img.dat_file in self.init_packets:
+            initp_bytes = self.init_packets[img.dat_file]
+        else:
+            with open(os.path.join(self.zip_dir, img.dat_file), "rb") as imgf:
+                initp_bytes = imgf.read()
 
         initp = InitPacketPB(from_bytes=initp_bytes)
 
-        sd_req = ""
-        for x in initp.init_command.sd_req:
-            sd_req = sd_req + "0x{0:02X}, ".format(x)
-
-        if len(sd_req) != 0:
-            sd_req = sd_req[:-2]
-
         if (initp.packet.HasField('signed_command')):
             cmd = initp.packet.signed_command.command
             signature_type = SigningTypes(initp.packet.signed_command.signature_type).name
-            signature_hex = binascii.hexlify(initp.packet.signed_command.signature)
+            signature = initp.packet.signed_command.signature
         else:
             cmd = initp.packet.command
             signature_type = 'UNSIGNED'
+            signature = None
+
+        return {'type': type_strs[hex_type],
+                'bin_file': img.bin_file,
+                'dat_file': img.dat_file,
+                'op_code': CommandTypes(cmd.op_code).name,
+                'signature_type': signature_type,
+                'signature': signature,
+                'fw_version': cmd.init.fw_version,
+                'hw_version': cmd.init.hw_version,
+                'sd_req': list(cmd.init.sd_req),
+                'dfu_type': DFUType(cmd.init.type).name,
+                'sd_size': cmd.init.sd_size,
+                'bl_size': cmd.init.bl_size,
+                'app_size': cmd.init.app_size,
+                'hash_type': HashTypes(cmd.init.hash.hash_type).name,
+                'hash': cmd.init.hash.hash,
+                'boot_validation_type': [ValidationTypes(x.type).name for x in cmd.init.boot_validation],
+                'boot_validation_bytes': [x.bytes for x in cmd.init.boot_validation],
+                'is_debug': cmd.init.is_debug}
+
+    def image_str(self, index, hex_type, img):
+        info = self.image_info(hex_type, img)
+
+        sd_req = ", ".join("0x{0:02X}".format(x) for x in info['sd_req'])
+
+        if info['signature'] is not None:
+            signature_hex = binascii.hexlify(info['signature'])
+        else:
             signature_hex = 'N/A'
 
-        boot_validation_type = []
-        boot_validation_bytes = []
-        for x in cmd.init.boot_validation:
-            boot_validation_type.append(ValidationTypes(x.type).name)
-            boot_validation_bytes.append(binascii.hexlify(x.bytes))
+        boot_validation_bytes = [binascii.hexlify(x) for x in info['boot_validation_bytes']]
 
         s = """|
 |- Image #{0}:
@@ -327,46 +412,54 @@ class Package:
       |- is_debug: {18}
 
 """.format(index,
-        type_strs[hex_type],
-        img.bin_file,
-        img.dat_file,
-        CommandTypes(cmd.op_code).name,
-        signature_type,
+        info['type'],
+        info['bin_file'],
+        info['dat_file'],
+        info['op_code'],
+        info['signature_type'],
         signature_hex,
-        cmd.init.fw_version,
-        cmd.init.hw_version,
+        info['fw_version'],
+        info['hw_version'],
         sd_req,
-        DFUType(cmd.init.type).name,
-        cmd.init.sd_size,
-        cmd.init.bl_size,
-        cmd.init.app_size,
-        HashTypes(cmd.init.hash.hash_type).name,
-        binascii.hexlify(cmd.init.hash.hash),
-        boot_validation_type,
+        info['dfu_type'],
+        info['sd_size'],
+        info['bl_size'],
+        info['app_size'],
+        info['hash_type'],
+        binascii.hexlify(info['hash']),
+        info['boot_validation_type'],
         boot_validation_bytes,
-        cmd.init.is_debug,
+        info['is_debug'],
         )
 
         return s
 
-    def __str__(self):
+    def to_dict(self):
+        """
+        Describes the parsed package, with all binary fields as hex strings. Suitable for JSON output.
 
-        imgs = ""
-        i = 0
-        if self.manifest.softdevice_bootloader:
-            imgs = imgs + self.image_str(i, HexType.SD_BL, self.manifest.softdevice_bootloader)
-            i = i + 1
+        :return: dict
+        """
+        def hexstr(data):
+            return binascii.hexlify(data).decode() if data is not None else None
 
-        if self.manifest.softdevice:
-            imgs = imgs + self.image_str(i, HexType.SOFTDEVICE, self.manifest.softdevice)
-            i = i + 1
+        images = []
+        for hex_type, img in self.images():
+            info = self.image_info(hex_type, img)
+            info['signature'] = hexstr(info['signature'])
+            info['hash'] = hexstr(info['hash'])
+            info['boot_validation_bytes'] = [hexstr(x) for x in info['boot_validation_bytes']]
+            images.append(info)
 
-        if self.manifest.bootloader:
-            imgs = imgs + self.image_str(i, HexType.BOOTLOADER, self.manifest.bootloader)
-            i = i + 1
+        return {'package': self.zip_file if isinstance(self.zip_file, str) else None,
+                'images': images}
 
-        if self.manifest.application:
-            imgs = imgs + self.image_str(i, HexType.APPLICATION, self.manifest.application)
+    def __str__(self):
+
+        imgs = ""
+        i = 0
+        for hex_type, img in self.images():
+            imgs = imgs + self.image_str(i, hex_type, img)
             i = i + 1
 
         s = """
@@ -378,21 +471,61 @@ DFU Package: <{0}>:
         s = s + imgs
         return s
 
-    def generate_package(self, filename, preserve_work_dir=False):
+    def generate_package(self, filename, preserve_work_dir=False, jobs=1,
+                         compression=DEFAULT_ZIP_COMPRESSION, compress_level=None):
         """
         Generates a Nordic DFU package. The package is a zip file containing firmware(s) and metadata required
         for Nordic DFU applications to perform DFU onn nRF5X devices.
 
-        :param str filename: Filename for generated package.
-        :param bool preserve_work_dir: True to preserve the temporary working directory.
+        The package contents are built in memory and written straight to the zip file, no temporary
+        files are created unless preserve_work_dir is set.
+
+        :param filename: Filename for generated package, or a writable file-like object.
+        :param bool preserve_work_dir: True to store the package contents in a temporary working directory as well.
         Useful for debugging of a package, and if the user wants to look at the generated package without having to
         unzip it.
+        :param int jobs: Number of worker processes used to convert and sign the images. With 1 (the default)
+        everything runs in the calling process, None uses one process per CPU. The images of a package are
+        processed concurrently either way, and the generated package does not depend on this value.
+        :param str compression: 'stored' for uncompressed zip members, or 'deflated'.
+        :param int compress_level: Deflate level from 0 to 9, None for the zlib default.
         :return: None
         """
         self.zip_file = filename
-        self.work_dir = self.__create_temp_workspace()
 
-        sd_bin_created = False
+        if jobs == 1:
+            process_pool = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            process_pool = ProcessPoolExecutor(max_workers=jobs)
+        try:
+            contents = self.__generate_contents(process_pool)
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+
+        if preserve_work_dir:
+            self.work_dir = self.__create_temp_workspace()
+            for name, data in contents.items():
+                with open(os.path.join(self.work_dir, name), 'wb') as f:
+                    f.write(data)
+
+        # Package the in-memory contents to a zip file
+        Package.write_zip_package(contents, filename, compression, compress_level)
+
+        # Forget the temporary directory, if any
+        self.rm_work_dir(preserve_work_dir)
+
+    def __generate_contents(self, process_pool):
+        contents = {}
+
+        if process_pool is not None:
+            # Hex to binary conversion is pure Python, so spread it over the worker processes up front
+            self.firmware_cache.prefetch([firmware_data[FirmwareKeys.FIRMWARE_FILENAME]
+                                          for firmware_data in self.firmwares_data.values()],
+                                         process_pool)
+
+        sd_bin = None
         if Package._is_bootloader_softdevice_combination(self.firmwares_data):
             # Removing softdevice and bootloader data from dictionary and adding the combined later
             softdevice_fw_data = self.firmwares_data.pop(HexType.SOFTDEVICE)
@@ -401,14 +534,10 @@ DFU Package: <{0}>:
             softdevice_fw_name = softdevice_fw_data[FirmwareKeys.FIRMWARE_FILENAME]
             bootloader_fw_name = bootloader_fw_data[FirmwareKeys.FIRMWARE_FILENAME]
 
-            new_filename = "sd_bl.bin"
-            sd_bl_file_path = os.path.join(self.work_dir, new_filename)
-
-            nrf_hex = nRFHex(softdevice_fw_name, bootloader_fw_name)
-            nrf_hex.tobinfile(sd_bl_file_path)
-
-            softdevice_size = nrf_hex.size()
-            bootloader_size = nrf_hex.bootloadersize()
+            # The combined image is the SoftDevice binary directly followed by the bootloader binary.
+            # The SD only binary is also needed on its own for the boot validation signature.
+            sd_bin = self.firmware_cache.load(softdevice_fw_name)
+            bl_bin = self.firmware_cache.load(bootloader_fw_name)
 
             boot_validation_type = []
             boot_validation_type.extend(softdevice_fw_data[FirmwareKeys.BOOT_VALIDATION_TYPE])
@@ -416,130 +545,199 @@ DFU Package: <{0}>:
 
             self.__add_firmware_info(firmware_type=HexType.SD_BL,
                                      firmware_version=bootloader_fw_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.FW_VERSION],  # use bootloader version in combination with SD
-                                     filename=sd_bl_file_path,
+                                     filename="sd_bl.bin",
                                      init_packet_data=softdevice_fw_data[FirmwareKeys.INIT_PACKET_DATA],
                                      boot_validation_type=boot_validation_type,
-                                     sd_size=softdevice_size,
-                                     bl_size=bootloader_size)
+                                     sd_size=len(sd_bin),
+                                     bl_size=len(bl_bin))
 
-            # Need to generate SD only bin for boot validation signature
-            sd_bin = Package.normalize_firmware_to_bin(self.work_dir, softdevice_fw_data[FirmwareKeys.FIRMWARE_FILENAME])
-            sd_bin_path = os.path.join(self.work_dir, sd_bin)
-            sd_bin_created = True
+            self.firmwares_data[HexType.SD_BL][FirmwareKeys.BIN_FILENAME] = "sd_bl.bin"
+            contents["sd_bl.bin"] = sd_bin + bl_bin
 
+        firmware_sources = {}
         for key, firmware_data in self.firmwares_data.items():
-
-            # Normalize the firmware file and store it in the work directory
-            firmware_data[FirmwareKeys.BIN_FILENAME] = \
-                Package.normalize_firmware_to_bin(self.work_dir, firmware_data[FirmwareKeys.FIRMWARE_FILENAME])
-
-            # Calculate the hash for the .bin file located in the work directory
-            bin_file_path = os.path.join(self.work_dir, firmware_data[FirmwareKeys.BIN_FILENAME])
-            firmware_hash = Package.calculate_sha256_hash(bin_file_path)
-            bin_length = int(Package.calculate_file_size(bin_file_path))
-
-            sd_size = 0
-            bl_size = 0
-            app_size = 0
-            if key in [HexType.APPLICATION, HexType.EXTERNAL_APPLICATION]:
-                app_size = bin_length
-            elif key == HexType.SOFTDEVICE:
-                sd_size = bin_length
-            elif key == HexType.BOOTLOADER:
-                bl_size = bin_length
-            elif key == HexType.SD_BL:
-                bl_size = firmware_data[FirmwareKeys.BL_SIZE]
-                sd_size = firmware_data[FirmwareKeys.SD_SIZE]
-
-            boot_validation_type_array = firmware_data[FirmwareKeys.BOOT_VALIDATION_TYPE]
-            boot_validation_bytes_array = []
-            for x in boot_validation_type_array:
-                if x  == ValidationTypes.VALIDATE_ECDSA_P256_SHA256:
-                    if key == HexType.SD_BL:
-                        boot_validation_bytes_array.append(Package.sign_firmware(self.signer, sd_bin_path))
-                    else:
-                        boot_validation_bytes_array.append(Package.sign_firmware(self.signer, bin_file_path))
-                else:
-                    boot_validation_bytes_array.append(b'')
-
-
-            init_packet = InitPacketPB(
-                            from_bytes = None,
-                            hash_bytes=firmware_hash,
-                            hash_type=HashTypes.SHA256,
-                            boot_validation_type=boot_validation_type_array,
-                            boot_validation_bytes=boot_validation_bytes_array,
-                            dfu_type=HexTypeToInitPacketFwTypemap[key],
-                            is_debug=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.DEBUG_MODE],
-                            fw_version=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.FW_VERSION],
-                            hw_version=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.HW_VERSION],
-                            sd_size=sd_size,
-                            app_size=app_size,
-                            bl_size=bl_size,
-                            sd_req=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.REQUIRED_SOFTDEVICES_ARRAY])
-
-            if (self.signer is not None):
-                signature = self.signer.sign(init_packet.get_init_command_bytes())
+            if key == HexType.SD_BL:
+                firmware_sources[key] = (softdevice_fw_name, bootloader_fw_name)
+            else:
+                firmware_data[FirmwareKeys.BIN_FILENAME] = \
+                    Package.bin_filename(firmware_data[FirmwareKeys.FIRMWARE_FILENAME])
+                firmware_sources[key] = (firmware_data[FirmwareKeys.FIRMWARE_FILENAME],)
+
+            # Store the .dat file next to the .bin file
+            firmware_data[FirmwareKeys.DAT_FILENAME] = \
+                firmware_data[FirmwareKeys.BIN_FILENAME].replace(".bin", ".dat")
+
+        # The images are independent of each other, so hash and sign them concurrently
+        if len(self.firmwares_data) > 1:
+            with ThreadPoolExecutor(max_workers=len(self.firmwares_data)) as thread_pool:
+                futures = {key: thread_pool.submit(self.__generate_image, key, firmware_data, firmware_sources[key],
+                                                   contents.get(firmware_data[FirmwareKeys.BIN_FILENAME]),
+                                                   sd_bin, process_pool)
+                           for key, firmware_data in self.firmwares_data.items()}
+                images = {key: future.result() for key, future in futures.items()}
+        else:
+            images = {key: self.__generate_image(key, firmware_data, firmware_sources[key],
+                                                 contents.get(firmware_data[FirmwareKeys.BIN_FILENAME]),
+                                                 sd_bin, process_pool)
+                      for key, firmware_data in self.firmwares_data.items()}
+
+        # Sign all init packets in one go, a signing service then only sees one request per package
+        if self.signer is not None:
+            init_packets = [init_packet for _, init_packet in images.values()]
+            signatures = self.__sign_batch([init_packet.get_init_command_bytes() for init_packet in init_packets],
+                                           process_pool)
+            for init_packet, signature in zip(init_packets, signatures):
                 init_packet.set_signature(signature, SigningTypes.ECDSA_P256_SHA256)
 
-            # Store the .dat file in the work directory
-            init_packet_filename = firmware_data[FirmwareKeys.BIN_FILENAME].replace(".bin", ".dat")
-
-            with open(os.path.join(self.work_dir, init_packet_filename), 'wb') as init_packet_file:
-                init_packet_file.write(init_packet.get_init_packet_pb_bytes())
+        for key, firmware_data in self.firmwares_data.items():
+            firmware_bin, init_packet = images[key]
+            init_packet_bytes = init_packet.get_init_packet_pb_bytes()
 
-            firmware_data[FirmwareKeys.DAT_FILENAME] = \
-                init_packet_filename
+            # Results are joined in manifest order, which keeps the zip contents deterministic
+            contents.setdefault(firmware_data[FirmwareKeys.BIN_FILENAME], firmware_bin)
+            contents[firmware_data[FirmwareKeys.DAT_FILENAME]] = init_packet_bytes
 
             if self.is_zigbee:
                 firmware_version = firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.FW_VERSION]
-                file_name = firmware_data[FirmwareKeys.BIN_FILENAME]
 
                 self.zigbee_ota_file = OTA_file(firmware_version,
-                                                len(init_packet.get_init_packet_pb_bytes()),
-                                                binascii.crc32(init_packet.get_init_packet_pb_bytes()) & 0xFFFFFFFF,
-                                                init_packet.get_init_packet_pb_bytes(),
-                                                os.path.getsize(file_name),
-                                                self.calculate_crc(32, file_name) & 0xFFFFFFFF,
-                                                bytes(open(file_name, 'rb').read()),
+                                                len(init_packet_bytes),
+                                                binascii.crc32(init_packet_bytes) & 0xFFFFFFFF,
+                                                init_packet_bytes,
+                                                len(firmware_bin),
+                                                self.calculate_crc(32, firmware_bin) & 0xFFFFFFFF,
+                                                bytes(firmware_bin),
                                                 self.manufacturer_id,
                                                 self.image_type,
                                                 self.comment,
                                                 self.zigbee_ota_min_hw_version,
                                                 self.zigbee_ota_max_hw_version)
 
-                ota_file_handle = open(self.zigbee_ota_file.filename, 'wb')
-                ota_file_handle.write(self.zigbee_ota_file.binary)
-                ota_file_handle.close()
-
-        # Remove SD binary file created for boot validation
-        if sd_bin_created:
-            os.remove(sd_bin_path)
+                with open(self.zigbee_ota_file.filename, 'wb') as ota_file_handle:
+                    ota_file_handle.write(self.zigbee_ota_file.binary)
 
         # Store the manifest to manifest.json
-        manifest = self.create_manifest()
+        contents[Package.MANIFEST_FILENAME] = self.create_manifest().encode()
 
-        with open(os.path.join(self.work_dir, Package.MANIFEST_FILENAME), "w") as manifest_file:
-            manifest_file.write(manifest)
+        return contents
 
-        # Package the work_dir to a zip file
-        Package.create_zip_package(self.work_dir, filename)
+    def __generate_image(self, key, firmware_data, firmware_sources, firmware_bin, sd_bin, process_pool):
+        """
+        Builds the binary image and the unsigned init packet for one firmware of the package.
 
-        # Delete the temporary directory
-        self.rm_work_dir(preserve_work_dir)
+        :return: Tuple of the binary image and the InitPacketPB.
+        """
+        # Normalize the firmware file to a binary image held in memory, unless it is already built
+        if firmware_bin is None:
+            firmware_bin = self.firmware_cache.load(firmware_sources[0])
+
+        # Calculate the hash for the binary image
+        firmware_hash = self.firmware_cache.sha256_hash(*firmware_sources)
+        bin_length = len(firmware_bin)
+
+        sd_size = 0
+        bl_size = 0
+        app_size = 0
+        if key in [HexType.APPLICATION, HexType.EXTERNAL_APPLICATION]:
+            app_size = bin_length
+        elif key == HexType.SOFTDEVICE:
+            sd_size = bin_length
+        elif key == HexType.BOOTLOADER:
+            bl_size = bin_length
+        elif key == HexType.SD_BL:
+            bl_size = firmware_data[FirmwareKeys.BL_SIZE]
+            sd_size = firmware_data[FirmwareKeys.SD_SIZE]
+
+        boot_validation_type_array = firmware_data[FirmwareKeys.BOOT_VALIDATION_TYPE]
+        boot_validation_bytes_array = []
+        for x in boot_validation_type_array:
+            if x  == ValidationTypes.VALIDATE_ECDSA_P256_SHA256:
+                if key == HexType.SD_BL:
+                    boot_validation_bytes_array.append(self.__sign(sd_bin, process_pool))
+                else:
+                    boot_validation_bytes_array.append(self.__sign(firmware_bin, process_pool))
+            else:
+                boot_validation_bytes_array.append(b'')
+
+        init_packet = InitPacketPB(
+                        from_bytes = None,
+                        hash_bytes=firmware_hash,
+                        hash_type=HashTypes.SHA256,
+                        boot_validation_type=boot_validation_type_array,
+                        boot_validation_bytes=boot_validation_bytes_array,
+                        dfu_type=HexTypeToInitPacketFwTypemap[key],
+                        is_debug=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.DEBUG_MODE],
+                        fw_version=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.FW_VERSION],
+                        hw_version=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.HW_VERSION],
+                        sd_size=sd_size,
+                        app_size=app_size,
+                        bl_size=bl_size,
+                        sd_req=firmware_data[FirmwareKeys.INIT_PACKET_DATA][PacketField.REQUIRED_SOFTDEVICES_ARRAY])
+
+        return firmware_bin, init_packet
+
+    def __sign(self, data, process_pool):
+        if process_pool is None:
+            return Package.sign_firmware(self.signer, data)
+
+        # ECDSA signing holds the GIL, so it is handed to the worker processes
+        return process_pool.submit(Package.sign_firmware, self.signer, bytes(data)).result()
+
+    def __sign_batch(self, data_list, process_pool):
+        if process_pool is None or self.signer.remote:
+            return Package.sign_firmware_batch(self.signer, data_list)
+
+        futures = [process_pool.submit(Package.sign_firmware, self.signer, bytes(data)) for data in data_list]
+        return [future.result() for future in futures]
 
     @staticmethod
     def __create_temp_workspace():
         return tempfile.mkdtemp(prefix="nrf_dfu_pkg_")
 
     @staticmethod
-    def create_zip_package(work_dir, filename):
-        files = os.listdir(work_dir)
+    def create_zip_package(work_dir, filename, compression=DEFAULT_ZIP_COMPRESSION, compress_level=None):
+        contents = {}
+        for _file in os.listdir(work_dir):
+            with open(os.path.join(work_dir, _file), 'rb') as f:
+                contents[_file] = f.read()
+
+        Package.write_zip_package(contents, filename, compression, compress_level)
+
+    @staticmethod
+    def write_zip_package(contents, filename, compression=DEFAULT_ZIP_COMPRESSION, compress_level=None):
+        """
+        Writes in-memory package contents to a zip file.
+
+        The output only depends on the contents: members are stored in name order, with a fixed timestamp
+        and fixed attributes.
+
+        :param dict contents: Mapping of archive member names to their bytes
+        :param filename: Path of the zip file, or a writable file-like object
+        :param str compression: 'stored' or 'deflated'
+        :param int compress_level: Deflate level from 0 to 9, None for the zlib default
+        :return: None
+        """
+        if compression not in Package.ZIP_COMPRESSION_TYPES:
+            raise PackageException("Unknown zip compression: {0}".format(compression))
 
         with ZipFile(filename, 'w') as package:
-            for _file in files:
-                file_path = os.path.join(work_dir, _file)
-                package.write(file_path, _file)
+            for name in sorted(contents):
+                info = ZipInfo(name, date_time=Package.ZIP_DATE_TIME)
+                info.compress_type = Package.ZIP_COMPRESSION_TYPES[compression]
+                info.create_system = 3
+                info.external_attr = 0o644 << 16
+                package.writestr(info, contents[name], compresslevel=compress_level)
+
+    @staticmethod
+    def _firmware_bytes(firmware):
+        """
+        Returns the contents of a firmware given either as bytes or as a path to a binary file.
+        """
+        if isinstance(firmware, (bytes, bytearray, memoryview)):
+            return firmware
+
+        with open(firmware, 'rb') as firmware_file:
+            return firmware_file.read()
 
     @staticmethod
     def calculate_file_size(firmware_filename):
@@ -547,42 +745,39 @@ DFU Package: <{0}>:
         return b
 
     @staticmethod
-    def calculate_sha256_hash(firmware_filename):
-        read_buffer = 4096
+    def calculate_sha256_hash(firmware):
+        """
+        Calculates the SHA-256 hash of a firmware given as bytes or as a path to a binary file.
+        """
+        if isinstance(firmware, (bytes, bytearray, memoryview)):
+            digest = hashlib.sha256(firmware)
+        else:
+            read_buffer = 4096
 
-        digest = hashlib.sha256()
+            digest = hashlib.sha256()
 
-        with open(firmware_filename, 'rb') as firmware_file:
-            while True:
-                data = firmware_file.read(read_buffer)
+            with open(firmware, 'rb') as firmware_file:
+                while True:
+                    data = firmware_file.read(read_buffer)
 
-                if data:
-                    digest.update(data)
-                else:
-                    break
+                    if data:
+                        digest.update(data)
+                    else:
+                        break
 
         # return hash in little endian
         sha256 = digest.digest()
         return sha256[31::-1]
 
     @staticmethod
-    def calculate_crc(crc, firmware_filename):
+    def calculate_crc(crc, firmware):
         """
-        Calculates CRC16 has on provided firmware filename
+        Calculates CRC16 or CRC32 on provided firmware, given as bytes or as a path to a binary file.
 
         :type str firmware_filename:
         """
-        data_buffer = b''
-        read_size = 4096
-
-        with open(firmware_filename, 'rb') as firmware_file:
-            while True:
-                data = firmware_file.read(read_size)
+        data_buffer = Package._firmware_bytes(firmware)
 
-                if data:
-                    data_buffer += data
-                else:
-                    break
         if crc == 16:
             return calc_crc16(data_buffer, 0xffff)
         elif crc == 32:
@@ -591,12 +786,16 @@ DFU Package: <{0}>:
             raise ValueError("Invalid CRC type")
 
     @staticmethod
-    def sign_firmware(signer, firmware_filename):
+    def sign_firmware(signer, firmware):
+        from .signing import Signing
+        assert(isinstance(signer, Signing))
+        return signer.sign(Package._firmware_bytes(firmware))
+
+    @staticmethod
+    def sign_firmware_batch(signer, firmwares):
+        from .signing import Signing
         assert(isinstance(signer, Signing))
-        data_buffer = b''
-        with open(firmware_filename, 'rb') as firmware_file:
-            data_buffer = firmware_file.read()
-        return signer.sign(data_buffer)
+        return signer.sign_batch([Package._firmware_bytes(firmware) for firmware in firmwares])
 
     def create_manifest(self):
         manifest = ManifestGenerator(self.firmwares_data)
@@ -633,6 +832,25 @@ DFU Package: <{0}>:
 
         return new_filepath
 
+    @staticmethod
+    def normalize_firmware_to_bytes(firmware_path):
+        """
+        Converts a firmware file (.hex or .bin) to a binary image held in memory.
+
+        :param firmware_path: Path to the firmware file, or an IntelHex object holding .hex contents
+        :return: bytes: The binary image, as it would be written by normalize_firmware_to_bin
+        """
+        buf = io.BytesIO()
+        nRFHex(firmware_path).tobinfile(buf)
+        return buf.getvalue()
+
+    @staticmethod
+    def bin_filename(firmware_path):
+        """
+        Returns the name a firmware file gets inside a DFU package.
+        """
+        return os.path.basename(firmware_path).replace(".hex", ".bin")
+
     @staticmethod
     def unpack_package(package_path, target_dir):
         """
@@ -669,3 +887,56 @@ DFU Package: <{0}>:
                 """:type :str """
 
                 return Manifest.from_json(_json)
+
+
+class FirmwareCache:
+    """
+        Keeps firmware files normalized to binary images, and their hashes, in memory. Packages that share a
+        cache only convert and hash each firmware file once, which matters when many packages are generated
+        from the same images.
+    """
+
+    def __init__(self):
+        self._bins = {}
+        self._hashes = {}
+
+    @staticmethod
+    def _key(firmware_path):
+        return os.path.abspath(firmware_path)
+
+    def load(self, firmware_path):
+        """
+        Returns the binary image of a firmware file (.hex or .bin), converting it on first use.
+
+        :param str firmware_path: Path to the firmware file
+        :return: bytes
+        """
+        key = FirmwareCache._key(firmware_path)
+        if key not in self._bins:
+            self._bins[key] = Package.normalize_firmware_to_bytes(firmware_path)
+
+        return self._bins[key]
+
+    def prefetch(self, firmware_paths, executor):
+        """
+        Converts the firmware files that are not cached yet, using the given executor.
+
+        :param firmware_paths: Paths to the firmware files
+        :param executor: concurrent.futures.Executor to run the conversions on
+        :return: None
+        """
+        keys = sorted(set(FirmwareCache._key(path) for path in firmware_paths) - set(self._bins))
+        for key, firmware_bin in zip(keys, executor.map(Package.normalize_firmware_to_bytes, keys)):
+            self._bins[key] = firmware_bin
+
+    def sha256_hash(self, *firmware_paths):
+        """
+        Returns the little-endian SHA-256 hash of the concatenated binary images of the given firmware files.
+
+        :return: bytes
+        """
+        key = tuple(FirmwareCache._key(path) for path in firmware_paths)
+        if key not in self._hashes:
+            self._hashes[key] = Package.calculate_sha256_hash(b''.join(self.load(path) for path in firmware_paths))
+
+        return self._hashes[key]
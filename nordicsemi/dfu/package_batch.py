@@ -0,0 +1,252 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Python standard library
+import os
+import time
+import hashlib
+import logging
+
+# Nordic libraries
+from nordicsemi.dfu.batch import PackageSpecException, to_int, to_int_list, version_string_to_int, signer_ref, \
+    load_specs, run_batch, write_index
+from nordicsemi.dfu.package import Package, FirmwareCache
+from nordicsemi.dfu.model import FirmwareKeys
+
+logger = logging.getLogger(__name__)
+
+
+# Keys accepted in a package spec. They mirror the options of 'nrfutil pkg generate'.
+SPEC_KEYS = [
+    'zipfile',
+    'debug_mode',
+    'application',
+    'application_version',
+    'application_version_string',
+    'bootloader',
+    'bootloader_version',
+    'hw_version',
+    'sd_req',
+    'sd_id',
+    'softdevice',
+    'sd_boot_validation',
+    'app_boot_validation',
+    'key_file',
+    'signing_socket',
+    'external_app',
+]
+
+SPEC_PATH_KEYS = ['zipfile', 'application', 'bootloader', 'softdevice', 'key_file', 'signing_socket']
+
+
+def load_batch_spec(spec_file, spec_keys=SPEC_KEYS, path_keys=SPEC_PATH_KEYS, list_key='packages'):
+    """
+    Loads a list of package specs from a JSON or YAML file.
+
+    The file contains either a list of specs, or a mapping with the list under list_key.
+    Each spec is a mapping using the option names of 'nrfutil pkg generate', with '_' instead of '-'
+    and the output file given as 'zipfile'. Relative paths are resolved against the spec file directory.
+
+    :param str spec_file: Path to the spec file
+    :param list spec_keys: Keys accepted in a spec
+    :param list path_keys: Keys holding paths, resolved against the spec file directory
+    :param str list_key: Key of the spec list when the file holds a mapping
+    :return: list of spec dictionaries
+    """
+    return load_specs(spec_file, spec_keys, path_keys, list_key)
+
+
+def spec_to_package_args(spec):
+    """
+    Validates a package spec and converts it to keyword arguments for Package.
+    The checks follow the ones done by 'nrfutil pkg generate'.
+
+    :param dict spec: A package spec
+    :return: dict
+    """
+    if not spec.get('zipfile'):
+        raise PackageSpecException("zipfile required.")
+
+    if spec.get('key_file') and spec.get('signing_socket'):
+        raise PackageSpecException("key_file and signing_socket can not be used together.")
+
+    application = spec.get('application')
+    bootloader = spec.get('bootloader')
+    softdevice = spec.get('softdevice')
+    debug_mode = bool(spec.get('debug_mode', False))
+    external_app = bool(spec.get('external_app', False))
+
+    if spec.get('application_version_string'):
+        application_version = version_string_to_int(spec['application_version_string'])
+    else:
+        application_version = to_int(spec.get('application_version'), 'application_version')
+    bootloader_version = to_int(spec.get('bootloader_version'), 'bootloader_version')
+    hw_version = to_int(spec.get('hw_version'), 'hw_version')
+    sd_req = to_int_list(spec.get('sd_req'), 'sd_req')
+    sd_id = to_int_list(spec.get('sd_id'), 'sd_id')
+
+    if bootloader is not None and application is not None and softdevice is None:
+        raise PackageSpecException("Invalid combination: use two .zip packages instead.")
+
+    if application_version is not None and application is None:
+        raise PackageSpecException("Application version with no image.")
+
+    if bootloader_version is not None and bootloader is None:
+        raise PackageSpecException("Bootloader version with no image.")
+
+    if debug_mode:
+        if application_version is None:
+            application_version = Package.DEFAULT_APP_VERSION
+        if bootloader_version is None:
+            bootloader_version = Package.DEFAULT_BL_VERSION
+        if hw_version is None:
+            hw_version = Package.DEFAULT_HW_VERSION
+        if sd_req is None:
+            sd_req = list(Package.DEFAULT_SD_REQ)
+
+    if hw_version is None:
+        raise PackageSpecException("hw_version required.")
+
+    if sd_req is None and not external_app:
+        raise PackageSpecException("sd_req required.")
+
+    if application is not None and application_version is None:
+        raise PackageSpecException("application_version or application_version_string required with application image.")
+
+    if bootloader is not None and bootloader_version is None:
+        raise PackageSpecException("bootloader_version required with bootloader image.")
+
+    if application is not None and softdevice is not None and sd_id is None:
+        raise PackageSpecException("sd_id required with softdevice and application images.")
+
+    if external_app and (application is None or softdevice is not None or bootloader is not None):
+        raise PackageSpecException("external_app is only possible for application only DFU packages.")
+
+    boot_validations = (spec.get('app_boot_validation'), spec.get('sd_boot_validation'))
+    if 'VALIDATE_ECDSA_P256_SHA256' in boot_validations and signer_ref(spec) is None:
+        raise PackageSpecException("key_file or signing_socket required with 'VALIDATE_ECDSA_P256_SHA256'.")
+
+    sd_req_list = sd_req if sd_req is not None else []
+    if sd_id is not None:
+        # Same as 'nrfutil pkg generate': allow the SoftDevice update to be repeated
+        sd_req_list = sd_req_list + sorted(set(sd_id) - set(sd_req_list))
+        sd_id_list = sd_id
+    else:
+        sd_id_list = sd_req_list
+
+    for fw in (application, bootloader, softdevice, spec.get('key_file')):
+        if fw is not None and not os.path.isfile(fw):
+            raise PackageSpecException("File not found: {0}".format(fw))
+
+    return dict(debug_mode=debug_mode,
+                hw_version=hw_version,
+                app_version=application_version,
+                bl_version=bootloader_version,
+                sd_req=sd_req_list,
+                sd_id=sd_id_list,
+                app_fw=application,
+                bootloader_fw=bootloader,
+                softdevice_fw=softdevice,
+                sd_boot_validation=spec.get('sd_boot_validation'),
+                app_boot_validation=spec.get('app_boot_validation'),
+                is_external=external_app)
+
+
+def _generate_one(zipfile, package_args, signer, firmware_cache):
+    start_time = time.time()
+
+    try:
+        package = Package(signer=signer, firmware_cache=firmware_cache, **package_args)
+        package.generate_package(zipfile)
+    except Exception as e:
+        logger.exception(e)
+        return {'zipfile': zipfile, 'error': str(e)}
+
+    with open(zipfile, 'rb') as f:
+        data = f.read()
+
+    images = {}
+    for key, firmware_data in package.firmwares_data.items():
+        images[key.name.lower()] = {'bin_file': firmware_data[FirmwareKeys.BIN_FILENAME],
+                                    'dat_file': firmware_data[FirmwareKeys.DAT_FILENAME]}
+
+    return {'zipfile': zipfile,
+            'size': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'signed': signer is not None,
+            'images': images,
+            'duration': round(time.time() - start_time, 3)}
+
+
+def generate_packages(specs, jobs=None, index_file=None):
+    """
+    Generates DFU packages for a list of specs in a process pool.
+
+    The firmware files referenced by the specs are normalized and hashed once up front and handed to
+    every worker, and every worker loads each signing key or connects to each signing service only once.
+
+    :param list specs: Package specs, see load_batch_spec
+    :param int jobs: Number of worker processes, None for the number of CPUs and 1 to run in this process
+    :param str index_file: Optional path of a JSON summary of the generated packages
+    :return: list of per package result dictionaries, in spec order. Failed packages have an 'error' entry.
+    """
+    tasks = []
+    for spec in specs:
+        tasks.append((spec['zipfile'], spec_to_package_args(spec), signer_ref(spec)))
+
+    # Convert and hash every distinct image once, before the cache is handed to the workers
+    firmware_cache = FirmwareCache()
+    for _, package_args, _ in tasks:
+        app_fw = package_args['app_fw']
+        bootloader_fw = package_args['bootloader_fw']
+        softdevice_fw = package_args['softdevice_fw']
+
+        if app_fw is not None:
+            firmware_cache.sha256_hash(app_fw)
+        if bootloader_fw is not None and softdevice_fw is not None:
+            firmware_cache.sha256_hash(softdevice_fw, bootloader_fw)
+        elif bootloader_fw is not None:
+            firmware_cache.sha256_hash(bootloader_fw)
+        elif softdevice_fw is not None:
+            firmware_cache.sha256_hash(softdevice_fw)
+
+    results = run_batch(_generate_one, tasks, firmware_cache, jobs)
+
+    if index_file is not None:
+        write_index(index_file, 'packages', results)
+
+    return results
@@ -0,0 +1,236 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Verification of DFU packages. Each image of a package is checked against its init packet:
+the firmware hash, the declared image size, the init packet signature and the ECDSA
+boot validation signatures. Packages are read straight from the zip files, and many
+packages are verified concurrently in a process pool.
+"""
+
+# Python standard library
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from zipfile import ZipFile
+
+# Nordic libraries
+from nordicsemi.dfu.package import Package
+from nordicsemi.dfu.init_packet_pb import InitPacketPB, DFUType, HashTypes, ValidationTypes
+from nordicsemi.dfu.signing import Signing
+
+logger = logging.getLogger(__name__)
+
+# Check results that do not make a package fail
+PASSED = ('ok', 'not checked')
+
+# Per worker process state, set up once by _init_worker
+_worker_signer = None
+
+
+def find_packages(paths):
+    """
+    Expands directories to the .zip files they contain, recursively.
+
+    :param paths: Package files and directories
+    :return: list of package paths, sorted per directory
+    """
+    packages = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                packages.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith('.zip'))
+        else:
+            packages.append(path)
+    return packages
+
+
+def _verify_signature(signer, data, signature):
+    if signer is None:
+        return 'not checked'
+
+    # Signatures are stored with R and S little-endian, verify() takes them big-endian
+    signature_be = signature[31::-1] + signature[63:31:-1]
+    return 'ok' if signer.verify(data, signature_be) else 'invalid'
+
+
+def verify_image(firmware, init_packet_bytes, signer=None):
+    """
+    Checks a firmware image against its init packet.
+
+    :param bytes firmware: The binary image from the package
+    :param bytes init_packet_bytes: The init packet (.dat) from the package
+    :param Signing signer: Signing instance with the public key to verify signatures with, or None
+    :return: dict with the result of each check: 'ok', 'not checked', or the failure
+    """
+    initp = InitPacketPB(from_bytes=init_packet_bytes)
+    init_command = initp.init_command
+    checks = {}
+
+    if init_command.hash.hash_type == HashTypes.SHA256.value:
+        checks['hash'] = 'ok' if Package.calculate_sha256_hash(firmware) == init_command.hash.hash else 'mismatch'
+    else:
+        checks['hash'] = 'not checked'
+
+    dfu_type = DFUType(init_command.type)
+    if dfu_type in (DFUType.APPLICATION, DFUType.EXTERNAL_APPLICATION):
+        declared_size = init_command.app_size
+    elif dfu_type == DFUType.SOFTDEVICE:
+        declared_size = init_command.sd_size
+    elif dfu_type == DFUType.BOOTLOADER:
+        declared_size = init_command.bl_size
+    else:
+        declared_size = init_command.sd_size + init_command.bl_size
+    checks['size'] = 'ok' if declared_size == len(firmware) else \
+        'mismatch ({0} declared, {1} in package)'.format(declared_size, len(firmware))
+
+    if initp.packet.HasField('signed_command'):
+        checks['signature'] = _verify_signature(signer,
+                                                initp.get_init_command_bytes(),
+                                                initp.packet.signed_command.signature)
+    else:
+        # A package without signature is only acceptable if no key to check against was given
+        checks['signature'] = 'not checked' if signer is None else 'unsigned'
+
+    boot_validation = []
+    for x in init_command.boot_validation:
+        if x.type == ValidationTypes.VALIDATE_ECDSA_P256_SHA256.value:
+            # For SD+BL images, only the SoftDevice part is signed
+            signed_data = firmware[:init_command.sd_size] if dfu_type == DFUType.SOFTDEVICE_BOOTLOADER else firmware
+            boot_validation.append(_verify_signature(signer, signed_data, x.bytes))
+        else:
+            # The other validation types are computed on the device, the init packet carries no value
+            boot_validation.append('ok' if not x.bytes else 'unexpected bytes')
+    checks['boot_validation'] = boot_validation
+
+    return checks
+
+
+def _passed(checks):
+    return all(result in PASSED for result in [checks['hash'], checks['size'], checks['signature']]
+               + checks['boot_validation'])
+
+
+def verify_package(package_path, signer=None):
+    """
+    Verifies all images of a package.
+
+    :param str package_path: Path of the package
+    :param Signing signer: Signing instance with the public key to verify signatures with, or None
+    :return: dict with the per image checks, 'ok' and the time spent in seconds
+    """
+    start_time = time.time()
+    result = {'package': package_path, 'images': []}
+
+    try:
+        package = Package()
+        package.read_package(package_path)
+
+        with ZipFile(package_path, 'r') as pkg:
+            for hex_type, img in package.images():
+                checks = verify_image(pkg.read(img.bin_file), package.init_packets[img.dat_file], signer)
+                result['images'].append({'type': hex_type.name.lower(),
+                                         'bin_file': img.bin_file,
+                                         'dat_file': img.dat_file,
+                                         'checks': checks,
+                                         'ok': _passed(checks)})
+
+        result['ok'] = bool(result['images']) and all(image['ok'] for image in result['images'])
+        if not result['images']:
+            result['error'] = 'No images in package'
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = str(e)
+
+    result['duration'] = round(time.time() - start_time, 4)
+    return result
+
+
+def load_verifier(key_file=None, public_key_file=None):
+    """
+    Returns a Signing instance to verify with, from a private or a public key file, or None.
+    """
+    if key_file is None and public_key_file is None:
+        return None
+
+    signer = Signing()
+    if key_file is not None:
+        signer.load_key(key_file)
+    else:
+        signer.load_vk(public_key_file)
+    return signer
+
+
+def _init_worker(key_file, public_key_file):
+    global _worker_signer
+    _worker_signer = load_verifier(key_file, public_key_file)
+
+
+def _verify_one(package_path):
+    return verify_package(package_path, _worker_signer)
+
+
+def verify_packages(package_paths, key_file=None, public_key_file=None, jobs=None):
+    """
+    Verifies packages in a process pool.
+
+    :param list package_paths: Paths of the packages
+    :param str key_file: Private key (PEM) to verify signatures with
+    :param str public_key_file: Public key (PEM) to verify signatures with, if key_file is not given
+    :param int jobs: Number of worker processes, None for the number of CPUs and 1 to run in this process
+    :return: dict report with a result per package, in the order given, and totals
+    """
+    start_time = time.time()
+
+    if jobs == 1:
+        _init_worker(key_file, public_key_file)
+        results = [_verify_one(path) for path in package_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs,
+                                 initializer=_init_worker,
+                                 initargs=(key_file, public_key_file)) as executor:
+            results = list(executor.map(_verify_one, package_paths, chunksize=8))
+
+    passed = sum(1 for result in results if result['ok'])
+
+    return {'packages': results,
+            'passed': passed,
+            'failed': len(results) - passed,
+            'signatures_checked': key_file is not None or public_key_file is not None,
+            'duration': round(time.time() - start_time, 4)}
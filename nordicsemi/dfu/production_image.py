@@ -0,0 +1,293 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Python standard library
+import binascii
+import logging
+from collections import namedtuple
+
+# 3rd party libraries
+import intelhex
+
+# Nordic libraries
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings, SettingsFirmwareCache
+
+logger = logging.getLogger(__name__)
+
+# Address range, end exclusive, occupied by a component of the image
+Region = namedtuple('Region', ['name', 'start', 'end', 'used'])
+
+
+class ProductionImageException(Exception):
+    pass
+
+
+class ProductionImage:
+    """
+        Merges the SoftDevice, bootloader, bootloader settings, application and other component images
+        into one production image. Every component file is parsed once, the settings are computed from
+        the parsed images in memory, and the merged image is written in a single pass.
+    """
+
+    FLASH_SIZES = {
+        'NRF51':     0x40000,
+        'NRF52':     0x80000,
+        'NRF52QFAB': 0x40000,
+        'NRF52810':  0x30000,
+        'NRF52840':  0x100000,
+    }
+
+    UICR_START = 0x10001000
+    UICR_END = 0x10002000
+    BYTES_PER_RECORD = 16
+
+    def __init__(self, family):
+        if family not in ProductionImage.FLASH_SIZES:
+            raise ProductionImageException("Unknown family: {0}".format(family))
+
+        self.family = family
+        self.flash_size = ProductionImage.FLASH_SIZES[family]
+        self.start_addr = None
+        self.settings = None
+        # (name, IntelHex) in the order they were added
+        self._components = []
+        self._firmware_cache = SettingsFirmwareCache()
+        self._files = {}
+
+    def add_hex(self, name, hex_file):
+        """
+        Adds a component .hex file to the image.
+
+        :param str name: Name of the component in the layout, e.g. 'softdevice'
+        :param str hex_file: Path to the .hex file
+        :return: IntelHex: The parsed file
+        """
+        ih = intelhex.IntelHex(hex_file)
+        self._files[name] = (hex_file, ih)
+        self.add_data(name, ih)
+        return ih
+
+    def add_data(self, name, ih):
+        """
+        Adds a component, given as an IntelHex object, to the image.
+        """
+        if self.start_addr is None and ih.start_addr:
+            self.start_addr = ih.start_addr
+        self._components.append((name, ih))
+
+    def add_bytes(self, name, address, data):
+        """
+        Adds a component given as raw bytes at an address, e.g. a Zigbee Production Config.
+        """
+        ih = intelhex.IntelHex()
+        ih.puts(address, data)
+        self.add_data(name, ih)
+
+    def add_settings(self, app_ver, bl_ver, bl_sett_ver, custom_bl_sett_addr=None, no_backup=False,
+                     backup_address=None, app_boot_validation_type=None, sd_boot_validation_type=None,
+                     signer=None):
+        """
+        Adds the bootloader settings page, and its backup unless no_backup is set. The settings describe the
+        'application' and 'softdevice' components added before, and are computed without parsing them again.
+
+        :return: BLDFUSettings
+        """
+        app_file, app_ih = self._files.get('application', (None, None))
+        sd_file, sd_ih = self._files.get('softdevice', (None, None))
+
+        if app_file is not None:
+            self._firmware_cache.application(app_file, app_ih)
+        if sd_file is not None:
+            self._firmware_cache.softdevice(sd_file, sd_ih)
+
+        settings = BLDFUSettings()
+        settings.generate(arch=self.family, app_file=app_file, app_ver=app_ver, bl_ver=bl_ver,
+                          bl_sett_ver=bl_sett_ver, custom_bl_sett_addr=custom_bl_sett_addr, no_backup=no_backup,
+                          backup_address=backup_address, app_boot_validation_type=app_boot_validation_type,
+                          sd_boot_validation_type=sd_boot_validation_type, sd_file=sd_file, signer=signer,
+                          firmware_cache=self._firmware_cache)
+
+        self.add_data('settings', settings.ihex[settings.bl_sett_addr:settings.bl_sett_addr + settings.flash_page_sz])
+        if not no_backup:
+            self.add_data('settings backup',
+                          settings.ihex[settings.backup_address:settings.backup_address + settings.flash_page_sz])
+        self.settings = settings
+        return settings
+
+    def _segments(self):
+        segments = []
+        for name, ih in self._components:
+            for start, end in ih.segments():
+                segments.append((start, end, name, ih))
+        segments.sort(key=lambda segment: segment[0])
+        return segments
+
+    def check(self):
+        """
+        Checks that no two components overlap, and that every component is inside the flash or the UICR.
+
+        :return: list of (start, end, name, IntelHex) segments in address order
+        """
+        segments = self._segments()
+
+        # After sorting by start address, a segment overlaps an earlier one exactly when it starts
+        # before the furthest end address seen so far.
+        furthest = None
+        for segment in segments:
+            start, end, name, _ = segment
+            if furthest is not None and start < furthest[1]:
+                raise ProductionImageException("{0} (0x{1:08X}-0x{2:08X}) overlaps {3} (0x{4:08X}-0x{5:08X})".format(
+                    name, start, end - 1, furthest[2], furthest[0], furthest[1] - 1))
+            if furthest is None or end > furthest[1]:
+                furthest = segment
+
+            in_flash = end <= self.flash_size
+            in_uicr = start >= ProductionImage.UICR_START and end <= ProductionImage.UICR_END
+            if not (in_flash or in_uicr):
+                raise ProductionImageException("{0} (0x{1:08X}-0x{2:08X}) is outside the flash of {3}".format(
+                    name, start, end - 1, self.family))
+
+        return segments
+
+    def layout(self):
+        """
+        Returns the layout of the image: one Region per component, in address order, with the unused
+        flash between them as 'free' regions. Components that are split in several segments are reported
+        with their whole address range, and 'used' counts the bytes they actually hold.
+        """
+        regions = {}
+        for start, end, name, _ in self.check():
+            if name in regions:
+                region = regions[name]
+                regions[name] = Region(name, min(region.start, start), max(region.end, end),
+                                       region.used + end - start)
+            else:
+                regions[name] = Region(name, start, end, end - start)
+
+        layout = []
+        address = 0
+        for region in sorted(regions.values(), key=lambda region: region.start):
+            if region.start < self.flash_size and region.start > address:
+                layout.append(Region('free', address, region.start, 0))
+            layout.append(region)
+            address = max(address, region.end)
+        if address < self.flash_size:
+            layout.append(Region('free', address, self.flash_size, 0))
+
+        return layout
+
+    def free_flash(self):
+        """
+        Returns the number of flash bytes that are not used by any component.
+        """
+        return sum(region.end - region.start for region in self.layout() if region.name == 'free')
+
+    def layout_str(self):
+        lines = ["{0:<20} {1:>10} {2:>10} {3:>10} {4:>10}".format('Region', 'Start', 'End', 'Size', 'Used')]
+        for region in self.layout():
+            lines.append("{0:<20} 0x{1:08X} 0x{2:08X} {3:>10} {4:>10}".format(
+                region.name, region.start, region.end - 1, region.end - region.start, region.used))
+        lines.append("Free flash: {0} of {1} bytes".format(self.free_flash(), self.flash_size))
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {'family': self.family,
+                'flash_size': self.flash_size,
+                'free_flash': self.free_flash(),
+                'regions': [region._asdict() for region in self.layout()]}
+
+    @staticmethod
+    def _record(address, record_type, data):
+        record = bytes([len(data), (address >> 8) & 0xFF, address & 0xFF, record_type]) + data
+        checksum = (-sum(record)) & 0xFF
+        return ':' + binascii.hexlify(record + bytes([checksum])).decode('ascii').upper() + '\n'
+
+    def write_hex(self, f):
+        """
+        Writes the merged image in Intel HEX format, producing the same records as IntelHex.write_hex_file.
+
+        :param f: File object opened for writing text
+        """
+        segments = self.check()
+
+        if self.start_addr:
+            if sorted(self.start_addr) == ['CS', 'IP']:
+                f.write(self._record(0, 3, bytes([(self.start_addr['CS'] >> 8) & 0xFF, self.start_addr['CS'] & 0xFF,
+                                                  (self.start_addr['IP'] >> 8) & 0xFF, self.start_addr['IP'] & 0xFF])))
+            else:
+                f.write(self._record(0, 5, self.start_addr['EIP'].to_bytes(4, 'big')))
+
+        # Records run across components that follow each other without a gap
+        chunks = []
+        for start, end, _, ih in segments:
+            data = ih.tobinstr(start=start, end=end - 1)
+            if chunks and chunks[-1][1] == start:
+                chunks[-1] = (chunks[-1][0], end, chunks[-1][2] + data)
+            else:
+                chunks.append((start, end, data))
+
+        need_offset_record = bool(chunks) and chunks[-1][1] - 1 > 0xFFFF
+        high_ofs = None
+        for start, end, data in chunks:
+            address = start
+            while address < end:
+                if need_offset_record and (high_ofs is None or address >> 16 > high_ofs):
+                    high_ofs = address >> 16
+                    f.write(self._record(0, 4, high_ofs.to_bytes(2, 'big')))
+
+                length = min(ProductionImage.BYTES_PER_RECORD, 0x10000 - (address & 0xFFFF), end - address)
+                f.write(self._record(address & 0xFFFF, 0, data[address - start:address - start + length]))
+                address += length
+
+        f.write(":00000001FF\n")
+
+    def write_bin(self, f):
+        """
+        Writes the flash contents of the merged image as a binary file, from the lowest used address, with
+        unused bytes set to 0xFF. The UICR is not part of a binary image.
+
+        :param f: File object opened for writing bytes
+        """
+        address = None
+        for start, end, name, ih in self.check():
+            if start >= self.flash_size:
+                logger.warning("%s at 0x%08X is not part of the binary image", name, start)
+                continue
+            if address is not None:
+                f.write(b'\xFF' * (start - address))
+            f.write(ih.tobinstr(start=start, end=end - 1))
+            address = end
@@ -0,0 +1,232 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+# Python standard library
+import os
+import time
+import hashlib
+import logging
+
+# Nordic libraries
+from nordicsemi.dfu.batch import PackageSpecException, to_int, version_string_to_int, signer_ref, load_specs, \
+    run_batch, write_index
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings, SettingsFirmwareCache
+
+logger = logging.getLogger(__name__)
+
+# Keys accepted in a settings spec. They mirror the options of 'nrfutil settings generate'.
+SETTINGS_SPEC_KEYS = [
+    'hex_file',
+    'family',
+    'application',
+    'application_version',
+    'application_version_string',
+    'bootloader_version',
+    'bl_settings_version',
+    'start_address',
+    'no_backup',
+    'backup_address',
+    'app_boot_validation',
+    'sd_boot_validation',
+    'softdevice',
+    'key_file',
+    'signing_socket',
+]
+
+SETTINGS_SPEC_PATH_KEYS = ['hex_file', 'application', 'softdevice', 'key_file', 'signing_socket']
+
+FAMILIES = ['NRF51', 'NRF52', 'NRF52QFAB', 'NRF52810', 'NRF52840']
+
+BOOT_VALIDATION_TYPES = ['NO_VALIDATION',
+                         'VALIDATE_GENERATED_CRC',
+                         'VALIDATE_GENERATED_SHA256',
+                         'VALIDATE_ECDSA_P256_SHA256']
+
+DEFAULT_BOOT_VALIDATION = 'VALIDATE_GENERATED_CRC'
+
+
+def load_settings_spec(spec_file):
+    """
+    Loads a list of settings specs from a JSON or YAML file.
+
+    The file contains either a list of specs, or a mapping with the list under the 'settings' key.
+    Each spec is a mapping using the option names of 'nrfutil settings generate', with '_' instead of '-'
+    and the output file given as 'hex_file'. Relative paths are resolved against the spec file directory.
+
+    :param str spec_file: Path to the spec file
+    :return: list of spec dictionaries
+    """
+    return load_specs(spec_file, SETTINGS_SPEC_KEYS, SETTINGS_SPEC_PATH_KEYS, 'settings')
+
+
+def spec_to_settings_args(spec):
+    """
+    Validates a settings spec and converts it to keyword arguments for BLDFUSettings.generate.
+    The checks follow the ones done by 'nrfutil settings generate'.
+
+    :param dict spec: A settings spec
+    :return: dict
+    """
+    if not spec.get('hex_file'):
+        raise PackageSpecException("hex_file required.")
+
+    if spec.get('family') not in FAMILIES:
+        raise PackageSpecException("family must be one of {0}.".format(', '.join(FAMILIES)))
+
+    if spec.get('key_file') and spec.get('signing_socket'):
+        raise PackageSpecException("key_file and signing_socket can not be used together.")
+
+    application = spec.get('application')
+    softdevice = spec.get('softdevice')
+    no_backup = bool(spec.get('no_backup', False))
+    app_boot_validation = spec.get('app_boot_validation')
+    sd_boot_validation = spec.get('sd_boot_validation')
+
+    if spec.get('application_version_string'):
+        application_version = version_string_to_int(spec['application_version_string'])
+    else:
+        application_version = to_int(spec.get('application_version'), 'application_version')
+    bootloader_version = to_int(spec.get('bootloader_version'), 'bootloader_version')
+    bl_settings_version = to_int(spec.get('bl_settings_version'), 'bl_settings_version')
+    start_address = to_int(spec.get('start_address'), 'start_address')
+    backup_address = to_int(spec.get('backup_address'), 'backup_address')
+
+    if bootloader_version is None:
+        raise PackageSpecException("bootloader_version required.")
+
+    if bl_settings_version not in (1, 2):
+        raise PackageSpecException("bl_settings_version must be 1 or 2.")
+
+    if application is not None and application_version is None:
+        raise PackageSpecException("application_version or application_version_string required with application image.")
+
+    if no_backup and backup_address is not None:
+        raise PackageSpecException("backup_address can not be used together with no_backup.")
+
+    for validation in (app_boot_validation, sd_boot_validation):
+        if validation is not None and validation not in BOOT_VALIDATION_TYPES:
+            raise PackageSpecException("Unknown boot validation: {0}".format(validation))
+
+    if bl_settings_version == 1 and (app_boot_validation or sd_boot_validation):
+        raise PackageSpecException("Bootloader settings version 1 does not support boot validation.")
+
+    if 'VALIDATE_ECDSA_P256_SHA256' in (app_boot_validation, sd_boot_validation) and signer_ref(spec) is None:
+        raise PackageSpecException("key_file or signing_socket required with 'VALIDATE_ECDSA_P256_SHA256'.")
+
+    if app_boot_validation and application is None:
+        raise PackageSpecException("application required with app_boot_validation.")
+
+    if sd_boot_validation and softdevice is None:
+        raise PackageSpecException("softdevice required with sd_boot_validation.")
+
+    # Default boot validation cases
+    if app_boot_validation is None and application is not None and bl_settings_version == 2:
+        app_boot_validation = DEFAULT_BOOT_VALIDATION
+    if sd_boot_validation is None and softdevice is not None and bl_settings_version == 2:
+        sd_boot_validation = DEFAULT_BOOT_VALIDATION
+
+    for fw in (application, softdevice, spec.get('key_file')):
+        if fw is not None and not os.path.isfile(fw):
+            raise PackageSpecException("File not found: {0}".format(fw))
+
+    return dict(arch=spec['family'],
+                app_file=application,
+                app_ver=application_version,
+                bl_ver=bootloader_version,
+                bl_sett_ver=bl_settings_version,
+                custom_bl_sett_addr=start_address,
+                no_backup=no_backup,
+                backup_address=backup_address,
+                app_boot_validation_type=app_boot_validation,
+                sd_boot_validation_type=sd_boot_validation,
+                sd_file=softdevice)
+
+
+def _generate_one(hex_file, settings_args, signer, firmware_cache):
+    start_time = time.time()
+
+    try:
+        sett = BLDFUSettings()
+        sett.generate(signer=signer, firmware_cache=firmware_cache, **settings_args)
+        sett.tohexfile(hex_file)
+    except Exception as e:
+        logger.exception(e)
+        return {'hex_file': hex_file, 'error': str(e)}
+
+    with open(hex_file, 'rb') as f:
+        data = f.read()
+
+    return {'hex_file': hex_file,
+            'family': sett.arch_str,
+            'start_address': sett.bl_sett_addr,
+            'crc': sett.crc,
+            'boot_validation_crc': sett.boot_validation_crc,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'duration': round(time.time() - start_time, 3)}
+
+
+def generate_settings(specs, jobs=None, index_file=None):
+    """
+    Generates bootloader settings .hex files for a list of specs in a process pool.
+
+    The application and SoftDevice images referenced by the specs are converted and hashed once up front
+    and handed to every worker, and every worker loads each signing key or connects to each signing service
+    only once.
+
+    :param list specs: Settings specs, see load_settings_spec
+    :param int jobs: Number of worker processes, None for the number of CPUs and 1 to run in this process
+    :param str index_file: Optional path of a JSON summary of the generated settings
+    :return: list of per settings result dictionaries, in spec order. Failed settings have an 'error' entry.
+    """
+    tasks = []
+    for spec in specs:
+        tasks.append((spec['hex_file'], spec_to_settings_args(spec), signer_ref(spec)))
+
+    # Convert and hash every distinct image once, before the cache is handed to the workers
+    firmware_cache = SettingsFirmwareCache()
+    for _, settings_args, _ in tasks:
+        if settings_args['app_file'] is not None:
+            firmware_cache.application(settings_args['app_file'])
+        if settings_args['sd_file'] is not None:
+            firmware_cache.softdevice(settings_args['sd_file'])
+
+    results = run_batch(_generate_one, tasks, firmware_cache, jobs)
+
+    if index_file is not None:
+        write_index(index_file, 'settings', results)
+
+    return results
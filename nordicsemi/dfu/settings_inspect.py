@@ -0,0 +1,192 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Inspection of bootloader settings in flash dumps. Every known settings page address, and the
+backup page below it, is probed in each dump. Binary dumps are memory-mapped and decoded in
+place, and only the records of .hex dumps that cover a probed page are decoded. Many dumps are
+inspected concurrently in a process pool.
+"""
+
+# Python standard library
+import os
+import mmap
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+# Nordic libraries
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings, BLDFUSettingsStructV2, decode_settings
+
+logger = logging.getLogger(__name__)
+
+DUMP_EXTENSIONS = ('.bin', '.hex')
+
+# Size of the largest settings page
+PAGE_SIZE = BLDFUSettingsStructV2(0).bytes_count
+
+# (address, family, page) of every settings and backup page address, in address order
+PROBE_ADDRESSES = sorted(
+    [(address, family, 'settings') for family, address in BLDFUSettings.bl_sett_addresses] +
+    [(address - BLDFUSettings.bl_sett_backup_offset, family, 'backup')
+     for family, address in BLDFUSettings.bl_sett_addresses])
+
+
+def find_dumps(paths):
+    """
+    Expands directories to the .bin and .hex files they contain, recursively.
+
+    :param paths: Dump files and directories
+    :return: list of dump paths, sorted per directory
+    """
+    dumps = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                dumps.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(DUMP_EXTENSIONS))
+        else:
+            dumps.append(path)
+    return dumps
+
+
+def _read_hex_pages(path):
+    """
+    Reads the probed pages from a .hex file. Only the data records that overlap a page are decoded.
+
+    :return: dict of page address to bytearray, with bytes that are not in the file set to 0xFF
+    """
+    pages = {}
+    windows = [(address, address + PAGE_SIZE) for address, _, _ in PROBE_ADDRESSES]
+    upper = 0
+
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.startswith(':'):
+                continue
+
+            length = int(line[1:3], 16)
+            record_type = int(line[7:9], 16)
+
+            if record_type == 0:
+                start = upper + int(line[3:7], 16)
+                end = start + length
+                for window_start, window_end in windows:
+                    if start < window_end and end > window_start:
+                        data = bytes.fromhex(line[9:9 + 2 * length])
+                        page = pages.setdefault(window_start, bytearray(b'\xFF' * PAGE_SIZE))
+                        first = max(start, window_start)
+                        last = min(end, window_end)
+                        page[first - window_start:last - window_start] = data[first - start:last - start]
+            elif record_type == 2:
+                upper = int(line[9:13], 16) << 4
+            elif record_type == 4:
+                upper = int(line[9:13], 16) << 16
+            elif record_type == 1:
+                break
+
+    return pages
+
+
+def _page_to_dict(address, family, page, settings):
+    result = {'address': address, 'family': family, 'page': page}
+    for key, value in settings.items():
+        result[key] = value.hex() if isinstance(value, bytes) else value
+    return result
+
+
+def inspect_dump(path, base_address=0):
+    """
+    Finds and decodes the bootloader settings pages of a flash dump.
+
+    :param str path: Path to a .bin or .hex flash dump
+    :param int base_address: Flash address of the first byte of a .bin dump
+    :return: dict with the settings and backup pages found, with valid CRCs
+    """
+    start_time = time.time()
+    pages = []
+    result = {'dump': path, 'pages': pages}
+
+    try:
+        if path.lower().endswith('.hex'):
+            hex_pages = _read_hex_pages(path)
+            for address, family, page in PROBE_ADDRESSES:
+                if address in hex_pages:
+                    try:
+                        pages.append(_page_to_dict(address, family, page, decode_settings(hex_pages[address])))
+                    except RuntimeError:
+                        pass
+        elif os.path.getsize(path) > 0:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dump:
+                for address, family, page in PROBE_ADDRESSES:
+                    try:
+                        pages.append(_page_to_dict(address, family, page,
+                                                   decode_settings(dump, address - base_address)))
+                    except RuntimeError:
+                        pass
+    except Exception as e:
+        logger.exception(e)
+        result['error'] = str(e)
+
+    result['ok'] = 'error' not in result and any(page['page'] == 'settings' for page in pages)
+    result['duration'] = round(time.time() - start_time, 4)
+    return result
+
+
+def inspect_dumps(dump_paths, base_address=0, jobs=None):
+    """
+    Inspects flash dumps in a process pool.
+
+    :param list dump_paths: Paths of the dumps
+    :param int base_address: Flash address of the first byte of the .bin dumps
+    :param int jobs: Number of worker processes, None for the number of CPUs and 1 to run in this process
+    :return: dict report with a result per dump, in the order given, and totals
+    """
+    start_time = time.time()
+
+    if jobs == 1:
+        results = [inspect_dump(path, base_address) for path in dump_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(inspect_dump, dump_paths, [base_address] * len(dump_paths), chunksize=8))
+
+    found = sum(1 for result in results if result['ok'])
+
+    return {'dumps': results,
+            'found': found,
+            'not_found': len(results) - found,
+            'duration': round(time.time() - start_time, 4)}
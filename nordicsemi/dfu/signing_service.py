@@ -0,0 +1,333 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Local signing service. A long-lived server process holds the signing key in memory and signs
+data for clients on the same machine, over a Unix domain socket. Build nodes then only need
+access to the socket, not to the key file, and do not pay for loading the key on every call.
+
+Messages are JSON objects, each preceded by its length as a 32 bit big-endian integer. A client
+sends a request and waits for the response before sending the next one on the same connection:
+
+    {"op": "sign", "data": [<hex>, ...]}            -> {"signatures": [<hex>, ...]}
+    {"op": "verify", "data": <hex>, "signature": <hex>} -> {"valid": <bool>}
+    {"op": "info"}                                  -> {"default_key": <bool>, "public_key": <hex>, "backend": <str>}
+
+Failed requests are answered with {"error": <message>}. Signatures have the same format as the
+ones returned by Signing.sign.
+"""
+
+import binascii
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import threading
+
+from nordicsemi.dfu.signing import Signing, is_default_key
+
+logger = logging.getLogger(__name__)
+
+# Upper limit for a single message, to protect the server from bogus length headers
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+_header = struct.Struct('>I')
+
+
+class SigningServiceException(Exception):
+    pass
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_message(sock, message):
+    payload = json.dumps(message).encode()
+    sock.sendall(_header.pack(len(payload)) + payload)
+
+
+def recv_message(sock):
+    """
+    Receives one message. Returns None if the connection was closed.
+    """
+    header = _recv_exactly(sock, _header.size)
+    if header is None:
+        return None
+
+    (size,) = _header.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise SigningServiceException("Message too large: {0} bytes".format(size))
+
+    payload = _recv_exactly(sock, size)
+    if payload is None:
+        return None
+
+    return json.loads(payload.decode())
+
+
+def _remove_stale_socket(socket_path):
+    """
+    Removes a socket file left behind by a server that is gone. Raises SigningServiceException if
+    the path is not a socket, or if a server still accepts connections on it.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise SigningServiceException("{0} exists and is not a socket".format(socket_path))
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except ConnectionRefusedError:
+        os.remove(socket_path)
+        return
+    finally:
+        sock.close()
+
+    raise SigningServiceException("A signing service is already listening on {0}".format(socket_path))
+
+
+class _SigningRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (SigningServiceException, ValueError) as e:
+                logger.error("Dropping client: %s", e)
+                return
+
+            if request is None:
+                return
+
+            try:
+                response = self.server.process(request)
+            except Exception as e:
+                response = {'error': str(e)}
+
+            send_message(self.request, response)
+
+
+class SigningServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Signs requests from local clients with a key held in memory.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, signer):
+        """
+        :param str socket_path: Path of the Unix domain socket to listen on. A stale socket file is replaced,
+        a socket another server still listens on is not.
+        :param Signing signer: Signing instance with the key loaded
+        """
+        if signer.sk is None:
+            raise SigningServiceException("No signing key loaded")
+
+        self.signer = signer
+        self.default_key = is_default_key(signer.sk)
+        self.public_key = signer.sk.get_verifying_key().to_string()
+
+        # Sign once up front, so that the backend and the precomputed curve tables
+        # are ready before the first request comes in
+        signer.sign(b'')
+
+        _remove_stale_socket(socket_path)
+
+        # Only the user running the server may connect. The socket is created with these permissions,
+        # changing them after the bind would leave a window in which anyone could connect.
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.__init__(self, socket_path, _SigningRequestHandler)
+        finally:
+            os.umask(umask)
+
+    def process(self, request):
+        op = request.get('op')
+
+        if op == 'sign':
+            signatures = [self.signer.sign(binascii.unhexlify(data)) for data in request['data']]
+            return {'signatures': [binascii.hexlify(signature).decode() for signature in signatures]}
+
+        if op == 'verify':
+            valid = self.signer.verify(binascii.unhexlify(request['data']), binascii.unhexlify(request['signature']))
+            return {'valid': valid}
+
+        if op == 'info':
+            return {'default_key': self.default_key,
+                    'public_key': binascii.hexlify(self.public_key).decode(),
+                    'backend': self.signer.backend.name}
+
+        raise SigningServiceException("Unknown operation: {0}".format(op))
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class SigningClient(Signing):
+    """
+    Signing adapter that forwards signing requests to a SigningServer. It can be used wherever
+    a Signing instance with a loaded key is expected, for instance by Package and BLDFUSettings.
+
+    The key stays with the server: loading, generating and exporting keys is not supported.
+    """
+    remote = True
+
+    def __init__(self, socket_path):
+        Signing.__init__(self)
+        self.socket_path = socket_path
+        self._sock = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # The connection is per process, a copy connects again on first use
+        state = Signing.__getstate__(self)
+        state['_sock'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _request(self, request):
+        with self._lock:
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.connect(self.socket_path)
+                except OSError as e:
+                    sock.close()
+                    raise SigningServiceException("Can't connect to signing service at {0}: {1}"
+                                                  .format(self.socket_path, e))
+                self._sock = sock
+
+            try:
+                send_message(self._sock, request)
+                response = recv_message(self._sock)
+            except OSError as e:
+                self.close()
+                raise SigningServiceException("Signing service connection failed: {0}".format(e))
+
+        if response is None:
+            self.close()
+            raise SigningServiceException("Signing service closed the connection")
+
+        if 'error' in response:
+            raise SigningServiceException(response['error'])
+
+        return response
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def sign_batch(self, data_list):
+        """
+        Sign several buffers in one request.
+
+        :return: list of signatures, in the format of Signing.sign
+        """
+        response = self._request({'op': 'sign',
+                                  'data': [binascii.hexlify(data).decode() for data in data_list]})
+        return [binascii.unhexlify(signature) for signature in response['signatures']]
+
+    def sign(self, init_packet_data):
+        return self.sign_batch([init_packet_data])[0]
+
+    def verify(self, init_packet, signature):
+        response = self._request({'op': 'verify',
+                                  'data': binascii.hexlify(init_packet).decode(),
+                                  'signature': binascii.hexlify(signature).decode()})
+        return response['valid']
+
+    def is_default_key(self):
+        """
+        Check if the service signs with the widely distributed default key
+        """
+        return self._request({'op': 'info'})['default_key']
+
+    def _no_key(self, *args, **kwargs):
+        raise SigningServiceException("The signing key is held by the signing service at {0}"
+                                      .format(self.socket_path))
+
+    gen_key = _no_key
+    load_key = _no_key
+    load_vk = _no_key
+    get_vk = _no_key
+    get_sk = _no_key
+    get_sk_hex = _no_key
+    get_vk_hex = _no_key
+    get_vk_code = _no_key
+    get_vk_pem = _no_key
+
+
+def serve(socket_path, key_file, backend=None):
+    """
+    Load a key and serve signing requests on socket_path until interrupted.
+    """
+    signer = Signing(backend=backend)
+    signer.load_key(key_file)
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt()
+
+    # Stop cleanly, removing the socket file, when terminated as a background process
+    signal.signal(signal.SIGTERM, _terminate)
+
+    with SigningServer(socket_path, signer) as server:
+        logger.info("Signing service listening on %s", socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -35,10 +35,14 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import binascii
 import os
+import shutil
 import struct
+import tempfile
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
 from nordicsemi.dfu.nrfhex import nRFArch
 from nordicsemi.dfu.signing import Signing
@@ -67,6 +71,39 @@ class TestBLDFUSettingsV1(unittest.TestCase):
         self.assertEqual(0x62C83F81, settings.app_crc)
         self.assertEqual(0x00000001, settings.bank0_bank_code)
 
+    def test_calculate_crc32_from_hex(self):
+        settings = BLDFUSettings()
+        settings.fromhexfile('firmwares/bl_settings_v1_nrf52.hex')
+
+        start = settings.bl_sett_addr + 4
+        end = settings.bl_sett_addr + 0x5C - 1
+        data = settings.ihex.tobinstr(start, end)
+        self.assertEqual(binascii.crc32(data) & 0xFFFFFFFF,
+                         settings._calculate_crc32_from_hex(settings.ihex, start, end))
+        self.assertEqual(binascii.crc32(settings.ihex.tobinstr()) & 0xFFFFFFFF,
+                         settings._calculate_crc32_from_hex(settings.ihex))
+
+    def test_generate_backup_matches_settings(self):
+        settings = BLDFUSettings()
+        settings.generate(arch='NRF52',
+                          app_file='firmwares/bar.hex',
+                          app_ver=1,
+                          bl_ver=1,
+                          bl_sett_ver=2,
+                          custom_bl_sett_addr=None,
+                          no_backup=False,
+                          backup_address=None,
+                          app_boot_validation_type='VALIDATE_GENERATED_CRC',
+                          sd_boot_validation_type=None,
+                          sd_file=None,
+                          signer=None)
+
+        size = settings.setts.bytes_count
+        page = settings.ihex.tobinstr(settings.bl_sett_addr, settings.bl_sett_addr + size - 1)
+        backup = settings.ihex.tobinstr(settings.backup_address, settings.backup_address + size - 1)
+        self.assertEqual(page, backup)
+        self.assertEqual(settings.crc, struct.unpack_from('<I', page)[0])
+
     def test_generate_without_application_file(self):
         settings = BLDFUSettings()
         settings.generate(arch='NRF52',
@@ -556,5 +593,37 @@ class TestBLDFUSettingsV2(unittest.TestCase):
         self.assertEqual(0x03, settings.sd_boot_validation_type)
         self.assertEqual(64, len(settings.sd_boot_validation_bytes))
 
+    def test_generate_with_softdevice_concurrently(self):
+        sd_file = os.path.abspath('firmwares/s132_nrf52_mini.hex')
+
+        def generate(_):
+            settings = BLDFUSettings()
+            settings.generate(arch='NRF52',
+                              app_file=None,
+                              app_ver=1,
+                              bl_ver=1,
+                              bl_sett_ver=2,
+                              custom_bl_sett_addr=None,
+                              no_backup=True,
+                              backup_address=None,
+                              app_boot_validation_type=None,
+                              sd_boot_validation_type='VALIDATE_GENERATED_SHA256',
+                              sd_file=sd_file,
+                              signer=None)
+            return settings.ihex.todict()
+
+        # Nothing may be written to the working directory shared by the threads
+        work_directory = tempfile.mkdtemp(prefix="nrf_dfu_bl_sett_tests_")
+        self.addCleanup(shutil.rmtree, work_directory)
+        os.chdir(work_directory)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(generate, range(8)))
+
+        self.assertEqual([], os.listdir(work_directory))
+        for result in results[1:]:
+            self.assertEqual(results[0], result)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,157 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import random
+import unittest
+
+import nordicsemi.dfu.dfu_cc as cc
+import nordicsemi.dfu.dfu_cc_pb2 as pb
+
+
+def random_init_command(rnd, module):
+    init_command = module.InitCommand()
+    if rnd.random() < 0.8:
+        init_command.fw_version = rnd.choice([0, 1, 0x7f, 0x80, 0xffffffff, rnd.getrandbits(32)])
+    if rnd.random() < 0.8:
+        init_command.hw_version = rnd.getrandbits(rnd.choice([1, 8, 16, 32]))
+    init_command.sd_req.extend(rnd.getrandbits(16) for _ in range(rnd.randint(0, 5)))
+    if rnd.random() < 0.9:
+        init_command.type = rnd.randint(module.APPLICATION, module.EXTERNAL_APPLICATION)
+    for name in ('sd_size', 'bl_size', 'app_size'):
+        if rnd.random() < 0.5:
+            setattr(init_command, name, rnd.getrandbits(rnd.choice([7, 14, 24, 32])))
+    if rnd.random() < 0.9:
+        init_command.hash.hash_type = rnd.randint(module.NO_HASH, module.SHA512)
+        init_command.hash.hash = bytes(rnd.getrandbits(8) for _ in range(rnd.choice([0, 4, 32, 200])))
+    if rnd.random() < 0.5:
+        init_command.is_debug = rnd.random() < 0.5
+    for _ in range(rnd.randint(0, 3)):
+        init_command.boot_validation.add(type=rnd.randint(module.NO_VALIDATION, module.VALIDATE_ECDSA_P256_SHA256),
+                                         bytes=bytes(rnd.getrandbits(8) for _ in range(rnd.choice([0, 4, 64]))))
+    return init_command
+
+
+def random_packet(rnd, module, seed):
+    init_command = random_init_command(random.Random(seed), module)
+    packet = module.Packet()
+    if rnd.random() < 0.5:
+        packet.command.op_code = module.INIT
+        packet.command.init.CopyFrom(init_command)
+    else:
+        packet.signed_command.command.op_code = module.INIT
+        packet.signed_command.command.init.CopyFrom(init_command)
+        packet.signed_command.signature_type = rnd.choice([module.ECDSA_P256_SHA256, module.ED25519])
+        packet.signed_command.signature = bytes(rnd.getrandbits(8) for _ in range(64))
+    return packet
+
+
+class TestDfuCc(unittest.TestCase):
+    ITERATIONS = 500
+
+    def test_serialize_matches_protobuf(self):
+        for seed in range(self.ITERATIONS):
+            expected = random_packet(random.Random(seed), pb, seed)
+            actual = random_packet(random.Random(seed), cc, seed)
+
+            self.assertEqual(expected.SerializeToString(), actual.SerializeToString(), "seed {0}".format(seed))
+            self.assertEqual(str(expected), str(actual), "seed {0}".format(seed))
+
+    def test_parse_round_trip(self):
+        for seed in range(self.ITERATIONS):
+            data = random_packet(random.Random(seed), pb, seed).SerializeToString()
+
+            packet = cc.Packet()
+            self.assertEqual(len(data), packet.ParseFromString(data))
+            self.assertEqual(data, packet.SerializeToString(), "seed {0}".format(seed))
+
+            expected = pb.Packet()
+            expected.ParseFromString(data)
+            self.assertEqual(str(expected), str(packet))
+            for name in ('command', 'signed_command'):
+                self.assertEqual(expected.HasField(name), packet.HasField(name))
+
+    def test_has_field(self):
+        packet = cc.Packet()
+        self.assertFalse(packet.HasField('command'))
+        self.assertEqual(0, packet.command.init.fw_version)
+        self.assertFalse(packet.HasField('command'))
+
+        packet.command.init.hash.hash_type = cc.SHA256
+        self.assertTrue(packet.HasField('command'))
+        self.assertTrue(packet.command.HasField('init'))
+        self.assertFalse(packet.command.HasField('op_code'))
+
+    def test_parse_unpacked_sd_req(self):
+        # sd_req as three unpacked varints
+        packet = cc.InitCommand()
+        packet.ParseFromString(bytes([0x18, 0x01, 0x18, 0xfe, 0xff, 0x03, 0x18, 0x80, 0x01]))
+        self.assertEqual([1, 0xfffe, 0x80], list(packet.sd_req))
+
+    def test_parse_skips_unknown_fields(self):
+        expected = cc.InitCommand(fw_version=5, sd_req=[1, 2])
+        data = bytes([0x58, 0x01, 0x65, 0, 0, 0, 0, 0x6a, 0x02, 0xaa, 0xbb]) + expected.SerializeToString()
+
+        init_command = cc.InitCommand()
+        init_command.ParseFromString(data)
+        self.assertEqual(expected.SerializeToString(), init_command.SerializeToString())
+
+    def test_parse_truncated(self):
+        data = random_packet(random.Random(1), pb, 1).SerializeToString()
+        for length in (1, len(data) // 2, len(data) - 1):
+            with self.assertRaises(cc.DecodeError):
+                cc.Packet().ParseFromString(data[:length])
+
+    def test_missing_required_field(self):
+        packet = cc.Packet()
+        packet.signed_command.signature = b'sig'
+        with self.assertRaises(cc.EncodeError):
+            packet.SerializeToString()
+
+    def test_invalid_values(self):
+        init_command = cc.InitCommand()
+        with self.assertRaises(ValueError):
+            init_command.fw_version = 0x100000000
+        with self.assertRaises(ValueError):
+            init_command.sd_req.append(-1)
+        with self.assertRaises(ValueError):
+            init_command.type = 42
+        with self.assertRaises(AttributeError):
+            init_command.unknown = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -35,6 +35,7 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import io
 import json
 import os
 import tempfile
@@ -118,6 +119,95 @@ class TestPackage(unittest.TestCase):
                 self.assertEqual('sd_bl.bin', _json['manifest']['softdevice_bootloader']['bin_file'])
                 self.assertEqual('sd_bl.dat', _json['manifest']['softdevice_bootloader']['dat_file'])
 
+    def test_generate_package_to_file_object(self):
+        self.p = Package(app_version=100,
+                         sd_req=[0x1000, 0xfffe],
+                         app_fw="firmwares/bar.hex")
+
+        pkg_file = io.BytesIO()
+        self.p.generate_package(pkg_file)
+
+        self.assertIsNone(self.p.work_dir)
+
+        with ZipFile(pkg_file, 'r') as pkg:
+            self.assertEqual(sorted(["manifest.json", "bar.bin", "bar.dat"]), sorted(pkg.namelist()))
+
+            with open("firmwares/bar_wanted.bin", 'rb') as f:
+                self.assertEqual(f.read(), pkg.read("bar.bin"))
+
+    def test_generate_package_jobs(self):
+        packages = []
+        for jobs in (1, 2):
+            p = Package(app_version=100,
+                        bl_version=2,
+                        sd_req=[0x1000, 0xfffe],
+                        sd_id=[0x1000],
+                        softdevice_fw="firmwares/foo.hex",
+                        bootloader_fw="firmwares/bar.hex",
+                        app_fw="firmwares/bar.hex")
+            pkg_file = io.BytesIO()
+            p.generate_package(pkg_file, jobs=jobs)
+
+            with ZipFile(pkg_file, 'r') as pkg:
+                packages.append([(name, pkg.read(name)) for name in pkg.namelist()])
+
+        self.assertEqual(["bar.bin", "bar.dat", "manifest.json", "sd_bl.bin", "sd_bl.dat"],
+                         [name for name, _ in packages[0]])
+        self.assertEqual(packages[0], packages[1])
+
+    def test_generate_package_reproducible(self):
+        signer = Signing()
+        signer.load_key('key.pem')
+
+        packages = []
+        for compression in ('stored', 'stored', 'deflated'):
+            p = Package(app_version=100,
+                        sd_req=[0x1000, 0xfffe],
+                        app_fw="firmwares/bar.hex",
+                        app_boot_validation='VALIDATE_ECDSA_P256_SHA256',
+                        signer=signer)
+            pkg_file = io.BytesIO()
+            p.generate_package(pkg_file, compression=compression, compress_level=9)
+            packages.append(pkg_file.getvalue())
+
+        self.assertEqual(packages[0], packages[1])
+        self.assertLess(len(packages[2]), len(packages[0]))
+
+        with ZipFile(io.BytesIO(packages[2]), 'r') as pkg:
+            self.assertEqual(["bar.bin", "bar.dat", "manifest.json"], pkg.namelist())
+            for info in pkg.infolist():
+                self.assertEqual(Package.ZIP_DATE_TIME, info.date_time)
+
+    def test_read_package(self):
+        signer = Signing()
+        signer.load_key('key.pem')
+
+        self.p = Package(app_version=100,
+                         sd_req=[0x1000, 0xfffe],
+                         app_fw="firmwares/bar.hex",
+                         signer=signer)
+        pkg_name = os.path.join(self.work_directory, "mypackage.zip")
+        self.p.generate_package(pkg_name)
+
+        unpacked = Package()
+        unpacked.parse_package(pkg_name, preserve_work_dir=True)
+        self.addCleanup(shutil.rmtree, os.path.dirname(unpacked.zip_dir))
+        lazy = Package()
+        lazy.read_package(pkg_name)
+
+        self.assertIsNone(lazy.work_dir)
+        self.assertEqual(["bar.dat"], list(lazy.init_packets))
+        self.assertEqual(str(unpacked), str(lazy))
+
+        info = lazy.to_dict()
+        self.assertEqual(pkg_name, info['package'])
+        self.assertEqual(1, len(info['images']))
+        self.assertEqual('application', info['images'][0]['type'])
+        self.assertEqual(100, info['images'][0]['fw_version'])
+        self.assertEqual([0xfffe], info['images'][0]['sd_req'])
+        self.assertEqual('ECDSA_P256_SHA256', info['images'][0]['signature_type'])
+        json.dumps(info)
+
     def test_unpack_package_a(self):
         signer = Signing()
         signer.load_key('key.pem')
@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2016 Nordic Semiconductor ASA
+# Copyright (c) 2026 Nordic Semiconductor ASA
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from zipfile import ZipFile
+
+from nordicsemi.dfu.package import Package
+from nordicsemi.dfu.package_batch import load_batch_spec, generate_packages, PackageSpecException
+
+
+class TestPackageBatch(unittest.TestCase):
+    def setUp(self):
+        script_abspath = os.path.abspath(__file__)
+        script_dirname = os.path.dirname(script_abspath)
+        os.chdir(script_dirname)
+
+        self.work_directory = tempfile.mkdtemp(prefix="nrf_dfu_batch_tests_")
+        self.firmwares = os.path.join(script_dirname, 'firmwares')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory, ignore_errors=True)
+
+    def _write_spec(self, specs):
+        spec_file = os.path.join(self.work_directory, 'spec.json')
+        with open(spec_file, 'w') as f:
+            json.dump({'packages': specs}, f)
+        return spec_file
+
+    def test_load_batch_spec_resolves_paths(self):
+        spec_file = self._write_spec([{'zipfile': 'a.zip', 'application': 'app.hex'}])
+
+        specs = load_batch_spec(spec_file)
+
+        self.assertEqual(os.path.join(self.work_directory, 'a.zip'), specs[0]['zipfile'])
+        self.assertEqual(os.path.join(self.work_directory, 'app.hex'), specs[0]['application'])
+
+    def test_load_batch_spec_unknown_key(self):
+        spec_file = self._write_spec([{'zipfile': 'a.zip', 'aplication': 'app.hex'}])
+
+        self.assertRaises(PackageSpecException, load_batch_spec, spec_file)
+
+    def test_generate_packages(self):
+        spec_file = self._write_spec([
+            {'zipfile': 'app.zip',
+             'application': os.path.join(self.firmwares, 'bar.hex'),
+             'application_version': 100,
+             'hw_version': 52,
+             'sd_req': '0x1000,0xfffe'},
+            {'zipfile': 'sd_bl.zip',
+             'softdevice': os.path.join(self.firmwares, 'foo.hex'),
+             'bootloader': os.path.join(self.firmwares, 'bar.hex'),
+             'bootloader_version': 1,
+             'hw_version': 52,
+             'sd_req': [0x1000, 0xfffe]},
+        ])
+        index_file = os.path.join(self.work_directory, 'index.json')
+
+        results = generate_packages(load_batch_spec(spec_file), jobs=1, index_file=index_file)
+
+        self.assertEqual(2, len(results))
+        self.assertTrue(all('error' not in result for result in results))
+
+        with open(index_file, 'r') as f:
+            self.assertEqual(results, json.load(f)['packages'])
+
+        expected = os.path.join(self.work_directory, 'expected.zip')
+        Package(app_version=100, hw_version=52, sd_req=[0x1000, 0xfffe], sd_id=[0x1000, 0xfffe],
+                app_fw=os.path.join(self.firmwares, 'bar.hex')).generate_package(expected)
+
+        with ZipFile(expected, 'r') as expected_pkg, ZipFile(results[0]['zipfile'], 'r') as pkg:
+            self.assertEqual(sorted(expected_pkg.namelist()), sorted(pkg.namelist()))
+            for name in expected_pkg.namelist():
+                self.assertEqual(expected_pkg.read(name), pkg.read(name))
+
+        with ZipFile(results[1]['zipfile'], 'r') as pkg:
+            self.assertEqual(sorted(["manifest.json", "sd_bl.bin", "sd_bl.dat"]), sorted(pkg.namelist()))
+
+    def test_generate_packages_jobs(self):
+        def specs(directory):
+            os.mkdir(directory)
+            specs = []
+            for version in range(1, 5):
+                specs.append({'zipfile': os.path.join(directory, 'app{0}.zip'.format(version)),
+                              'application': os.path.join(self.firmwares, 'bar.hex'),
+                              'application_version': version,
+                              'hw_version': 52,
+                              'sd_req': [0xfffe],
+                              'key_file': os.path.abspath('key.pem') if version % 2 else None,
+                              'app_boot_validation': 'VALIDATE_ECDSA_P256_SHA256' if version % 2 else None})
+            specs.append({'zipfile': os.path.join(directory, 'sd_bl.zip'),
+                          'softdevice': os.path.join(self.firmwares, 'foo.hex'),
+                          'bootloader': os.path.join(self.firmwares, 'bar.hex'),
+                          'bootloader_version': 1,
+                          'hw_version': 52,
+                          'sd_req': [0x1000, 0xfffe],
+                          'key_file': os.path.abspath('key.pem')})
+            return specs
+
+        # The process pool sets up the signer and the firmware cache in every worker and keeps the spec order
+        serial = generate_packages(specs(os.path.join(self.work_directory, 'serial')), jobs=1)
+        pool = generate_packages(specs(os.path.join(self.work_directory, 'pool')), jobs=2)
+
+        self.assertEqual([os.path.basename(result['zipfile']) for result in serial],
+                         [os.path.basename(result['zipfile']) for result in pool])
+        for serial_result, pool_result in zip(serial, pool):
+            self.assertNotIn('error', pool_result)
+            self.assertEqual(serial_result['sha256'], pool_result['sha256'])
+            self.assertEqual(serial_result['signed'], pool_result['signed'])
+            with open(serial_result['zipfile'], 'rb') as f, open(pool_result['zipfile'], 'rb') as g:
+                self.assertEqual(f.read(), g.read())
+
+    def test_generate_packages_missing_hw_version(self):
+        specs = [{'zipfile': os.path.join(self.work_directory, 'app.zip'),
+                  'application': os.path.join(self.firmwares, 'bar.hex'),
+                  'application_version': 1,
+                  'sd_req': [0xfffe]}]
+
+        self.assertRaises(PackageSpecException, generate_packages, specs, 1)
+
+    def test_generate_packages_ecdsa_without_signer(self):
+        specs = [{'zipfile': os.path.join(self.work_directory, 'app.zip'),
+                  'application': os.path.join(self.firmwares, 'bar.hex'),
+                  'application_version': 1,
+                  'hw_version': 52,
+                  'sd_req': [0xfffe],
+                  'app_boot_validation': 'VALIDATE_ECDSA_P256_SHA256'}]
+
+        with self.assertRaises(PackageSpecException) as cm:
+            generate_packages(specs, 1)
+        self.assertIn('key_file or signing_socket required', str(cm.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
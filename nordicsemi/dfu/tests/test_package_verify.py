@@ -0,0 +1,153 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+from zipfile import ZipFile
+
+from nordicsemi.dfu.package import Package
+from nordicsemi.dfu.package_verify import find_packages, verify_package, verify_packages
+from nordicsemi.dfu.signing import Signing
+
+
+class TestPackageVerify(unittest.TestCase):
+    def setUp(self):
+        script_abspath = os.path.abspath(__file__)
+        script_dirname = os.path.dirname(script_abspath)
+        os.chdir(script_dirname)
+
+        self.work_directory = tempfile.mkdtemp(prefix="nrf_dfu_verify_tests_")
+
+        self.signer = Signing()
+        self.signer.load_key('key.pem')
+
+        self.pkg_name = os.path.join(self.work_directory, "signed.zip")
+        Package(app_version=100,
+                bl_version=2,
+                sd_req=[0x1000, 0xfffe],
+                sd_id=[0x1000],
+                softdevice_fw="firmwares/foo.hex",
+                bootloader_fw="firmwares/bar.hex",
+                app_fw="firmwares/bar.hex",
+                sd_boot_validation='VALIDATE_ECDSA_P256_SHA256',
+                app_boot_validation='VALIDATE_ECDSA_P256_SHA256',
+                signer=self.signer).generate_package(self.pkg_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory, ignore_errors=True)
+
+    def tamper(self, name, member):
+        with ZipFile(self.pkg_name, 'r') as pkg:
+            contents = {n: pkg.read(n) for n in pkg.namelist()}
+
+        data = bytearray(contents[member])
+        data[-1] ^= 0xFF
+        contents[member] = bytes(data)
+
+        path = os.path.join(self.work_directory, name)
+        Package.write_zip_package(contents, path)
+        return path
+
+    def test_verify_signed_package(self):
+        result = verify_package(self.pkg_name, self.signer)
+
+        self.assertTrue(result['ok'])
+        self.assertEqual(['sd_bl', 'application'], [image['type'] for image in result['images']])
+        for image in result['images']:
+            self.assertEqual('ok', image['checks']['hash'])
+            self.assertEqual('ok', image['checks']['size'])
+            self.assertEqual('ok', image['checks']['signature'])
+        self.assertEqual(['ok', 'ok'], result['images'][0]['checks']['boot_validation'])
+        self.assertEqual(['ok'], result['images'][1]['checks']['boot_validation'])
+
+    def test_verify_with_public_key(self):
+        vk_file = os.path.join(self.work_directory, 'public.pem')
+        with open(vk_file, 'w') as f:
+            f.write(self.signer.get_vk_pem())
+
+        verifier = Signing()
+        verifier.load_vk(vk_file)
+
+        self.assertTrue(verify_package(self.pkg_name, verifier)['ok'])
+
+    def test_verify_without_key(self):
+        result = verify_package(self.pkg_name)
+
+        self.assertTrue(result['ok'])
+        self.assertEqual('not checked', result['images'][1]['checks']['signature'])
+        self.assertEqual(['not checked'], result['images'][1]['checks']['boot_validation'])
+
+    def test_verify_tampered_image(self):
+        result = verify_package(self.tamper("tampered_bin.zip", "bar.bin"), self.signer)
+
+        self.assertFalse(result['ok'])
+        checks = result['images'][1]['checks']
+        self.assertEqual('mismatch', checks['hash'])
+        self.assertEqual('ok', checks['signature'])
+        self.assertEqual(['invalid'], checks['boot_validation'])
+
+    def test_verify_unsigned_package(self):
+        pkg_name = os.path.join(self.work_directory, "unsigned.zip")
+        Package(app_version=100, sd_req=[0x1000], app_fw="firmwares/bar.hex").generate_package(pkg_name)
+
+        self.assertTrue(verify_package(pkg_name)['ok'])
+        result = verify_package(pkg_name, self.signer)
+        self.assertFalse(result['ok'])
+        self.assertEqual('unsigned', result['images'][0]['checks']['signature'])
+
+    def test_verify_packages(self):
+        self.tamper("tampered_dat.zip", "bar.dat")
+        with open(os.path.join(self.work_directory, "broken.zip"), 'wb') as f:
+            f.write(b'not a zip file')
+
+        packages = find_packages([self.work_directory])
+        self.assertEqual(["broken.zip", "signed.zip", "tampered_dat.zip"],
+                         [os.path.basename(p) for p in packages])
+
+        report = verify_packages(packages, key_file='key.pem', jobs=1)
+
+        self.assertEqual([False, True, False], [result['ok'] for result in report['packages']])
+        self.assertIn('error', report['packages'][0])
+        self.assertEqual(1, report['passed'])
+        self.assertEqual(2, report['failed'])
+        self.assertTrue(report['signatures_checked'])
+
+
+if __name__ == '__main__':
+    unittest.main()
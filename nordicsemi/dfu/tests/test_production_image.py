@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import io
+import os
+import unittest
+
+import intelhex
+
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
+from nordicsemi.dfu.production_image import ProductionImage, ProductionImageException
+
+
+class TestProductionImage(unittest.TestCase):
+    def setUp(self):
+        script_abspath = os.path.abspath(__file__)
+        script_dirname = os.path.dirname(script_abspath)
+        os.chdir(script_dirname)
+
+        self.resources = os.path.join(script_dirname, '..', '..', '..', 'tests', 'resources')
+        self.softdevice = 'firmwares/s132_nrf52_mini.hex'
+        self.bootloader = os.path.join(self.resources, 'dfu_test_bootloader_b.hex')
+        self.application = os.path.join(self.resources, 'dfu_test_app_hrm_s130.hex')
+
+    def _image(self):
+        image = ProductionImage('NRF52')
+        image.add_hex('softdevice', self.softdevice)
+        image.add_hex('bootloader', self.bootloader)
+        image.add_hex('application', self.application)
+        image.add_settings(app_ver=3, bl_ver=2, bl_sett_ver=2,
+                           app_boot_validation_type='VALIDATE_GENERATED_SHA256',
+                           sd_boot_validation_type='VALIDATE_GENERATED_CRC')
+        return image
+
+    def test_merged_image_matches_intelhex_merge(self):
+        image = self._image()
+
+        expected = intelhex.IntelHex()
+        for hex_file in (self.softdevice, self.bootloader, self.application):
+            expected.merge(intelhex.IntelHex(hex_file), overlap='error')
+        expected.merge(image.settings.ihex, overlap='error')
+
+        hex_out = io.StringIO()
+        image.write_hex(hex_out)
+        expected_hex = io.StringIO()
+        expected.write_hex_file(expected_hex)
+        self.assertEqual(expected_hex.getvalue(), hex_out.getvalue())
+
+        bin_out = io.BytesIO()
+        image.write_bin(bin_out)
+        expected_bin = io.BytesIO()
+        expected.tobinfile(expected_bin)
+        self.assertEqual(expected_bin.getvalue(), bin_out.getvalue())
+
+    def test_settings_match_settings_generate(self):
+        image = self._image()
+
+        settings = BLDFUSettings()
+        settings.generate(arch='NRF52',
+                          app_file=self.application,
+                          app_ver=3,
+                          bl_ver=2,
+                          bl_sett_ver=2,
+                          custom_bl_sett_addr=None,
+                          no_backup=False,
+                          backup_address=None,
+                          app_boot_validation_type='VALIDATE_GENERATED_SHA256',
+                          sd_boot_validation_type='VALIDATE_GENERATED_CRC',
+                          sd_file=self.softdevice,
+                          signer=None)
+
+        self.assertEqual(settings.ihex.todict(), image.settings.ihex.todict())
+
+    def test_layout(self):
+        layout = self._image().layout()
+
+        self.assertEqual(['softdevice', 'free', 'application', 'free', 'bootloader', 'free',
+                          'settings backup', 'free', 'settings', 'free'],
+                         [region.name for region in layout])
+        self.assertEqual(0, layout[0].start)
+        self.assertEqual(0x80000, layout[-1].end)
+        for previous, region in zip(layout, layout[1:]):
+            self.assertEqual(previous.end, region.start)
+
+    def test_overlap(self):
+        image = ProductionImage('NRF52')
+        image.add_hex('softdevice', self.softdevice)
+        image.add_hex('application', 'firmwares/foo.hex')
+
+        self.assertRaises(ProductionImageException, image.check)
+
+    def test_outside_flash(self):
+        image = ProductionImage('NRF52')
+        image.add_bytes('config', 0x80000, b'\x00' * 4)
+
+        self.assertRaises(ProductionImageException, image.check)
+
+
+if __name__ == '__main__':
+    unittest.main()
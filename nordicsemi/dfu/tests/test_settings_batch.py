@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
+from nordicsemi.dfu.package_batch import PackageSpecException
+from nordicsemi.dfu.settings_batch import load_settings_spec, generate_settings
+
+
+class TestSettingsBatch(unittest.TestCase):
+    def setUp(self):
+        script_abspath = os.path.abspath(__file__)
+        script_dirname = os.path.dirname(script_abspath)
+        os.chdir(script_dirname)
+
+        self.work_directory = tempfile.mkdtemp(prefix="nrf_dfu_settings_batch_tests_")
+        self.firmwares = os.path.join(script_dirname, 'firmwares')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory, ignore_errors=True)
+
+    def _write_spec(self, specs):
+        spec_file = os.path.join(self.work_directory, 'spec.json')
+        with open(spec_file, 'w') as f:
+            json.dump({'settings': specs}, f)
+        return spec_file
+
+    def _spec(self, hex_file, **kwargs):
+        spec = {'hex_file': hex_file,
+                'family': 'NRF52',
+                'application': os.path.join(self.firmwares, 's132_nrf52_mini.hex'),
+                'application_version': 1,
+                'bootloader_version': 1,
+                'bl_settings_version': 2}
+        spec.update(kwargs)
+        return spec
+
+    def test_load_settings_spec_unknown_key(self):
+        spec_file = self._write_spec([self._spec('a.hex', zipfile='a.zip')])
+
+        self.assertRaises(PackageSpecException, load_settings_spec, spec_file)
+
+    def test_generate_settings_invalid_spec(self):
+        specs = [self._spec(os.path.join(self.work_directory, 'a.hex'), bl_settings_version=1,
+                            app_boot_validation='VALIDATE_GENERATED_SHA256')]
+
+        self.assertRaises(PackageSpecException, generate_settings, specs, jobs=1)
+
+    def test_generate_settings_version_string(self):
+        hex_file = os.path.join(self.work_directory, 'app.hex')
+        specs = [self._spec(hex_file, application_version=None, application_version_string='1.2.3')]
+
+        results = generate_settings(specs, jobs=1)
+
+        self.assertNotIn('error', results[0])
+        sett = BLDFUSettings()
+        sett.fromhexfile(hex_file)
+        self.assertEqual(10203, sett.app_ver)
+
+        specs = [self._spec(hex_file, application_version=None, application_version_string='1.2')]
+        self.assertRaises(PackageSpecException, generate_settings, specs, jobs=1)
+
+    def test_generate_settings(self):
+        specs = [self._spec('app1.hex'),
+                 self._spec('app2_sha.hex', application_version='2', app_boot_validation='VALIDATE_GENERATED_SHA256'),
+                 self._spec('sd_crc.hex', application=None, application_version=None,
+                            softdevice=os.path.join(self.firmwares, 's132_nrf52_mini.hex'),
+                            sd_boot_validation='VALIDATE_GENERATED_CRC', no_backup=True)]
+        specs = load_settings_spec(self._write_spec(specs))
+        index_file = os.path.join(self.work_directory, 'index.json')
+
+        results = generate_settings(specs, jobs=2, index_file=index_file)
+
+        self.assertEqual([spec['hex_file'] for spec in specs], [result['hex_file'] for result in results])
+        with open(index_file, 'r') as f:
+            self.assertEqual(results, json.load(f)['settings'])
+
+        # Every file matches what a single 'settings generate' produces
+        for spec, result in zip(specs, results):
+            self.assertNotIn('error', result)
+
+            sett = BLDFUSettings()
+            sett.generate(arch='NRF52',
+                          app_file=spec.get('application'),
+                          app_ver=int(spec['application_version']) if spec.get('application_version') else None,
+                          bl_ver=1,
+                          bl_sett_ver=2,
+                          custom_bl_sett_addr=None,
+                          no_backup=spec.get('no_backup', False),
+                          backup_address=None,
+                          app_boot_validation_type=spec.get('app_boot_validation',
+                                                            'VALIDATE_GENERATED_CRC' if spec.get('application') else None),
+                          sd_boot_validation_type=spec.get('sd_boot_validation'),
+                          sd_file=spec.get('softdevice'),
+                          signer=None)
+            expected_file = os.path.join(self.work_directory, 'expected.hex')
+            sett.tohexfile(expected_file)
+
+            with open(expected_file, 'rb') as f, open(result['hex_file'], 'rb') as g:
+                self.assertEqual(f.read(), g.read())
+            self.assertEqual(sett.crc, result['crc'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import intelhex
+
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
+from nordicsemi.dfu.settings_inspect import find_dumps, inspect_dump, inspect_dumps
+
+
+class TestSettingsInspect(unittest.TestCase):
+    def setUp(self):
+        script_abspath = os.path.abspath(__file__)
+        script_dirname = os.path.dirname(script_abspath)
+        os.chdir(script_dirname)
+
+        self.work_directory = tempfile.mkdtemp(prefix="nrf_dfu_inspect_tests_")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory, ignore_errors=True)
+
+    def _bin_dump(self, hex_file, name):
+        # A flash dump from address 0, with the erased flash read as 0xFF
+        dump = os.path.join(self.work_directory, name)
+        ih = intelhex.IntelHex(hex_file)
+        ih.tobinfile(dump, start=0)
+        return dump
+
+    def _assert_matches_fromhexfile(self, hex_file, page):
+        sett = BLDFUSettings()
+        sett.fromhexfile(hex_file)
+
+        self.assertEqual('NRF52', page['family'])
+        self.assertEqual(BLDFUSettings.bl_sett_52_addr, page['address'])
+        for key in ('crc', 'bl_sett_ver', 'app_ver', 'bl_ver', 'bank_layout', 'bank_current', 'app_sz', 'app_crc',
+                    'bank0_bank_code', 'sd_sz', 'boot_validation_crc', 'sd_boot_validation_type',
+                    'app_boot_validation_type'):
+            self.assertEqual(getattr(sett, key), page[key], key)
+
+    def test_inspect_hex_dump(self):
+        for hex_file in ('firmwares/bl_settings_v1_nrf52.hex', 'firmwares/bl_settings_v2_nrf52.hex'):
+            result = inspect_dump(hex_file)
+
+            self.assertTrue(result['ok'])
+            self.assertEqual(1, len(result['pages']))
+            self._assert_matches_fromhexfile(hex_file, result['pages'][0])
+
+    def test_inspect_bin_dump(self):
+        hex_file = 'firmwares/bl_settings_v2_nrf52.hex'
+        result = inspect_dump(self._bin_dump(hex_file, 'dump.bin'))
+
+        self.assertTrue(result['ok'])
+        self.assertEqual(1, len(result['pages']))
+        self._assert_matches_fromhexfile(hex_file, result['pages'][0])
+        self.assertTrue(result['pages'][0]['boot_validation_crc_ok'])
+
+    def test_inspect_corrupted_dump(self):
+        ih = intelhex.IntelHex('firmwares/bl_settings_v2_nrf52.hex')
+        ih[BLDFUSettings.bl_sett_52_addr + 0x8] ^= 0xFF
+        hex_file = os.path.join(self.work_directory, 'corrupted.hex')
+        ih.write_hex_file(hex_file)
+
+        result = inspect_dump(hex_file)
+
+        self.assertFalse(result['ok'])
+        self.assertEqual([], result['pages'])
+
+    def test_inspect_dumps(self):
+        self._bin_dump('firmwares/bl_settings_v1_nrf52.hex', 'a.bin')
+        self._bin_dump('firmwares/bl_settings_v2_nrf52.hex', 'b.bin')
+        open(os.path.join(self.work_directory, 'empty.bin'), 'wb').close()
+        open(os.path.join(self.work_directory, 'notes.txt'), 'w').close()
+
+        dumps = find_dumps([self.work_directory])
+        report = inspect_dumps(dumps, jobs=2)
+
+        self.assertEqual(['a.bin', 'b.bin', 'empty.bin'], [os.path.basename(path) for path in dumps])
+        self.assertEqual(dumps, [result['dump'] for result in report['dumps']])
+        self.assertEqual(2, report['found'])
+        self.assertEqual(1, report['not_found'])
+        self.assertEqual([1, 2], [result['pages'][0]['bl_sett_ver'] for result in report['dumps'][:2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
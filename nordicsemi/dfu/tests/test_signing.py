@@ -41,7 +41,7 @@ import shutil
 import tempfile
 import unittest
 
-from nordicsemi.dfu.signing import Signing
+from nordicsemi.dfu.signing import Signing, available_backends, keys_default_pem
 
 
 class TestSigning(unittest.TestCase):
@@ -125,3 +125,38 @@ class TestSigning(unittest.TestCase):
         vk_pem = signing.get_vk_pem()
 
         self.assertEqual(expected_vk_pem, vk_pem)
+
+    def test_load_default_key(self):
+        self.work_directory = tempfile.mkdtemp(prefix="nrf_signing_tests_")
+        self.addCleanup(shutil.rmtree, self.work_directory, ignore_errors=True)
+
+        key_file_path = os.path.join(self.work_directory, 'default_key.pem')
+        with open(key_file_path, 'w') as f:
+            f.write(keys_default_pem)
+
+        signing = Signing()
+        self.assertTrue(signing.load_key(key_file_path))
+        self.assertFalse(signing.load_key('key.pem'))
+
+    def test_sign_backends(self):
+        data = b'init command'
+        signatures = []
+
+        for backend in available_backends():
+            signing = Signing(backend=backend)
+            signing.load_key('key.pem')
+
+            signature = signing.sign(data)
+            self.assertEqual(64, len(signature))
+
+            # sign() returns R and S little-endian, verify() takes them big-endian
+            signature_be = signature[31::-1] + signature[63:31:-1]
+            self.assertTrue(signing.verify(data, signature_be))
+            self.assertFalse(signing.verify(data + b'x', signature_be))
+            signatures.append(signature)
+
+        # All backends use RFC 6979 nonces, and must give the same signature
+        self.assertEqual(1, len(set(signatures)))
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, Signing, backend='unknown')
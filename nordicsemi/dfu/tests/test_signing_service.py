@@ -0,0 +1,207 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import io
+import os
+import pickle
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+
+from nordicsemi.dfu.package import Package
+from nordicsemi.dfu.signing import Signing
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix domain sockets not available")
+class TestSigningService(unittest.TestCase):
+    def setUp(self):
+        from nordicsemi.dfu.signing_service import SigningServer, SigningClient
+
+        script_abspath = os.path.abspath(__file__)
+        script_dirname = os.path.dirname(script_abspath)
+        os.chdir(script_dirname)
+
+        self.work_directory = tempfile.mkdtemp(prefix="nrf_signing_service_tests_")
+        self.socket_path = os.path.join(self.work_directory, 'signer.sock')
+
+        self.signer = Signing()
+        self.signer.load_key('key.pem')
+
+        self.server = SigningServer(self.socket_path, self.signer)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05})
+        self.server_thread.start()
+
+        self.client = SigningClient(self.socket_path)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        shutil.rmtree(self.work_directory, ignore_errors=True)
+
+    def test_sign(self):
+        data = [b'', b'init command', bytes(range(256)) * 100]
+
+        self.assertEqual(self.signer.sign(data[1]), self.client.sign(data[1]))
+        self.assertEqual([self.signer.sign(d) for d in data], self.client.sign_batch(data))
+
+    def test_verify(self):
+        signature = self.client.sign(b'init command')
+        signature_be = signature[31::-1] + signature[63:31:-1]
+
+        self.assertTrue(self.client.verify(b'init command', signature_be))
+        self.assertFalse(self.client.verify(b'other command', signature_be))
+
+    def test_is_default_key(self):
+        self.assertFalse(self.client.is_default_key())
+
+    def test_pickled_client(self):
+        client = pickle.loads(pickle.dumps(self.client))
+        self.addCleanup(client.close)
+
+        self.assertEqual(self.signer.sign(b'data'), client.sign(b'data'))
+
+    def test_generate_package(self):
+        packages = []
+        for signer in (self.signer, self.client):
+            p = Package(app_version=100,
+                        sd_req=[0x1000, 0xfffe],
+                        app_fw="firmwares/bar.hex",
+                        app_boot_validation='VALIDATE_ECDSA_P256_SHA256',
+                        signer=signer)
+            pkg_file = io.BytesIO()
+            p.generate_package(pkg_file)
+            packages.append(pkg_file.getvalue())
+
+        self.assertEqual(packages[0], packages[1])
+
+    def _count_sign_requests(self):
+        requests = []
+        process = self.server.process
+
+        def counting_process(request):
+            if request.get('op') == 'sign':
+                requests.append(len(request['data']))
+            return process(request)
+
+        self.server.process = counting_process
+        return requests
+
+    def test_generate_package_signs_init_packets_together(self):
+        requests = self._count_sign_requests()
+
+        p = Package(app_version=100,
+                    sd_req=[0x1000, 0xfffe],
+                    softdevice_fw="firmwares/foo.hex",
+                    bootloader_fw="firmwares/bar.hex",
+                    app_fw="firmwares/foo.hex",
+                    signer=self.client)
+        p.generate_package(io.BytesIO())
+
+        self.assertEqual([2], requests)
+
+    def test_generate_settings_signs_images_together(self):
+        from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
+
+        requests = self._count_sign_requests()
+
+        settings = []
+        for signer in (self.signer, self.client):
+            sett = BLDFUSettings()
+            sett.generate(arch='NRF52',
+                          app_file='firmwares/bar.hex',
+                          app_ver=1,
+                          bl_ver=1,
+                          bl_sett_ver=2,
+                          custom_bl_sett_addr=None,
+                          no_backup=False,
+                          backup_address=None,
+                          app_boot_validation_type='VALIDATE_ECDSA_P256_SHA256',
+                          sd_boot_validation_type='VALIDATE_ECDSA_P256_SHA256',
+                          sd_file='firmwares/s132_nrf52_mini.hex',
+                          signer=signer)
+            settings.append(sett.ihex.tobinstr())
+
+        self.assertEqual([2], requests)
+        self.assertEqual(settings[0], settings[1])
+
+    def test_key_export(self):
+        from nordicsemi.dfu.signing_service import SigningServiceException
+
+        self.assertRaises(SigningServiceException, self.client.get_vk, 'pem', False)
+        self.assertRaises(SigningServiceException, self.client.get_sk, 'hex', False)
+        self.assertRaises(SigningServiceException, self.client.get_vk_code, False)
+        self.assertRaises(SigningServiceException, self.client.load_key, 'key.pem')
+
+    def test_socket_permissions(self):
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.socket_path).st_mode))
+
+    def test_socket_in_use(self):
+        from nordicsemi.dfu.signing_service import SigningServer, SigningServiceException
+
+        self.assertRaises(SigningServiceException, SigningServer, self.socket_path, self.signer)
+        self.assertEqual(self.signer.sign(b'data'), self.client.sign(b'data'))
+
+    def test_stale_socket(self):
+        from nordicsemi.dfu.signing_service import SigningServer, SigningServiceException
+
+        stale_path = os.path.join(self.work_directory, 'stale.sock')
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(stale_path)
+        sock.close()
+
+        server = SigningServer(stale_path, self.signer)
+        server.server_close()
+
+        other_path = os.path.join(self.work_directory, 'other')
+        open(other_path, 'w').close()
+        self.assertRaises(SigningServiceException, SigningServer, other_path, self.signer)
+        self.assertTrue(os.path.exists(other_path))
+
+    def test_no_service(self):
+        from nordicsemi.dfu.signing_service import SigningClient, SigningServiceException
+
+        client = SigningClient(os.path.join(self.work_directory, 'missing.sock'))
+        self.assertRaises(SigningServiceException, client.sign, b'data')
+
+
+if __name__ == '__main__':
+    unittest.main()
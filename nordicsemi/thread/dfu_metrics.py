@@ -0,0 +1,240 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Timeline and metrics of a Thread DFU run.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def _node_name(remote):
+    return '[{}]:{}'.format(remote.addr, remote.port)
+
+
+def _ratio(part, whole):
+    return part / whole if whole else 0.0
+
+
+class DfuMetrics:
+    '''
+    Records the events of a Thread DFU run with a timestamp, and aggregates them per node and for
+    the multicast upload into summary().
+
+    An event is a dict of the time in seconds since the metrics were created, the event name and
+    its fields:
+      trigger     remote, image, mcast              a trigger sent, repetitions included
+      block       node, resource, num, size, retransmission
+                                                    a block requested by a unicast node
+      block_sent  resource, num, size, retransmission
+                                                    a block multicast
+      bitmap      node, resource, num, missing      a bitmap report of missing blocks
+      superblock  resource, superblock              the last block of a superblock multicast
+      reset       remote, delay                     a reset request sent
+      node_done   node, image                       a unicast node fetched the last image block
+      summary     the summary(), when closed
+    Events are written to a JSON Lines file, if a path is given, and passed to the listeners added
+    with add_listener(). A unicast block request is a retransmission when the node requested a
+    block of the resource at or past it before, a multicast block when it was sent before.
+    '''
+    def __init__(self, path=None, clock=time.monotonic):
+        '''
+        :param path: A path of a JSON Lines file to write the events to, None for none.
+        '''
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+        self._file = open(path, 'w') if path else None
+        self._listeners = []
+        self._nodes = OrderedDict()
+        self._multicast_sent = set()
+        self._multicast = {'blocks_sent': 0, 'retransmissions': 0, 'bytes': 0, 'first': None, 'last': None}
+        self._triggers = 0
+        self._superblocks = 0
+        self._resets = 0
+        self._closed = False
+
+    def add_listener(self, callback):
+        '''Call callback(event) for every event recorded from now on.'''
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _node(self, remote, now):
+        name = _node_name(remote)
+        node = self._nodes.get(name)
+        if node is None:
+            node = {'first': now, 'last': now, 'requests': 0, 'retransmissions': 0, 'bytes': 0,
+                    'offsets': {}, 'done': None, 'bitmaps': 0, 'missing': 0}
+            self._nodes[name] = node
+        node['last'] = now
+        return name, node
+
+    def _emit(self, now, event, fields):
+        '''Pass an event on, called with the lock held.'''
+        if self._file is None and not self._listeners:
+            return
+
+        record = OrderedDict([('time', round(now - self._start, 6)), ('event', event)])
+        record.update(fields)
+        if self._file is not None:
+            self._file.write(json.dumps(record) + '\n')
+        for listener in self._listeners:
+            listener(record)
+
+    def trigger_sent(self, remote, image, mcast):
+        with self._lock:
+            self._triggers += 1
+            self._emit(self._clock(), 'trigger', (('remote', str(remote.addr)), ('image', image), ('mcast', mcast)))
+
+    def block_requested(self, remote, resource, num, size):
+        '''Record a block of size bytes requested by a unicast node.'''
+        with self._lock:
+            now = self._clock()
+            name, node = self._node(remote, now)
+            end = num + 1
+            retransmission = node['offsets'].get(resource, 0) >= end
+            node['offsets'][resource] = max(node['offsets'].get(resource, 0), end)
+            node['requests'] += 1
+            node['retransmissions'] += retransmission
+            node['bytes'] += size
+            self._emit(now, 'block', (('node', name), ('resource', resource), ('num', num), ('size', size),
+                                      ('retransmission', retransmission)))
+
+    def node_done(self, remote, image):
+        with self._lock:
+            now = self._clock()
+            name, node = self._node(remote, now)
+            node['done'] = now
+            self._emit(now, 'node_done', (('node', name), ('image', image)))
+
+    def block_sent(self, resource, num, size):
+        '''Record a block of size bytes multicast.'''
+        with self._lock:
+            now = self._clock()
+            key = (resource, num)
+            retransmission = key in self._multicast_sent
+            self._multicast_sent.add(key)
+            multicast = self._multicast
+            multicast['blocks_sent'] += 1
+            multicast['retransmissions'] += retransmission
+            multicast['bytes'] += size
+            if multicast['first'] is None:
+                multicast['first'] = now
+            multicast['last'] = now
+            self._emit(now, 'block_sent', (('resource', resource), ('num', num), ('size', size),
+                                           ('retransmission', retransmission)))
+
+    def bitmap_received(self, remote, resource, num, missing):
+        '''Record a bitmap report of missing blocks from the superblock starting at block num.'''
+        with self._lock:
+            now = self._clock()
+            name, node = self._node(remote, now)
+            node['bitmaps'] += 1
+            node['missing'] += missing
+            self._emit(now, 'bitmap', (('node', name), ('resource', resource), ('num', num), ('missing', missing)))
+
+    def superblock_done(self, resource, superblock):
+        with self._lock:
+            self._superblocks += 1
+            self._emit(self._clock(), 'superblock', (('resource', resource), ('superblock', superblock)))
+
+    def reset_sent(self, remote, delay):
+        with self._lock:
+            self._resets += 1
+            self._emit(self._clock(), 'reset', (('remote', str(remote.addr)), ('delay', delay)))
+
+    def summary(self):
+        '''
+        Return the per node and multicast totals as a JSON serializable dict. Throughput is in
+        bytes per second, from the first to the last block, and time to completion in seconds,
+        from the first request of a unicast node to its last image block.
+        '''
+        with self._lock:
+            nodes = OrderedDict()
+            for name, node in self._nodes.items():
+                duration = node['last'] - node['first']
+                nodes[name] = OrderedDict([
+                    ('requests', node['requests']),
+                    ('retransmissions', node['retransmissions']),
+                    ('retransmission_ratio', _ratio(node['retransmissions'], node['requests'])),
+                    ('bytes', node['bytes']),
+                    ('throughput', _ratio(node['bytes'], duration)),
+                    ('time_to_completion', node['done'] - node['first'] if node['done'] is not None else None),
+                    ('bitmaps', node['bitmaps']),
+                    ('missing', node['missing']),
+                ])
+
+            multicast = self._multicast
+            duration = multicast['last'] - multicast['first'] if multicast['first'] is not None else 0.0
+            return OrderedDict([
+                ('duration', self._clock() - self._start),
+                ('triggers', self._triggers),
+                ('superblocks', self._superblocks),
+                ('resets', self._resets),
+                ('multicast', OrderedDict([
+                    ('blocks_sent', multicast['blocks_sent']),
+                    ('retransmissions', multicast['retransmissions']),
+                    ('retransmission_ratio', _ratio(multicast['retransmissions'], multicast['blocks_sent'])),
+                    ('bytes', multicast['bytes']),
+                    ('duration', duration),
+                    ('throughput', _ratio(multicast['bytes'], duration)),
+                ])),
+                ('nodes', nodes),
+            ])
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        '''Record the summary and close the file, if any.'''
+        if self._closed:
+            return
+        self._closed = True
+
+        summary = self.summary()
+        with self._lock:
+            self._emit(self._clock(), 'summary', summary.items())
+            if self._file is not None:
+                self._file.close()
+                self._file = None
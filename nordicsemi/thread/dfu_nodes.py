@@ -0,0 +1,227 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Book-keeping of the nodes fetching a firmware image by unicast from the Thread DFU server.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class DfuNode:
+    '''The state of one node: its phase, the bytes of the image it has requested and when it was last heard of.'''
+    __slots__ = ('remote', 'phase', 'offset', 'first_seen', 'last_seen')
+
+    def __init__(self, remote, phase, now):
+        self.remote = remote
+        self.phase = phase
+        self.offset = 0
+        self.first_seen = now
+        self.last_seen = now
+
+    def __repr__(self):
+        return 'DfuNode(remote={!r}, phase={!r}, offset={})'.format(self.remote, self.phase, self.offset)
+
+
+class DfuNodeTable:
+    '''
+    The nodes of a unicast DFU, kept at a bounded cost however many there are.
+
+    A node enters the table when it requests the init packet or the first image block. At most
+    max_active nodes fetch image blocks at once: admit() refuses the others until an active node
+    finishes or goes stale, and the refused nodes are told to ask again later. A node leaves the
+    table when it has requested the last image block, or when nothing was heard from it for
+    stale_timeout seconds; only the number of such nodes is kept. The table is ordered by the time
+    a node was last heard of, so that finding the stale nodes only looks at the oldest ones.
+
+    The last FINISHED_LIMIT finished nodes are remembered. Their late or repeated requests are
+    served without taking a slot or counting them again.
+
+    summary() aggregates the nodes per phase with percentiles of their completion, for a progress
+    display whose cost does not grow with the number of nodes.
+    '''
+    INIT    = 'init'        # fetched the init packet
+    WAITING = 'waiting'     # asked for image blocks, not admitted yet
+    ACTIVE  = 'active'      # fetching image blocks
+    PHASES  = (INIT, WAITING, ACTIVE)
+
+    PERCENTILES = (50, 90)
+    FINISHED_LIMIT = 1024
+
+    def __init__(self, image_size, max_active=None, stale_timeout=60, clock=time.monotonic):
+        '''
+        :param image_size: Size of the image in bytes.
+        :param max_active: Largest number of nodes fetching image blocks at once, None for no limit.
+        :param stale_timeout: Seconds after which a silent node is dropped from the table.
+        '''
+        self.image_size = image_size
+        self.max_active = max_active
+        self.stale_timeout = stale_timeout
+        self.active = 0
+        self.done = 0
+        self.stale = 0
+
+        self._clock = clock
+        self._nodes = OrderedDict()
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, remote):
+        return remote in self._nodes
+
+    def knows(self, remote):
+        '''Return True for the nodes in the table and the remembered finished ones.'''
+        return remote in self._nodes or remote in self._finished
+
+    def get(self, remote):
+        '''Return the state of a node, or None if it is not in the table.'''
+        return self._nodes.get(remote)
+
+    def _touch(self, remote, phase):
+        now = self._clock()
+        self._expire(now)
+        node = self._nodes.get(remote)
+        if node is None:
+            node = self._nodes[remote] = DfuNode(remote, phase, now)
+        else:
+            node.last_seen = now
+            self._nodes.move_to_end(remote)
+        return node
+
+    def _expire(self, now):
+        while self._nodes:
+            node = next(iter(self._nodes.values()))
+            if now - node.last_seen < self.stale_timeout:
+                break
+            self._remove(node)
+            self.stale += 1
+
+    def _remove(self, node):
+        del self._nodes[node.remote]
+        if node.phase == DfuNodeTable.ACTIVE:
+            self.active -= 1
+
+    def expire(self):
+        '''Drop the nodes not heard of for stale_timeout seconds.'''
+        with self._lock:
+            self._expire(self._clock())
+
+    def init_requested(self, remote):
+        '''Record a request for the init packet.'''
+        with self._lock:
+            if remote in self._finished:
+                return None
+            return self._touch(remote, DfuNodeTable.INIT)
+
+    def admit(self, remote):
+        '''Record a request for an image block, return True if the node may fetch it.'''
+        with self._lock:
+            if remote in self._finished:
+                return True
+
+            node = self._touch(remote, DfuNodeTable.WAITING)
+            if node.phase == DfuNodeTable.ACTIVE:
+                return True
+
+            if self.max_active is not None and self.active >= self.max_active:
+                node.phase = DfuNodeTable.WAITING
+                return False
+
+            node.phase = DfuNodeTable.ACTIVE
+            self.active += 1
+            return True
+
+    def block_requested(self, remote, offset):
+        '''
+        Record that an admitted node requested the image up to offset bytes.
+        Return True if the node has requested the whole image, it then leaves the table.
+        '''
+        with self._lock:
+            node = self._nodes.get(remote)
+            if node is None or node.phase != DfuNodeTable.ACTIVE:
+                return False
+
+            node.offset = max(node.offset, min(offset, self.image_size))
+            if node.offset < self.image_size:
+                return False
+
+            self._remove(node)
+            self.done += 1
+            self._finished[remote] = None
+            if len(self._finished) > DfuNodeTable.FINISHED_LIMIT:
+                self._finished.popitem(last=False)
+            return True
+
+    def summary(self):
+        '''
+        Return the number of nodes per phase, the finished and stale ones included, and the
+        percentiles of completion of all nodes but the stale ones, in percent.
+        '''
+        with self._lock:
+            counts = OrderedDict((phase, 0) for phase in DfuNodeTable.PHASES)
+            completion = []
+            for node in self._nodes.values():
+                counts[node.phase] += 1
+                completion.append(node.offset / self.image_size if self.image_size else 1.0)
+            done, stale = self.done, self.stale
+
+        # The finished nodes are complete and rank after the others, so they are only counted
+        completion.sort()
+        total = len(completion) + done
+        percentiles = OrderedDict()
+        for p in DfuNodeTable.PERCENTILES:
+            rank = max(1, math.ceil(p / 100 * total))
+            if not total:
+                percentiles[p] = 0.0
+            elif rank > len(completion):
+                percentiles[p] = 100.0
+            else:
+                percentiles[p] = 100 * completion[rank - 1]
+
+        counts['done'] = done
+        counts['stale'] = stale
+        return OrderedDict([
+            ('nodes', sum(counts.values())),
+            ('phases', counts),
+            ('percentiles', percentiles),
+        ])
@@ -35,21 +35,25 @@
 #
 import logging
 import binascii
+import heapq
 import struct
 import tqdm
 import threading
 
 import piccata.core
-import piccata.block_transfer
-from piccata.block_transfer import extract_block
 from piccata.message import Message
+from piccata.option import UintOption
 from piccata import constants
 from ipaddress import ip_address
-from collections import namedtuple
 import click
+import json
 import time
 import math
 
+from nordicsemi.thread.dfu_metrics import DfuMetrics
+from nordicsemi.thread.dfu_nodes import DfuNodeTable
+from nordicsemi.thread.upload_rate import UploadRateController
+
 logger = logging.getLogger(__name__)
 
 def _make_trigger(init_data, image_data, mcast_mode = False, reset_suppress = 0):
@@ -88,13 +92,31 @@ def _make_trigger(init_data, image_data, mcast_mode = False, reset_suppress = 0)
                        len(image_data),
                        crc(image_data))
 
-def _make_bitmap(resource):
-    return [(resource, i) for i in range(0, _block_count(len(resource.data), ThreadDfuServer.BLOCK_SZX))]
-
 def _block_count(length, block_size):
     '''Return number of blocks of a given size for the total length of data.'''
     return math.ceil(length / (2 ** (block_size + 4)))
 
+def _block_szx(block_size):
+    '''Return the CoAP block option SZX of a block size in bytes.'''
+    szx = block_size.bit_length() - 5
+    if block_size != 2 ** (szx + 4) or not 0 <= szx <= Resource.MAX_SZX:
+        raise ValueError("Invalid block size {}, expected a power of two from 16 to 1024".format(block_size))
+    return szx
+
+def _superblock_size(length, block_size, superblock):
+    '''Return number of blocks in a superblock of the data.'''
+    total_block_count = _block_count(length, block_size)
+    return max(0, min(ThreadDfuServer.SPBLK_SIZE, total_block_count - superblock * ThreadDfuServer.SPBLK_SIZE))
+
+def _crosses_flash_page(num, block_size):
+    '''
+    Return True if a block starts or ends a flash page. The nodes erase a page before
+    the first block written into it and write the page out after its last block.
+    '''
+    size = 2 ** (block_size + 4)
+    return ((num * size) % ThreadDfuServer.FLASH_PAGE_SIZE == 0 or
+            ((num + 1) * size) % ThreadDfuServer.FLASH_PAGE_SIZE == 0)
+
 def _bmp_to_str(bitmap):
     '''Convert binary data into a bit string'''
     s = ''
@@ -114,31 +136,184 @@ class ThreadDfuClient:
     def __init__(self):
         '''Stores a reference to a progress bar object.'''
         self.progress_bar = None
-        '''The number of a block most recently requested by a node.'''
-        self.last_block = None
+        '''The number of bytes a node has requested so far, whatever the block size.'''
+        self.last_offset = 0
+
+class Resource:
+    '''
+    A resource served in blocks. The blocks of a block size are sliced from the data once, as
+    memoryviews, and kept with their more flag. Serving a block thereby copies nothing until
+    the message carrying it is encoded. Resources of the same data may share the cache.
+    '''
+    MAX_SZX = 6     # 1024 bytes, SZX 7 is reserved
+
+    def __init__(self, path, data, cache=None):
+        self.path = path
+        self.data = data
+        self._blocks = cache if cache is not None else {}
+
+    def __repr__(self):
+        return 'Resource(path={!r}, size={})'.format(self.path, len(self.data))
+
+    @property
+    def name(self):
+        return b'/'.join(self.path).decode()
+
+    def blocks(self, szx):
+        '''Return a list of (payload, more) for all blocks of the given size exponent.'''
+        blocks = self._blocks.get(szx)
+        if blocks is None:
+            if not 0 <= szx <= Resource.MAX_SZX:
+                raise ValueError("Invalid block size exponent {}".format(szx))
+
+            size = 2 ** (szx + 4)
+            length = len(self.data)
+            view = memoryview(self.data)
+            blocks = [(view[offset:offset + size], offset + size < length) for offset in range(0, length, size)]
+            self._blocks[szx] = blocks
+        return blocks
+
+    def block(self, num, szx):
+        '''Return (payload, more) of a block, or (None, None) if num is past the end, as extract_block does.'''
+        blocks = self.blocks(szx)
+        if 0 <= num < len(blocks):
+            return blocks[num]
+        return (None, None)
+
+    def create_block_2_response(self, request):
+        '''Create a response to a block2 request from the cached blocks, see piccata.block_transfer.'''
+        num, _, szx = request.opt.block2
+        payload, more = self.block(num, szx)
+
+        if payload is None:
+            raise ValueError("Block 2 request number out of bound.")
+
+        if request.mtype == piccata.constants.CON:
+            response = Message.AckMessage(request, code=constants.CONTENT, payload=payload)
+        else:
+            response = Message(mtype=constants.NON, code=constants.CONTENT, payload=payload, token=request.token)
+
+        response.opt.block2 = (num, more, szx)
+        return response
 
-Resource = namedtuple('Resource', ['path', 'data'])
+class MissingBlocks:
+    '''
+    The blocks still to be sent in a multicast upload, in upload order: the blocks of the first
+    resource, then of the next one, each in ascending block number. A flag per block makes
+    adding a block that is already missing a no-op, and a heap returns the next block to send.
+    The bitmap handler and the upload thread use it concurrently, hence the lock.
+    '''
+    def __init__(self, resources, block_szx):
+        self._resources = list(resources)
+        self._index = {resource.path: i for i, resource in enumerate(self._resources)}
+        self._flags = [bytearray(_block_count(len(resource.data), block_szx)) for resource in self._resources]
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item):
+        resource, num = item
+        flags = self._flags[self._index[resource.path]]
+        return 0 <= num < len(flags) and flags[num] == 1
+
+    def add(self, resource, num):
+        '''Add a block, return True if it was not missing yet. Blocks past the end of the resource are ignored.'''
+        index = self._index[resource.path]
+        flags = self._flags[index]
+        if not 0 <= num < len(flags):
+            return False
+
+        with self._lock:
+            if flags[num]:
+                return False
+            flags[num] = 1
+            heapq.heappush(self._heap, (index, num))
+        return True
+
+    def add_bitmap(self, resource, num, bitmap, size):
+        '''
+        Add the blocks set in a bitmap, where the most significant of size bits stands for block num.
+        Return the number of blocks added.
+        '''
+        added = 0
+        while bitmap:
+            bit = bitmap.bit_length() - 1
+            bitmap ^= 1 << bit
+            if self.add(resource, num + size - 1 - bit):
+                added += 1
+        return added
+
+    def add_all(self, resource):
+        '''Add all blocks of a resource.'''
+        index = self._index[resource.path]
+        flags = self._flags[index]
+        with self._lock:
+            self._heap.extend((index, num) for num in range(len(flags)) if not flags[num])
+            flags[:] = b'\x01' * len(flags)
+            heapq.heapify(self._heap)
+
+    def pop(self):
+        '''Remove and return the next (resource, num) to send. Raises IndexError if no block is missing.'''
+        with self._lock:
+            index, num = heapq.heappop(self._heap)
+            self._flags[index][num] = 0
+        return self._resources[index], num
+
+class ThreadDfuImage:
+    '''
+    An init packet and firmware image pair hosted by the server, with its own trigger and
+    unicast progress. The image is identified by its key, the CRC of the init packet as in the
+    trigger, in hex, and by its name, the image type.
+    '''
+    def __init__(self, name, key, init_resource, image_resource, nodes):
+        self.name = name
+        self.key = key
+        self.init_resource = init_resource
+        self.image_resource = image_resource
+        self.nodes = nodes
+        self.node_progress = None
+        self.node_progress_time = None
+        self.trig_done_event = threading.Event()
+
+    def __repr__(self):
+        return 'ThreadDfuImage(name={!r}, key={!r})'.format(self.name, self.key)
+
+    @property
+    def label(self):
+        '''The name of the image, or its key if it has none.'''
+        return self.name or self.key.decode()
+
+    def make_trigger(self, mcast_mode = False, reset_suppress = 0):
+        return _make_trigger(self.init_resource.data, self.image_resource.data, mcast_mode, reset_suppress)
 
 class ThreadDfuServer:
+    '''
+    Serves firmware images to Thread nodes. The first image is served under the plain init and
+    image URIs, every image also under the URIs followed by its key or name, e.g. f/application.
+    Requests to plain URIs go to the image the node fetches already, if any, else to the first one.
+    '''
     REALM_LOCAL_ADDR  = ip_address('FF03::1')
 
-    SPBLK_SIZE        = 64      # number of CoAP blocks of BLOCK_SZX size each
+    SPBLK_SIZE        = 64      # number of CoAP blocks, one bit each in a bitmap report
     SPBLK_UPLOAD_RATE = 1       # in blocks / seconds
     SPBLK_BMP_TIMEOUT = 2       # in seconds
-    BLOCK_SZX         = 2       # 64 bytes
+    BLOCK_SZX         = 2       # 64 bytes, default block size of a multicast upload
+    FLASH_PAGE_SIZE   = 4096    # in bytes
     ERASE_DELAY       = 0.5     # in seconds
-    SPBLK_FLUSH_DELAY = 1.0     # delay between superblocks
-    POST_UPLOAD_DELAY = 5.0     # delay after uploading the last block, in seconds
+    POST_UPLOAD_DELAY = 5.0     # time without bitmaps after the last block that ends the upload, in seconds
+    NODE_TIMEOUT      = 60      # unicast nodes silent for this long are dropped, in seconds
+    RETRY_DELAY       = 10      # Max-Age of a refusal to a unicast node over the limit, in seconds
+    PROGRESS_INTERVAL = 0.5     # shortest interval between unicast progress updates, in seconds
 
     IMAGE_URI = b'f'
     INIT_URI = b'i'
     TRIGGER_URI = b't'
     BITMAP_URI = b'b'
 
-    def __init__(self, protocol, init_data, image_data, opts):
+    def __init__(self, protocol, init_data, image_data, opts, name = None):
         assert(protocol is not None)
-        assert(init_data is not None)
-        assert(image_data is not None)
 
         self.opts = opts
         if (not opts or not opts.rate):
@@ -147,102 +322,235 @@ class ThreadDfuServer:
             self.opts.mcast_dfu = False
         if (not opts or not opts.reset_suppress):
             self.opts.reset_suppress = 0
+        if (not getattr(opts, 'max_rate', None)):
+            self.opts.max_rate = None
+        if (not getattr(opts, 'rate_stats', None)):
+            self.opts.rate_stats = None
+        if (not getattr(opts, 'max_nodes', None)):
+            self.opts.max_nodes = None
+        if (not getattr(opts, 'block_size', None)):
+            self.opts.block_size = 2 ** (ThreadDfuServer.BLOCK_SZX + 4)
+        if (not getattr(opts, 'metrics', None)):
+            self.opts.metrics = None
+
+        self.block_szx = _block_szx(self.opts.block_size)
 
         self.protocol = protocol
         self.protocol.register_request_handler(self)
 
         self.progress_bar = None
 
-        self.missing_blocks = []
         self.bmp_received_event = threading.Event()
+        self.first_bmp_event = threading.Event()
         self.upload_done_event = threading.Event()
         self.upload_done_event.set()
-        self.trig_done_event = threading.Event()
 
-        self.init_resource = Resource((ThreadDfuServer.INIT_URI,), init_data)
-        self.image_resource = Resource((ThreadDfuServer.IMAGE_URI,), image_data)
+        self.images = []
+        self._image_keys = {}
+        self._resources = {}
+        self._block_caches = {}
+        self.missing_blocks = None
+        self.rate_controller = UploadRateController(self.opts.rate, self.opts.max_rate)
+        self.metrics = DfuMetrics(self.opts.metrics)
 
         self.clients = {}
         self.upload_thread = None
 
+        self.add_image(init_data, image_data, name)
+
+    @property
+    def init_resource(self):
+        return self.images[0].init_resource
+
+    @property
+    def image_resource(self):
+        return self.images[0].image_resource
+
+    @property
+    def nodes(self):
+        return self.images[0].nodes
+
+    def _block_cache(self, data):
+        '''Return the block cache for the data, shared by all resources of equal data.'''
+        return self._block_caches.setdefault((len(data), binascii.crc32(data)), {})
+
+    def add_image(self, init_data, image_data, name = None):
+        '''
+        Host an init packet and firmware image pair, return its ThreadDfuImage. Images are to be
+        added before a multicast upload is triggered.
+        :param name: The image type, e.g. application. Requests may select the image by it.
+        '''
+        assert(init_data is not None)
+        assert(image_data is not None)
+
+        key = '{:08x}'.format(binascii.crc32(init_data) & 0xffffffff).encode()
+        if key in self._image_keys:
+            raise ValueError("An image with init packet CRC {} is hosted already".format(key.decode()))
+
+        # The first image keeps the plain URIs
+        suffix = (key,) if self.images else ()
+        init_resource = Resource((ThreadDfuServer.INIT_URI,) + suffix, init_data, self._block_cache(init_data))
+        image_resource = Resource((ThreadDfuServer.IMAGE_URI,) + suffix, image_data, self._block_cache(image_data))
+        nodes = DfuNodeTable(len(image_data), self.opts.max_nodes, ThreadDfuServer.NODE_TIMEOUT)
+
+        image = ThreadDfuImage(name, key, init_resource, image_resource, nodes)
+        self.images.append(image)
+        self._image_keys[key] = image
+        if name is not None:
+            self._image_keys.setdefault(name.encode(), image)
+        for resource in (init_resource, image_resource):
+            self._resources[resource.path] = resource
+
+        self.missing_blocks = MissingBlocks([resource for hosted in self.images
+                                             for resource in (hosted.init_resource, hosted.image_resource)],
+                                            self.block_szx)
+        return image
+
+    def _route(self, request):
+        '''Return the image a request to an init, image or trigger URI is for, None if there is no such image.'''
+        path = request.opt.uri_path
+        if len(path) > 1:
+            return self._image_keys.get(path[1])
+
+        for image in self.images[1:]:
+            if image.nodes.knows(request.remote):
+                return image
+        return self.images[0]
+
     def _draw_token(self):
         return piccata.message.random_token(2)
 
-    def _update_progress_bar(self, address, client, block_count, total_block_count):
+    def _update_progress_bar(self, address, client, resource, num, szx):
+        '''
+        Account a block sent to a client. The progress is kept in bytes, so that blocks
+        of any size, even mixed within one transfer, add up.
+        Return True if the block completes the resource.
+        '''
+        length = len(resource.data)
+        offset = min((num + 1) * 2 ** (szx + 4), length)
+
         # If node didn't request any blocks yet then create a new progress
         # bar for it. Update otherwise.
         if (client.progress_bar is None):
-            client.progress_bar = tqdm.tqdm(desc = str(address),
+            client.progress_bar = tqdm.tqdm(desc = '{} {}'.format(address, resource.name),
                                             position = len(self.clients) - 1,
-                                            initial = block_count,
-                                            total = total_block_count)
-        elif (block_count > client.last_block):
-            client.progress_bar.update(block_count - client.last_block)
-
-        if (block_count == total_block_count - 1):
-            # One last update to fill the progress bar (block_count is indexed from 0)
-            client.progress_bar.update()
+                                            total = length,
+                                            unit = 'B',
+                                            unit_scale = True)
+            client.last_offset = 0
+
+        if (offset > client.last_offset):
+            client.progress_bar.update(offset - client.last_offset)
+            client.last_offset = offset
+
+        if (offset == length):
             client.progress_bar.close()
             client.progress_bar = None
+            client.last_offset = 0
+            return True
+
+        return False
+
+    def _update_node_progress(self, image, force = False):
+        '''
+        Show the unicast nodes of an image on a single progress bar: the finished nodes out of all
+        nodes seen, the nodes per phase and percentiles of completion. Updates are rate limited,
+        as hundreds of nodes request blocks concurrently.
+        '''
+        now = time.monotonic()
+        if (not force and image.node_progress_time is not None and
+                now - image.node_progress_time < ThreadDfuServer.PROGRESS_INTERVAL):
+            return
+        image.node_progress_time = now
+
+        summary = image.nodes.summary()
+        phases = summary['phases']
+        if (image.node_progress is None):
+            image.node_progress = tqdm.tqdm(desc = image.label,
+                                            position = self.images.index(image),
+                                            unit = 'node')
+
+        image.node_progress.total = summary['nodes']
+        image.node_progress.n = phases['done']
+        image.node_progress.set_postfix_str(', '.join(
+            ['{} {}'.format(phase, count) for phase, count in phases.items() if phase != 'done'] +
+            ['p{} {:.0f}%'.format(p, value) for p, value in summary['percentiles'].items()]))
 
     def _handle_image_request(self, request):
-        if (request.remote not in self.clients):
-            self.clients[request.remote] = ThreadDfuClient()
+        image = self._route(request)
+        if image is None:
+            return Message.AckMessage(request, constants.NOT_FOUND)
 
+        # Unicast nodes choose their block size, honor it per request
         block_num, _, block_szx = _get_block_opt(request)
+        if block_szx > Resource.MAX_SZX:
+            return Message.AckMessage(request, constants.BAD_OPTION)
 
-        total_block_count = _block_count(len(self.image_resource.data), block_szx)
-
-        self._update_progress_bar(request.remote.addr,
-                                  self.clients[request.remote],
-                                  block_num,
-                                  total_block_count)
+        if not image.nodes.admit(request.remote):
+            # Too many nodes fetch the image, tell this one to come back later
+            if request.mtype == piccata.constants.CON:
+                response = Message.AckMessage(request, constants.SERVICE_UNAVAILABLE)
+            else:
+                response = Message(mtype=constants.NON, code=constants.SERVICE_UNAVAILABLE, token=request.token)
+            response.opt.add_option(UintOption(constants.MAX_AGE, ThreadDfuServer.RETRY_DELAY))
+            self._update_node_progress(image)
+            return response
 
-        if (self.clients[request.remote].last_block is None) or (self.clients[request.remote].last_block < block_num):
-                self.clients[request.remote].last_block = block_num
+        response = image.image_resource.create_block_2_response(request)
+        self.metrics.block_requested(request.remote, image.image_resource.name, block_num, len(response.payload))
 
-        if block_num == total_block_count - 1:
-            self.clients[request.remote].last_block = None
-            click.echo() # New line after progress bar
-            click.echo("Thread DFU upload complete")
+        done = image.nodes.block_requested(request.remote, (block_num + 1) * 2 ** (block_szx + 4))
+        if done:
+            logger.info("Thread DFU upload of {} complete on {}".format(image.image_resource.name,
+                                                                         request.remote.addr))
+            self.metrics.node_done(request.remote, image.label)
+        self._update_node_progress(image, done)
 
-        return piccata.block_transfer.create_block_2_response(self.image_resource.data, request)
+        return response
 
     def _handle_init_request(self, request):
-        # Add remote to the list of prospective DFU clients
-        if (request.remote not in self.clients):
-            self.clients[request.remote] = ThreadDfuClient()
-            logger.debug("Added {} to clients".format(request.remote.addr))
-
-        return piccata.block_transfer.create_block_2_response(self.init_resource.data, request)
+        image = self._route(request)
+        if image is None:
+            return Message.AckMessage(request, constants.NOT_FOUND)
+
+        # Add remote to the prospective DFU nodes of the image
+        if (request.remote not in image.nodes):
+            logger.debug("Added {} to nodes of {}".format(request.remote.addr, image.init_resource.name))
+        image.nodes.init_requested(request.remote)
+
+        response = image.init_resource.create_block_2_response(request)
+        self.metrics.block_requested(request.remote, image.init_resource.name, _get_block_opt(request)[0],
+                                     len(response.payload))
+        return response
 
-    def _handle_trigger_response(self, result, request, response, num_of_requests):
+    def _handle_trigger_response(self, result, request, response, num_of_requests, image):
         assert (result == piccata.constants.RESULT_TIMEOUT)
 
         if (num_of_requests - 1 > 0):
+            self.metrics.trigger_sent(request.remote, image.label, self.opts.mcast_dfu)
             self.protocol.request(request,
                                   self._handle_trigger_response,
-                                  (num_of_requests - 1,))
+                                  (num_of_requests - 1, image))
             return
 
-        self.trig_done_event.set()
+        image.trig_done_event.set()
 
     def _handle_trigger_request(self, request):
+        image = self._route(request)
+        if image is None:
+            return Message.AckMessage(request, constants.NOT_FOUND)
+
         response = None
         if request.mtype == piccata.constants.CON:
             response = Message.AckMessage(request,
                                           constants.CONTENT,
-                                          _make_trigger(self.init_resource.data,
-                                                        self.image_resource.data,
-                                                        False,
-                                                        self.opts.reset_suppress))
+                                          image.make_trigger(False, self.opts.reset_suppress))
+        elif self.opts.mcast_dfu:
+            self.trigger(self.REALM_LOCAL_ADDR, 3, [image])
         else:
-            if self.opts.mcast_dfu:
-                address = self.REALM_LOCAL_ADDR
-            else:
-                address = request.remote.addr
-
-            self.trigger(address, 3)
+            # Answer on the URI the node asked on, the one it was routed by
+            remote = piccata.types.Endpoint(request.remote.addr, piccata.constants.COAP_PORT)
+            self._send_trigger(remote, 3, image, tuple(request.opt.uri_path))
 
         return response
 
@@ -268,55 +576,59 @@ class ThreadDfuServer:
 
         self.protocol.request(request)
 
-    def _upload(self, remote, bitmap):
+    def _upload(self, remote, missing_blocks):
         while True:
-            # Bitmap holds (resource, num) tuples. Sort them using path and block num.
-            bitmap.sort(key = lambda item : (item[0].path[0] == ThreadDfuServer.IMAGE_URI, item[1]))
-            resource, num = bitmap.pop(0)
+            if not len(missing_blocks):
+                # Wait for the nodes to report the blocks they missed, the upload is done when none do
+                if not self.bmp_received_event.wait(ThreadDfuServer.POST_UPLOAD_DELAY):
+                    self.upload_done_event.set()
+                    self.bmp_received_event.wait()
+                self.bmp_received_event.clear()
+                continue
 
-            payload, more = extract_block(resource.data,
-                                          num,
-                                          ThreadDfuServer.BLOCK_SZX)
+            self.rate_controller.wait()
+
+            # Init packet blocks first, then image blocks, each in ascending order
+            resource, num = missing_blocks.pop()
+
+            payload, more = resource.block(num, self.block_szx)
 
             logger.debug("Uploading resource {} block {} to {}".format(resource.path, num, remote.addr))
 
-            total_block_count = _block_count(len(resource.data), ThreadDfuServer.BLOCK_SZX)
+            total_block_count = _block_count(len(resource.data), self.block_szx)
 
             self._update_progress_bar(remote.addr,
                                       self.clients[remote],
+                                      resource,
                                       num,
-                                      total_block_count)
+                                      self.block_szx)
 
             self._send_block(remote,
                              resource.path,
                              num,
                              more,
-                             ThreadDfuServer.BLOCK_SZX,
+                             self.block_szx,
                              payload)
 
-            if (self.clients[remote].last_block is None) or (self.clients[remote].last_block < num):
-                self.clients[remote].last_block = num
-
-            if num == total_block_count - 1:
-                self.clients[remote].last_block = None
-
-            self.bmp_received_event.clear()
-            if len(bitmap):
-                if (num % ThreadDfuServer.SPBLK_SIZE == 0) or (((num + 1) % ThreadDfuServer.SPBLK_SIZE) == 0):
-                    delay = ThreadDfuServer.ERASE_DELAY
-                else:
-                    delay = 1.0/self.opts.rate
+            name = resource.name
+            superblock = num // ThreadDfuServer.SPBLK_SIZE
+            self.rate_controller.block_sent(name,
+                                            superblock,
+                                            _superblock_size(len(resource.data), self.block_szx, superblock))
+            self.metrics.block_sent(name, num, len(payload))
 
-                time.sleep(delay)
+            if _crosses_flash_page(num, self.block_szx):
+                self.rate_controller.pause(ThreadDfuServer.ERASE_DELAY)
 
-            else:
-                self.upload_done_event.set()
-                self.bmp_received_event.wait()
+            if (((num + 1) % ThreadDfuServer.SPBLK_SIZE) == 0) or (num == total_block_count - 1):
+                self.rate_controller.superblock_done(name, superblock)
+                self.metrics.superblock_done(name, superblock)
 
     def _handle_reset_response(self, result, request, response, num_of_requests, delay):
         assert (result == piccata.constants.RESULT_TIMEOUT)
 
         if (num_of_requests - 1 > 0):
+            self.metrics.reset_sent(request.remote, delay)
             self.protocol.request(request,
                                   self._handle_reset_response,
                                   (num_of_requests - 1, delay))
@@ -333,6 +645,7 @@ class ThreadDfuServer:
         request.timeout = ThreadDfuServer.SPBLK_BMP_TIMEOUT
         request.payload = struct.pack(">I", delay)
 
+        self.metrics.reset_sent(remote, delay)
         self.protocol.request(request,
                               self._handle_reset_response,
                               (num_of_requests, delay))
@@ -341,23 +654,27 @@ class ThreadDfuServer:
         payload = struct.unpack('!HQ', request.payload)
         num = payload[0]
         bmp = payload[1]
-        path = request.opt.uri_path[1]
+        path = tuple(bytes(segment) for segment in request.opt.uri_path[1:])
         logger.debug("Device {} returned path {} num {} bmp {}".format(request.remote.addr,
                                                                        path,
                                                                        num,
                                                                        _bmp_to_str(bmp)))
 
-        if (path == ThreadDfuServer.INIT_URI):
-            resource = self.init_resource
-        elif (path == ThreadDfuServer.IMAGE_URI):
-            resource = self.image_resource
+        resource = self._resources.get(path)
+        if resource is None:
+            logger.debug("Ignoring bitmap of unknown resource {}".format(path))
+            return None
+
+        added = self.missing_blocks.add_bitmap(resource, num, bmp, ThreadDfuServer.SPBLK_SIZE)
+        logger.debug("Added {} {} blocks to missing list".format(added, resource.path))
 
-        for i in range(ThreadDfuServer.SPBLK_SIZE):
-            item = (resource, num + i)
-            if (bmp & (1 << (ThreadDfuServer.SPBLK_SIZE - 1 - i)) and item not in self.missing_blocks):
-                self.missing_blocks.append(item)
-                logger.debug("Added {} block {} to missing list".format(item[0].path, item[1]))
+        superblock = num // ThreadDfuServer.SPBLK_SIZE
+        size = _superblock_size(len(resource.data), self.block_szx, superblock)
+        missing = bin(bmp >> (ThreadDfuServer.SPBLK_SIZE - size)).count('1') if size else 0
+        self.rate_controller.report(resource.name, superblock, missing, size)
+        self.metrics.bitmap_received(request.remote, resource.name, num, missing)
 
+        self.first_bmp_event.set()
         self.bmp_received_event.set()
         return None
 
@@ -381,63 +698,101 @@ class ThreadDfuServer:
 
         return piccata.message.Message.AckMessage(request, piccata.constants.NOT_FOUND)
 
-    def _multicast_upload(self, remote, num_of_requests):
+    def _multicast_upload(self, remote, num_of_requests, images):
         self.upload_done_event.clear()
+        self.first_bmp_event.clear()
 
-        click.echo("Waiting 20s before starting multicast DFU procedure")
-        time.sleep(20)
-
-        self.missing_blocks.extend(_make_bitmap(self.init_resource))
-        self.missing_blocks.extend(_make_bitmap(self.image_resource))
+        for image in images:
+            self.missing_blocks.add_all(image.init_resource)
+            self.missing_blocks.add_all(image.image_resource)
 
         self.clients[remote] = ThreadDfuClient()
 
-        self.bmp_received_event.set()
+        for image in images:
+            image.trig_done_event.clear()
+            self._send_trigger(remote, num_of_requests, image)
 
-        self._send_trigger(remote, num_of_requests)
-        self.trig_done_event.wait()
+        # Each trigger is repeated num_of_requests times, SPBLK_BMP_TIMEOUT apart
+        deadline = time.monotonic() + (num_of_requests + 1) * ThreadDfuServer.SPBLK_BMP_TIMEOUT
+        for image in images:
+            if not image.trig_done_event.wait(max(0, deadline - time.monotonic())):
+                logger.warning("Trigger of {} not completed in time".format(image.image_resource.name))
 
         if self.upload_thread is None or self.upload_thread.is_alive() is False:
             self.upload_thread = threading.Thread(target = self._upload,
                                                   name = "Upload thread",
-                                                  args = (remote, self.missing_blocks))
-            self.upload_thread.setDaemon(True)
+                                                  args = (remote, self.missing_blocks),
+                                                  daemon = True)
             self.upload_thread.start()
+        else:
+            # The upload thread of an earlier session idles until woken, wake it for the blocks queued above
+            self.bmp_received_event.set()
+
+        # The nodes report a bitmap once the first superblock is through
+        timeout = (ThreadDfuServer.SPBLK_SIZE / self.rate_controller.rate + 2 * ThreadDfuServer.ERASE_DELAY +
+                   ThreadDfuServer.SPBLK_BMP_TIMEOUT)
+        if not self.first_bmp_event.wait(timeout):
+            click.echo("No node reported a bitmap within {:.0f}s, continuing the upload".format(timeout))
 
-        time.sleep(15)
-        self.upload_done_event.wait()
+        while not self.upload_done_event.wait(ThreadDfuServer.SPBLK_BMP_TIMEOUT):
+            if not self.upload_thread.is_alive():
+                logger.error("Upload thread terminated")
+                break
 
         if (self.opts.reset_suppress > 0):
             self._send_reset_request(remote, num_of_requests, self.opts.reset_suppress)
 
         click.echo() # New line after progress bar
         click.echo("Thread DFU upload complete")
-
-    def _send_trigger(self, remote, num_of_requests):
-        logger.info('Triggering DFU on {}'.format(remote))
+        self._report_rate()
+        self.metrics.flush()
+
+    def _report_rate(self):
+        stats = self.rate_controller.stats()
+        click.echo("Effective upload rate {:.2f} blocks/s, final rate {:.2f} blocks/s".format(stats['effective_rate'],
+                                                                                              stats['rate']))
+        if self.opts.rate_stats:
+            with open(self.opts.rate_stats, 'w') as f:
+                json.dump(stats, f, indent=4)
+            click.echo("Upload rate statistics stored in {}".format(self.opts.rate_stats))
+
+    def _send_trigger(self, remote, num_of_requests, image, path = None):
+        '''
+        Trigger the DFU of an image. The trigger goes to the URI the image is served under, so
+        that nodes using the plain URIs are triggered only for the image they will be served.
+        '''
+        logger.info('Triggering DFU of {} on {}'.format(image.image_resource.name, remote))
         request = piccata.message.Message(mtype = piccata.constants.NON,
                                           code = piccata.constants.POST,
                                           token = self._draw_token())
 
-        request.opt.uri_path = (ThreadDfuServer.TRIGGER_URI,)
+        if path is None:
+            path = (ThreadDfuServer.TRIGGER_URI,) + image.image_resource.path[1:]
+        request.opt.uri_path = path
         request.remote = remote
         request.timeout = ThreadDfuServer.SPBLK_BMP_TIMEOUT
-        request.payload = _make_trigger(self.init_resource.data,
-                                        self.image_resource.data,
-                                        self.opts.mcast_dfu,
-                                        self.opts.reset_suppress)
+        request.payload = image.make_trigger(self.opts.mcast_dfu, self.opts.reset_suppress)
+        self.metrics.trigger_sent(remote, image.label, self.opts.mcast_dfu)
         self.protocol.request(request,
                               self._handle_trigger_response,
-                              (num_of_requests,))
+                              (num_of_requests, image))
 
-    def trigger(self, address, num_of_requests):
+    def trigger(self, address, num_of_requests, images = None):
+        '''
+        Trigger the DFU of the given images, all images by default, on the nodes at address. The
+        first image is triggered under the plain trigger URI, the others under the URI followed by
+        their key, which only nodes fetching images by key listen to.
+        '''
         remote = piccata.types.Endpoint(address, piccata.constants.COAP_PORT)
+        if images is None:
+            images = self.images
 
         if self.opts.mcast_dfu:
             if self.upload_done_event.is_set():
                 thread = threading.Thread(target = self._multicast_upload,
-                                          args = (remote, num_of_requests, ))
-                thread.setDaemon(True)
+                                          args = (remote, num_of_requests, images),
+                                          daemon = True)
                 thread.start()
         else:
-            self._send_trigger(remote, num_of_requests)
+            for image in images:
+                self._send_trigger(remote, num_of_requests, image)
@@ -60,37 +60,50 @@ def _get_manifest_items(manifest):
 
     return result
 
-def _get_file_names(manifest):
-    data_attrs = _get_manifest_items(manifest)
-    if (len(data_attrs) > 1):
-        raise RuntimeError("More than one image present in manifest")
-    data_attrs = data_attrs[0]
-    firmware = data_attrs[1]
-    logger.info("Image type {} found".format(data_attrs[0]))
-    return firmware.dat_file, firmware.bin_file
+def _get_images(manifest):
+    images = []
+    for image_type, firmware in _get_manifest_items(manifest):
+        logger.info("Image type {} found".format(image_type))
+        images.append((image_type, firmware.dat_file, firmware.bin_file))
+    return images
 
-def create_dfu_server(transport, zip_file_path, opts):
+def create_dfu_server(transport, zip_file_paths, opts):
     '''
-    Create a DFU server instance.
+    Create a DFU server instance hosting all images of the given packages.
     :param transpoort: A transport to be used.
-    :param zip_file_path: A path to the firmware package.
+    :param zip_file_paths: A path to the firmware package, or a list of paths.
     :param opts: Optional parameters:
         mcast_dfu: An information if multicast DFU is enabled.
         rate: Multicast block transfer rate, in blocks per second
+        max_rate: Highest multicast block transfer rate the rate may adapt to, in blocks per second
+        rate_stats: A path of a JSON file to store the upload rate and loss statistics in
+        metrics: A path of a JSON Lines file to store the upload events and per node summary in
+        block_size: Multicast block size in bytes, a power of two from 16 to 1024
+        max_nodes: Largest number of nodes fetching an image by unicast at once, None for no limit
         reset_suppress: A delay before sending multicast reset command (in milliseconds). -1 means that no reset will be sent.
     '''
+    if isinstance(zip_file_paths, str):
+        zip_file_paths = [zip_file_paths]
+
     temp_dir = tempfile.mkdtemp(prefix="nrf_dfu_")
-    unpacked_zip_path = os.path.join(temp_dir, 'unpacked_zip')
-    manifest = Package.unpack_package(zip_file_path, unpacked_zip_path)
+    images = []
+    for i, zip_file_path in enumerate(zip_file_paths):
+        unpacked_zip_path = os.path.join(temp_dir, 'unpacked_zip_{}'.format(i))
+        manifest = Package.unpack_package(zip_file_path, unpacked_zip_path)
+
+        for image_type, init_file, image_file in _get_images(manifest):
+            with open(os.path.join(unpacked_zip_path, init_file), 'rb') as f:
+                init_data = f.read()
+            with open(os.path.join(unpacked_zip_path, image_file), 'rb') as f:
+                image_data = f.read()
+            images.append((image_type, init_data, image_data))
 
     protocol = piccata.core.Coap(transport)
     transport.register_receiver(protocol)
 
-    init_file, image_file = _get_file_names(manifest)
-
-    with open(os.path.join(unpacked_zip_path, init_file), 'rb') as f:
-        init_data = f.read()
-    with open(os.path.join(unpacked_zip_path, image_file), 'rb') as f:
-        image_data = f.read()
+    image_type, init_data, image_data = images[0]
+    server = ThreadDfuServer(protocol, init_data, image_data, opts, image_type)
+    for image_type, init_data, image_data in images[1:]:
+        server.add_image(init_data, image_data, image_type)
 
-    return ThreadDfuServer(protocol, init_data, image_data, opts)
+    return server
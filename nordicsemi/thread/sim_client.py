@@ -0,0 +1,361 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+A Thread DFU node in software, to exercise the Thread DFU server without hardware.
+"""
+
+import binascii
+import logging
+import struct
+import threading
+import time
+
+import piccata
+import piccata.core
+from piccata import constants
+from piccata.message import Message
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_URI = b't'
+INIT_URI = b'i'
+IMAGE_URI = b'f'
+BITMAP_URI = b'b'
+RESET_URI = b'r'
+
+MCAST_MODE_BIT = 0x08
+
+
+def parse_trigger(payload):
+    '''Return (mcast_mode, init_size, init_crc, image_size, image_crc) of a trigger payload.'''
+    flags, init_size, init_crc, image_size, image_crc = struct.unpack('>BIIII', payload)
+    return bool(flags & MCAST_MODE_BIT), init_size, init_crc, image_size, image_crc
+
+
+class _Download:
+    '''A resource being received in blocks, with a flag per block.'''
+    def __init__(self, size, crc):
+        self.size = size
+        self.crc = crc
+        self.data = bytearray(size)
+        self.flags = None
+        self.block_size = None
+
+    def store(self, num, szx, payload):
+        '''Store a block, return False if it was received already.'''
+        if self.flags is None:
+            self.block_size = 2 ** (szx + 4)
+            self.flags = bytearray((self.size + self.block_size - 1) // self.block_size)
+        offset = num * self.block_size
+        if not 0 <= num < len(self.flags) or self.flags[num]:
+            return False
+        self.data[offset:offset + len(payload)] = payload
+        self.flags[num] = 1
+        return True
+
+    @property
+    def blocks(self):
+        return len(self.flags) if self.flags is not None else None
+
+    def complete(self):
+        return self.flags is not None and all(self.flags) or self.size == 0
+
+    def valid(self):
+        return self.complete() and binascii.crc32(self.data) & 0xffffffff == self.crc
+
+    def bitmap(self, superblock, size):
+        '''Return the bitmap of the blocks missing in a superblock, the first block at the most significant bit.'''
+        bitmap = 0
+        first = superblock * size
+        for i, received in enumerate(self.flags[first:first + size]):
+            if not received:
+                bitmap |= 1 << (size - 1 - i)
+        return bitmap
+
+
+class SimulatedDfuClient:
+    '''
+    A Thread DFU node on a CoAP Toolkit compatible transport, e.g. a lossy UDPTransport.
+
+    In unicast mode, fetch() requests the trigger from the server, then the init packet and the
+    image, block after block, retrying lost requests. A trigger posted by the server starts the
+    same in the background.
+
+    In multicast mode, the node takes the blocks multicast after a trigger with the multicast bit,
+    and reports the blocks it missed of a superblock in a bitmap when a block of a later superblock
+    or the last block of the superblock arrives, and of all superblocks when no block arrived for
+    bmp_timeout seconds.
+
+    done_event is set when the init packet and the image have been received and match the CRCs of
+    the trigger.
+    '''
+    SPBLK_SIZE = 64
+
+    def __init__(self, transport, block_szx = 2, image = None, request_timeout = 1.0, bmp_timeout = 2.0,
+                 clock = time.monotonic):
+        '''
+        :param transport: The transport to use, opened by the caller.
+        :param block_szx: The block size exponent to request in unicast mode.
+        :param image: The key or name of the image to fetch, None for the server's first image.
+        :param request_timeout: Time after which a unicast request is sent again, in seconds.
+        :param bmp_timeout: Time without blocks after which missing blocks are reported, in seconds.
+        '''
+        self.block_szx = block_szx
+        self.image = image
+        self.request_timeout = request_timeout
+        self.bmp_timeout = bmp_timeout
+        self._clock = clock
+
+        self.protocol = piccata.core.Coap(transport)
+        transport.register_receiver(self.protocol)
+        self.protocol.register_request_handler(self)
+
+        self.server = None
+        self.trigger = None
+        self.downloads = None
+        self.done_event = threading.Event()
+        self.reset_event = threading.Event()
+        self.started = None
+        self.finished = None
+
+        self.requests = 0
+        self.blocks_received = 0
+        self.duplicates = 0
+        self.bitmaps_sent = 0
+
+        self._lock = threading.Lock()
+        self._last = None
+        self._last_block_time = None
+        self._watchdog = None
+
+    def _path(self, uri):
+        return (uri,) if self.image is None else (uri, self.image)
+
+    # Unicast
+
+    def _request(self, remote, path, mtype, block2 = None):
+        '''Send a GET request until a response arrives, return the response.'''
+        while not self.done_event.is_set():
+            request = Message(mtype = mtype, code = constants.GET, token = piccata.message.random_token(2))
+            request.opt.uri_path = path
+            if block2 is not None:
+                request.opt.block2 = block2
+            request.remote = remote
+            request.timeout = self.request_timeout
+
+            result = {}
+            received = threading.Event()
+
+            def callback(code, request, response):
+                result['response'] = response
+                received.set()
+
+            self.requests += 1
+            self.protocol.request(request, callback)
+            received.wait()
+
+            response = result['response']
+            if response is None:
+                continue
+
+            if response.code == constants.SERVICE_UNAVAILABLE:
+                # Not admitted yet, ask again after Max-Age
+                max_age = response.opt.get_option(constants.MAX_AGE)
+                time.sleep(max_age[0].value if max_age else self.request_timeout)
+                continue
+
+            return response
+
+    def fetch(self, server):
+        '''Fetch the trigger, the init packet and the image from the server endpoint in unicast mode.'''
+        self.server = server
+        self.started = self._clock()
+
+        response = self._request(server, self._path(TRIGGER_URI), constants.CON)
+        if response is None or response.code != constants.CONTENT:
+            return False
+        self._set_trigger(parse_trigger(response.payload))
+
+        for uri, download in zip((INIT_URI, IMAGE_URI), self.downloads):
+            num = 0
+            more = download.size > 0
+            while more:
+                response = self._request(server, self._path(uri), constants.NON, (num, False, self.block_szx))
+                if response is None:
+                    return False
+                if response.code != constants.CONTENT:
+                    logger.warning("Block {} of {} refused with code {}".format(num, uri, response.code))
+                    return False
+
+                num, more, szx = response.opt.block2
+                if download.store(num, szx, response.payload):
+                    self.blocks_received += 1
+                else:
+                    self.duplicates += 1
+                num += 1
+
+        self._check_done()
+        return self.done_event.is_set()
+
+    # Multicast
+
+    def _set_trigger(self, trigger):
+        with self._lock:
+            self.trigger = trigger
+            _, init_size, init_crc, image_size, image_crc = trigger
+            self.downloads = (_Download(init_size, init_crc), _Download(image_size, image_crc))
+            self._last = None
+
+    def _handle_trigger(self, request):
+        if self.image is None and tuple(request.opt.uri_path) != (TRIGGER_URI,):
+            # The trigger of an image that is not served under the plain URIs
+            return None
+
+        trigger = parse_trigger(request.payload)
+        if self.trigger == trigger:
+            # A repeated trigger
+            return None
+
+        if self.image is not None and '{:08x}'.format(trigger[2]).encode() != self.image:
+            return None
+
+        self.server = request.remote
+        self.started = self._clock()
+        self._set_trigger(trigger)
+
+        if trigger[0]:
+            self._last_block_time = self._clock()
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target = self._watch, name = 'Simulated DFU client')
+                self._watchdog.daemon = True
+                self._watchdog.start()
+        else:
+            thread = threading.Thread(target = self.fetch, args = (request.remote,))
+            thread.daemon = True
+            thread.start()
+        return None
+
+    def _handle_block(self, request, index):
+        if self.downloads is None or not request.opt.block1:
+            return None
+
+        num, _, szx = request.opt.block1
+        download = self.downloads[index]
+        reports = []
+        with self._lock:
+            self._last_block_time = self._clock()
+            if download.store(num, szx, request.payload):
+                self.blocks_received += 1
+            else:
+                self.duplicates += 1
+
+            key = (index, num // self.SPBLK_SIZE)
+            if self._last is None or key > self._last:
+                if self._last is not None:
+                    reports.append(self._last)
+                self._last = key
+                if (num + 1) % self.SPBLK_SIZE == 0 or num == download.blocks - 1:
+                    reports.append(key)
+                    self._last = None
+
+        for index, superblock in reports:
+            self._report(index, superblock)
+        self._check_done()
+        return None
+
+    def _report(self, index, superblock):
+        '''Send a bitmap of the blocks missing in a superblock, if any.'''
+        download = self.downloads[index]
+        bitmap = download.bitmap(superblock, self.SPBLK_SIZE)
+        if not bitmap:
+            return
+
+        request = Message(mtype = constants.NON, code = constants.PUT)
+        request.opt.uri_path = (BITMAP_URI,) + self._path((INIT_URI, IMAGE_URI)[index])
+        request.payload = struct.pack('!HQ', superblock * self.SPBLK_SIZE, bitmap)
+        request.remote = self.server
+        request.token = piccata.message.random_token(2)
+        self.bitmaps_sent += 1
+        self.protocol.request(request)
+
+    def _watch(self):
+        '''Report all missing blocks when no block arrived for bmp_timeout seconds.'''
+        while not self.done_event.wait(self.bmp_timeout / 4):
+            with self._lock:
+                idle = self._clock() - self._last_block_time >= self.bmp_timeout
+                if idle:
+                    self._last_block_time = self._clock()
+                    self._last = None
+                    missing = [(index, superblock) for index, download in enumerate(self.downloads)
+                               if download.flags is not None
+                               for superblock in range((download.blocks + self.SPBLK_SIZE - 1) // self.SPBLK_SIZE)]
+            if idle:
+                for index, superblock in missing:
+                    self._report(index, superblock)
+
+    def _check_done(self):
+        if self.downloads and all(download.complete() for download in self.downloads) and not self.done_event.is_set():
+            self.finished = self._clock()
+            if all(download.valid() for download in self.downloads):
+                self.done_event.set()
+            else:
+                logger.error("Received data does not match the trigger CRCs")
+
+    def receive_request(self, request):
+        '''Request callback called by the CoAP toolkit.'''
+        path = tuple(request.opt.uri_path)
+        if path[:1] == (TRIGGER_URI,):
+            return self._handle_trigger(request)
+        if path == self._path(INIT_URI) or (self.image is None and path == (INIT_URI,)):
+            return self._handle_block(request, 0)
+        if path == self._path(IMAGE_URI):
+            return self._handle_block(request, 1)
+        if path == (RESET_URI,):
+            self.reset_event.set()
+        return None
+
+    def stats(self):
+        '''Return the counters of the node and the time it took, as a JSON serializable dict.'''
+        return {
+            'requests': self.requests,
+            'blocks_received': self.blocks_received,
+            'duplicates': self.duplicates,
+            'bitmaps_sent': self.bitmaps_sent,
+            'done': self.done_event.is_set(),
+            'duration': (self.finished - self.started) if self.finished is not None else None,
+        }
@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ipaddress import ip_address
+
+from piccata import constants
+from piccata.types import Endpoint
+
+from nordicsemi.thread.dfu_metrics import DfuMetrics
+from nordicsemi.thread.tests.test_upload_rate import FakeClock
+
+NODE = Endpoint(ip_address('fd00::1'), constants.COAP_PORT)
+GROUP = Endpoint(ip_address('ff03::1'), constants.COAP_PORT)
+
+
+class TestDfuMetrics(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.events = []
+        self.metrics = DfuMetrics(clock=self.clock)
+        self.metrics.add_listener(self.events.append)
+
+    def test_unicast(self):
+        self.metrics.trigger_sent(NODE, 'application', False)
+        for num in (0, 1, 1, 2, 0, 3):
+            self.clock.sleep(1)
+            self.metrics.block_requested(NODE, 'f', num, 64)
+        self.metrics.block_requested(NODE, 'i', 0, 64)
+        self.metrics.node_done(NODE, 'application')
+
+        self.assertEqual(['trigger'] + ['block'] * 7 + ['node_done'], [event['event'] for event in self.events])
+        self.assertEqual({'time': 1.0, 'event': 'block', 'node': '[fd00::1]:5683', 'resource': 'f',
+                          'num': 0, 'size': 64, 'retransmission': False}, self.events[1])
+        self.assertEqual([False, False, True, False, True, False, False],
+                         [event['retransmission'] for event in self.events[1:8]])
+
+        summary = self.metrics.summary()
+        self.assertEqual(1, summary['triggers'])
+        node = summary['nodes']['[fd00::1]:5683']
+        self.assertEqual(7, node['requests'])
+        self.assertEqual(2, node['retransmissions'])
+        self.assertAlmostEqual(2 / 7, node['retransmission_ratio'])
+        self.assertEqual(7 * 64, node['bytes'])
+        self.assertEqual(7 * 64 / 5, node['throughput'])
+        self.assertEqual(5, node['time_to_completion'])
+
+    def test_multicast(self):
+        self.metrics.trigger_sent(GROUP, 'application', True)
+        for num in range(4):
+            self.clock.sleep(0.5)
+            self.metrics.block_sent('f', num, 64)
+        self.metrics.superblock_done('f', 0)
+        self.metrics.bitmap_received(NODE, 'f', 0, 2)
+        self.metrics.block_sent('f', 1, 64)
+        self.metrics.block_sent('f', 3, 64)
+        self.metrics.reset_sent(GROUP, 100)
+
+        self.assertEqual([False] * 4 + [True] * 2,
+                         [event['retransmission'] for event in self.events if event['event'] == 'block_sent'])
+        self.assertEqual({'time': 2.0, 'event': 'bitmap', 'node': '[fd00::1]:5683', 'resource': 'f',
+                          'num': 0, 'missing': 2}, self.events[6])
+        self.assertEqual({'time': 2.0, 'event': 'reset', 'remote': 'ff03::1', 'delay': 100}, self.events[-1])
+
+        summary = self.metrics.summary()
+        self.assertEqual((1, 1, 1), (summary['triggers'], summary['superblocks'], summary['resets']))
+        multicast = summary['multicast']
+        self.assertEqual(6, multicast['blocks_sent'])
+        self.assertEqual(2, multicast['retransmissions'])
+        self.assertEqual(6 * 64 / 1.5, multicast['throughput'])
+
+        node = summary['nodes']['[fd00::1]:5683']
+        self.assertEqual((1, 2, 0, None), (node['bitmaps'], node['missing'], node['requests'],
+                                           node['time_to_completion']))
+
+    def test_jsonl(self):
+        work_directory = tempfile.mkdtemp(prefix="nrf_thread_tests_")
+        self.addCleanup(shutil.rmtree, work_directory, ignore_errors=True)
+        path = os.path.join(work_directory, 'metrics.jsonl')
+
+        metrics = DfuMetrics(path, clock=self.clock)
+        metrics.block_requested(NODE, 'f', 0, 64)
+        self.clock.sleep(2)
+        metrics.node_done(NODE, 'application')
+        metrics.close()
+        metrics.close()
+
+        with open(path) as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual(['block', 'node_done', 'summary'], [event['event'] for event in events])
+        self.assertEqual(2.0, events[-1]['duration'])
+        self.assertEqual(2, events[-1]['nodes']['[fd00::1]:5683']['time_to_completion'])
+
+
+if __name__ == '__main__':
+    unittest.main()
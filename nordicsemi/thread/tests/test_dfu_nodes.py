@@ -0,0 +1,147 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import unittest
+from unittest import mock
+
+from nordicsemi.thread.dfu_nodes import DfuNodeTable
+from nordicsemi.thread.tests.test_upload_rate import FakeClock
+
+
+class TestDfuNodeTable(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.table = DfuNodeTable(1000, max_active=2, stale_timeout=60, clock=self.clock)
+
+    def test_admission(self):
+        self.table.init_requested('a')
+        self.assertEqual(DfuNodeTable.INIT, self.table.get('a').phase)
+
+        self.assertTrue(self.table.admit('a'))
+        self.assertTrue(self.table.admit('b'))
+        self.assertFalse(self.table.admit('c'))
+        self.assertEqual(DfuNodeTable.WAITING, self.table.get('c').phase)
+        self.assertTrue(self.table.admit('a'))
+
+        # A finished node leaves the table and frees its slot
+        self.assertFalse(self.table.block_requested('a', 512))
+        self.assertTrue(self.table.block_requested('a', 1024))
+        self.assertNotIn('a', self.table)
+        self.assertTrue(self.table.admit('c'))
+        self.assertEqual((2, 1), (self.table.active, self.table.done))
+
+    def test_finished_node_repeats(self):
+        self.assertTrue(self.table.admit('a'))
+        self.assertTrue(self.table.block_requested('a', 1024))
+
+        # A repeated request for the last block is served, without a slot or counting the node again
+        self.assertTrue(self.table.admit('a'))
+        self.assertFalse(self.table.block_requested('a', 1024))
+        self.table.init_requested('a')
+        self.assertNotIn('a', self.table)
+        self.assertTrue(self.table.knows('a'))
+        self.assertEqual((0, 1, 0), (self.table.active, self.table.done, len(self.table)))
+
+        self.assertTrue(self.table.admit('b'))
+        self.assertTrue(self.table.admit('c'))
+
+    @mock.patch.object(DfuNodeTable, 'FINISHED_LIMIT', 2)
+    def test_finished_nodes_bounded(self):
+        for remote in ('a', 'b', 'c'):
+            self.table.admit(remote)
+            self.table.block_requested(remote, 1024)
+        self.assertEqual([False, True, True], [self.table.knows(remote) for remote in ('a', 'b', 'c')])
+
+    def test_block_requested_needs_admission(self):
+        self.table.init_requested('a')
+        self.assertFalse(self.table.block_requested('a', 1000))
+        self.assertFalse(self.table.block_requested('b', 1000))
+        self.assertEqual(0, self.table.get('a').offset)
+
+    def test_stale_nodes(self):
+        self.table.admit('a')
+        self.table.admit('b')
+        self.clock.now += 30
+        self.table.admit('b')
+        self.assertFalse(self.table.admit('c'))
+
+        # Only 'a' has been silent for a whole timeout, its slot goes to 'c'
+        self.clock.now += 30
+        self.assertTrue(self.table.admit('c'))
+        self.assertNotIn('a', self.table)
+        self.assertEqual((2, 1), (self.table.active, self.table.stale))
+
+        self.clock.now += 60
+        self.table.expire()
+        self.assertEqual(0, len(self.table))
+        self.assertEqual((0, 3), (self.table.active, self.table.stale))
+
+    def test_summary(self):
+        table = DfuNodeTable(1000, clock=self.clock)
+        for i in range(8):
+            table.admit(i)
+            table.block_requested(i, 100 * i)
+        table.init_requested(8)
+        table.admit(9)
+        table.block_requested(9, 1000)
+
+        summary = table.summary()
+        self.assertEqual(10, summary['nodes'])
+        self.assertEqual([('init', 1), ('waiting', 0), ('active', 8), ('done', 1), ('stale', 0)],
+                         list(summary['phases'].items()))
+        self.assertEqual([(50, 30.0), (90, 70.0)], list(summary['percentiles'].items()))
+        json.dumps(summary)
+
+    def test_summary_finished_nodes(self):
+        table = DfuNodeTable(1000, clock=self.clock)
+        self.assertEqual([(50, 0.0), (90, 0.0)], list(table.summary()['percentiles'].items()))
+
+        for i in range(10):
+            table.admit(i)
+            table.block_requested(i, 1000 if i < 3 else 100 * i)
+
+        # 3 finished nodes and 7 active ones at 30 to 90%
+        self.assertEqual([(50, 70.0), (90, 100.0)], list(table.summary()['percentiles'].items()))
+
+        for i in range(3, 10):
+            table.block_requested(i, 1000)
+        self.assertEqual([(50, 100.0), (90, 100.0)], list(table.summary()['percentiles'].items()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,484 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import binascii
+import random
+import struct
+import threading
+import time
+import unittest
+from argparse import Namespace
+from ipaddress import ip_address
+from unittest import mock
+
+import piccata
+from piccata.block_transfer import extract_block, create_block_2_response
+from piccata.message import Message
+
+from nordicsemi.thread.dfu_server import ThreadDfuServer, ThreadDfuClient, MissingBlocks, Resource, _block_szx
+
+
+class FakeProtocol:
+    '''
+    Stands in for piccata.core.Coap and records the requests sent by the server. With timeouts set,
+    the callbacks are called as when the requests time out.
+    '''
+    def __init__(self, timeouts=False):
+        self.handler = None
+        self.requests = []
+        self.timeouts = timeouts
+
+    def register_request_handler(self, handler):
+        self.handler = handler
+
+    def request(self, request, callback=None, callback_args=None):
+        self.requests.append(request)
+        if self.timeouts and callback is not None:
+            callback(piccata.constants.RESULT_TIMEOUT, request, None, *callback_args)
+
+
+def make_bitmap_request(path, num, bitmap):
+    request = Message(mtype=piccata.constants.NON, code=piccata.constants.PUT)
+    request.opt.uri_path = (ThreadDfuServer.BITMAP_URI, path)
+    request.payload = struct.pack('!HQ', num, bitmap)
+    request.remote = piccata.types.Endpoint(ip_address('fd00::1'), piccata.constants.COAP_PORT)
+    return request
+
+
+def make_block_2_request(path, num, szx, mtype=piccata.constants.CON):
+    request = Message(mtype=mtype, code=piccata.constants.GET, mid=1234, token=b'\x12\x34')
+    request.opt.uri_path = (path,)
+    request.opt.block2 = (num, False, szx)
+    request.remote = piccata.types.Endpoint(ip_address('fd00::1'), piccata.constants.COAP_PORT)
+    return request
+
+
+class TestResource(unittest.TestCase):
+    def test_blocks_match_extract_block(self):
+        for length in (0, 1, 15, 16, 17, 64, 1000, 1024):
+            data = bytes(random.Random(length).getrandbits(8) for _ in range(length))
+            resource = Resource((b'f',), data)
+            for szx in range(Resource.MAX_SZX + 1):
+                for num in range(length // 16 + 2):
+                    payload, more = resource.block(num, szx)
+                    expected = extract_block(data, num, szx)
+                    self.assertEqual(expected, (None if payload is None else bytes(payload), more))
+
+    def test_blocks_are_views(self):
+        data = bytes(range(200))
+        resource = Resource((b'f',), data)
+        payload, more = resource.block(1, 2)
+        self.assertIsInstance(payload, memoryview)
+        self.assertIs(data, payload.obj)
+        self.assertIs(resource.blocks(2), resource.blocks(2))
+
+        with self.assertRaises(ValueError):
+            resource.blocks(7)
+
+    def test_create_block_2_response(self):
+        data = bytes(range(256)) * 3
+        resource = Resource((b'f',), data)
+        for mtype in (piccata.constants.CON, piccata.constants.NON):
+            for num, szx in ((0, 2), (11, 2), (0, 6), (1, 5), (2, 4)):
+                expected = create_block_2_response(data, make_block_2_request(b'f', num, szx, mtype))
+                response = resource.create_block_2_response(make_block_2_request(b'f', num, szx, mtype))
+                expected.mid = response.mid = 1
+                self.assertEqual(expected.encode(), response.encode())
+
+        with self.assertRaises(ValueError):
+            resource.create_block_2_response(make_block_2_request(b'f', 12, 2))
+
+
+class TestMissingBlocks(unittest.TestCase):
+    def setUp(self):
+        self.init = Resource((b'i',), bytes(100))         # 2 blocks of 64 bytes
+        self.image = Resource((b'f',), bytes(64 * 200))   # 200 blocks
+        self.blocks = MissingBlocks((self.init, self.image), ThreadDfuServer.BLOCK_SZX)
+
+    def drain(self):
+        result = []
+        while len(self.blocks):
+            resource, num = self.blocks.pop()
+            result.append((resource.path[0], num))
+        return result
+
+    def test_upload_order(self):
+        rnd = random.Random(1)
+        items = [(self.image, rnd.randrange(200)) for _ in range(300)] + [(self.init, 1), (self.init, 0)]
+        rnd.shuffle(items)
+        for resource, num in items:
+            self.blocks.add(resource, num)
+
+        expected = sorted(set((resource is not self.init, resource.path[0], num) for resource, num in items))
+        self.assertEqual([(path, num) for _, path, num in expected], self.drain())
+
+    def test_deduplicate(self):
+        self.assertTrue(self.blocks.add(self.image, 5))
+        self.assertFalse(self.blocks.add(self.image, 5))
+        self.assertIn((self.image, 5), self.blocks)
+        self.assertNotIn((self.init, 5), self.blocks)
+        self.assertEqual(1, len(self.blocks))
+
+        # A block can be added again once it has been sent
+        self.blocks.pop()
+        self.assertTrue(self.blocks.add(self.image, 5))
+
+    def test_out_of_range(self):
+        self.assertFalse(self.blocks.add(self.init, 2))
+        self.assertFalse(self.blocks.add(self.image, -1))
+        self.assertEqual(0, len(self.blocks))
+        with self.assertRaises(IndexError):
+            self.blocks.pop()
+
+    def test_add_bitmap(self):
+        # Most significant bit is the first block of the superblock
+        bitmap = (1 << 63) | (1 << 60) | 1
+        self.assertEqual(3, self.blocks.add_bitmap(self.image, 64, bitmap, 64))
+        self.assertEqual(0, self.blocks.add_bitmap(self.image, 64, bitmap, 64))
+        self.assertEqual([(b'f', 64), (b'f', 67), (b'f', 127)], self.drain())
+
+        # Bits past the end of the resource are ignored
+        self.assertEqual(8, self.blocks.add_bitmap(self.image, 192, (1 << 64) - 1, 64))
+
+    def test_add_all(self):
+        self.blocks.add(self.image, 7)
+        self.blocks.add_all(self.image)
+        self.blocks.add_all(self.init)
+        self.assertEqual([(b'i', 0), (b'i', 1)] + [(b'f', i) for i in range(200)], self.drain())
+
+
+class TestThreadDfuServer(unittest.TestCase):
+    def setUp(self):
+        self.protocol = FakeProtocol()
+        opts = Namespace(rate=None, mcast_dfu=True, reset_suppress=None)
+        self.server = ThreadDfuServer(self.protocol, bytes(100), bytes(64 * 200), opts)
+
+    def test_bitmap_request(self):
+        self.assertIs(self.server, self.protocol.handler)
+
+        response = self.server.receive_request(make_bitmap_request(ThreadDfuServer.IMAGE_URI, 128, 0xff << 56))
+        self.assertIsNone(response)
+        self.server.receive_request(make_bitmap_request(ThreadDfuServer.INIT_URI, 0, 1 << 62))
+        self.server.receive_request(make_bitmap_request(ThreadDfuServer.IMAGE_URI, 128, 0x1ff << 55))
+
+        self.assertTrue(self.server.bmp_received_event.is_set())
+        blocks = []
+        while len(self.server.missing_blocks):
+            resource, num = self.server.missing_blocks.pop()
+            blocks.append((resource.path[0], num))
+        self.assertEqual([(b'i', 1)] + [(b'f', num) for num in range(128, 137)], blocks)
+
+        # The loss of the superblock is the worst reported
+        superblocks = self.server.rate_controller.stats()['superblocks']
+        self.assertEqual([('f', 2, 9), ('i', 0, 1)], [(x['resource'], x['superblock'], x['missing']) for x in superblocks])
+
+    @mock.patch.object(ThreadDfuServer, 'ERASE_DELAY', 0.001)
+    @mock.patch.object(ThreadDfuServer, 'POST_UPLOAD_DELAY', 0.01)
+    def test_upload(self):
+        server = ThreadDfuServer(self.protocol, bytes(100), bytes(64 * 130),
+                                 Namespace(rate=2000, max_rate=8000, mcast_dfu=True, reset_suppress=None))
+        remote = piccata.types.Endpoint(ThreadDfuServer.REALM_LOCAL_ADDR, piccata.constants.COAP_PORT)
+        server.clients[remote] = ThreadDfuClient()
+        server.missing_blocks.add_all(server.init_resource)
+        server.missing_blocks.add_all(server.image_resource)
+        server.upload_done_event.clear()
+
+        thread = threading.Thread(target=server._upload, args=(remote, server.missing_blocks), daemon=True)
+        thread.start()
+        self.assertTrue(server.upload_done_event.wait(10))
+
+        sent = [(tuple(request.opt.uri_path), tuple(request.opt.block1)) for request in self.protocol.requests]
+        expected = [((b'i',), (0, True, 2)), ((b'i',), (1, False, 2))] + \
+                   [((b'f',), (num, num < 129, 2)) for num in range(130)]
+        self.assertEqual(expected, sent)
+
+        stats = server.rate_controller.stats()
+        self.assertEqual(132, stats['blocks_sent'])
+        self.assertGreater(stats['rate'], 2000)
+        self.assertEqual([('i', 0, 2), ('f', 0, 64), ('f', 1, 64), ('f', 2, 2)],
+                         [(x['resource'], x['superblock'], x['size']) for x in stats['superblocks']])
+
+    @mock.patch.object(ThreadDfuServer, 'ERASE_DELAY', 0.001)
+    @mock.patch.object(ThreadDfuServer, 'POST_UPLOAD_DELAY', 0.01)
+    def test_upload_block_size(self):
+        server = ThreadDfuServer(self.protocol, bytes(100), bytes(256 * 130 + 10),
+                                 Namespace(rate=8000, mcast_dfu=True, reset_suppress=None, block_size=256))
+        remote = piccata.types.Endpoint(ThreadDfuServer.REALM_LOCAL_ADDR, piccata.constants.COAP_PORT)
+        server.clients[remote] = ThreadDfuClient()
+        server.missing_blocks.add_all(server.init_resource)
+        server.missing_blocks.add_all(server.image_resource)
+        server.upload_done_event.clear()
+
+        with mock.patch.object(server.rate_controller, 'pause', wraps=server.rate_controller.pause) as pause:
+            thread = threading.Thread(target=server._upload, args=(remote, server.missing_blocks), daemon=True)
+            thread.start()
+            self.assertTrue(server.upload_done_event.wait(10))
+
+        sent = [(tuple(request.opt.uri_path), tuple(request.opt.block1)) for request in self.protocol.requests]
+        expected = [((b'i',), (0, False, 4))] + [((b'f',), (num, num < 130, 4)) for num in range(131)]
+        self.assertEqual(expected, sent)
+        self.assertEqual(bytes(10), self.protocol.requests[-1].payload)
+
+        # A flash page holds 16 blocks: the init block and 9 image pages start, 8 image pages end
+        self.assertEqual(18, pause.call_count)
+        self.assertEqual([('i', 0, 1), ('f', 0, 64), ('f', 1, 64), ('f', 2, 3)],
+                         [(x['resource'], x['superblock'], x['size']) for x in server.rate_controller.stats()['superblocks']])
+        self.assertEqual(0, server.clients[remote].last_offset)
+
+    @mock.patch.object(ThreadDfuServer, 'ERASE_DELAY', 0.001)
+    @mock.patch.object(ThreadDfuServer, 'POST_UPLOAD_DELAY', 0.2)
+    @mock.patch.object(ThreadDfuServer, 'SPBLK_BMP_TIMEOUT', 0.01)
+    def test_multicast_upload(self):
+        protocol = FakeProtocol(timeouts=True)
+        server = ThreadDfuServer(protocol, bytes(100), bytes(64 * 70),
+                                 Namespace(rate=1000, mcast_dfu=True, reset_suppress=None))
+        remote = piccata.types.Endpoint(ThreadDfuServer.REALM_LOCAL_ADDR, piccata.constants.COAP_PORT)
+
+        def report(request):
+            # A node misses the last image block once and reports it
+            num = request.opt.block1[0]
+            if request.opt.uri_path == [ThreadDfuServer.IMAGE_URI] and num == 69 and report.lost:
+                report.lost = False
+                server.receive_request(make_bitmap_request(ThreadDfuServer.IMAGE_URI, 64, 1 << 58))
+        report.lost = True
+        send = server._send_block
+        server._send_block = lambda *args: (send(*args), report(protocol.requests[-1]))
+
+        start = time.monotonic()
+        server._multicast_upload(remote, 3, server.images)
+        elapsed = time.monotonic() - start
+
+        self.assertTrue(server.upload_done_event.is_set())
+        self.assertTrue(server.first_bmp_event.is_set())
+        blocks = [(request.opt.uri_path[0], request.opt.block1[0]) for request in protocol.requests
+                  if request.opt.block1]
+        self.assertEqual([(b'i', 0), (b'i', 1)] + [(b'f', num) for num in range(70)] + [(b'f', 69)], blocks)
+        self.assertLess(elapsed, 5)
+
+    @mock.patch.object(ThreadDfuServer, 'ERASE_DELAY', 0.001)
+    @mock.patch.object(ThreadDfuServer, 'POST_UPLOAD_DELAY', 0.05)
+    @mock.patch.object(ThreadDfuServer, 'SPBLK_BMP_TIMEOUT', 0.01)
+    def test_multicast_upload_twice(self):
+        protocol = FakeProtocol(timeouts=True)
+        server = ThreadDfuServer(protocol, bytes(100), bytes(64 * 70),
+                                 Namespace(rate=2000, mcast_dfu=True, reset_suppress=None))
+        remote = piccata.types.Endpoint(ThreadDfuServer.REALM_LOCAL_ADDR, piccata.constants.COAP_PORT)
+
+        # The second session reuses the upload thread of the first one, which idles in between
+        for _ in range(2):
+            thread = threading.Thread(target=server._multicast_upload, args=(remote, 1, server.images), daemon=True)
+            thread.start()
+            thread.join(10)
+            self.assertFalse(thread.is_alive())
+
+        blocks = [(request.opt.uri_path[0], request.opt.block1[0]) for request in protocol.requests
+                  if request.opt.block1]
+        self.assertEqual(2 * ([(b'i', 0), (b'i', 1)] + [(b'f', num) for num in range(70)]), blocks)
+
+    def test_bitmap_request_block_size(self):
+        server = ThreadDfuServer(self.protocol, bytes(100), bytes(1024 * 70),
+                                 Namespace(rate=None, mcast_dfu=True, reset_suppress=None, block_size=1024))
+        server.receive_request(make_bitmap_request(ThreadDfuServer.IMAGE_URI, 64, 0b101 << 61))
+
+        self.assertEqual([(server.image_resource, 64), (server.image_resource, 66)],
+                         [server.missing_blocks.pop(), server.missing_blocks.pop()])
+        superblocks = server.rate_controller.stats()['superblocks']
+        # The last superblock holds 6 blocks of 1024 bytes
+        self.assertEqual([(2, 2 / 6)], [(x['missing'], x['loss']) for x in superblocks])
+
+    def test_block_szx(self):
+        self.assertEqual([0, 2, 6], [_block_szx(size) for size in (16, 64, 1024)])
+        for size in (8, 48, 2048):
+            with self.assertRaises(ValueError):
+                _block_szx(size)
+        with self.assertRaises(ValueError):
+            ThreadDfuServer(self.protocol, bytes(100), bytes(100),
+                            Namespace(rate=None, mcast_dfu=True, reset_suppress=None, block_size=100))
+
+    def test_unicast_block_size(self):
+        image = bytes(range(256)) * 20
+        server = ThreadDfuServer(self.protocol, bytes(100), image,
+                                 Namespace(rate=None, mcast_dfu=False, reset_suppress=None))
+        request = make_block_2_request(ThreadDfuServer.IMAGE_URI, 1, 6)
+        response = server.receive_request(request)
+        self.assertEqual(image[1024:2048], response.payload)
+        self.assertEqual((1, True, 6), tuple(response.opt.block2))
+        self.assertEqual(2048, server.nodes.get(request.remote).offset)
+
+        # The node may continue with smaller blocks, the progress is kept in bytes
+        response = server.receive_request(make_block_2_request(ThreadDfuServer.IMAGE_URI, 40, 2))
+        self.assertEqual(image[2560:2624], response.payload)
+        self.assertEqual(2624, server.nodes.get(request.remote).offset)
+
+        response = server.receive_request(make_block_2_request(ThreadDfuServer.IMAGE_URI, 4, 7))
+        self.assertEqual(piccata.constants.BAD_OPTION, response.code)
+
+        response = server.receive_request(make_block_2_request(ThreadDfuServer.IMAGE_URI, 19, 4))
+        self.assertFalse(response.opt.block2[1])
+        self.assertNotIn(request.remote, server.nodes)
+        self.assertEqual(1, server.nodes.done)
+
+    def test_metrics(self):
+        server = ThreadDfuServer(self.protocol, bytes(100), bytes(64 * 2),
+                                 Namespace(rate=None, mcast_dfu=False, reset_suppress=None))
+        events = []
+        server.metrics.add_listener(events.append)
+
+        server.receive_request(make_block_2_request(ThreadDfuServer.INIT_URI, 0, 2))
+        for num in (0, 0, 1):
+            server.receive_request(make_block_2_request(ThreadDfuServer.IMAGE_URI, num, 2))
+        server.receive_request(make_bitmap_request(ThreadDfuServer.IMAGE_URI, 0, 0xc000000000000000))
+
+        self.assertEqual(['block'] * 4 + ['node_done', 'bitmap'], [event['event'] for event in events])
+        self.assertEqual([('i', 0), ('f', 0), ('f', 0), ('f', 1)],
+                         [(event['resource'], event['num']) for event in events[:4]])
+        self.assertEqual(2, events[-1]['missing'])
+
+        node = server.metrics.summary()['nodes']['[fd00::1]:5683']
+        self.assertEqual((4, 1, 256), (node['requests'], node['retransmissions'], node['bytes']))
+
+    def test_unicast_admission(self):
+        server = ThreadDfuServer(self.protocol, bytes(100), bytes(64 * 4),
+                                 Namespace(rate=None, mcast_dfu=False, reset_suppress=None, max_nodes=1))
+        first = make_block_2_request(ThreadDfuServer.IMAGE_URI, 0, 2)
+        second = make_block_2_request(ThreadDfuServer.IMAGE_URI, 0, 2, piccata.constants.NON)
+        second.remote = piccata.types.Endpoint(ip_address('fd00::2'), piccata.constants.COAP_PORT)
+
+        self.assertEqual(piccata.constants.CONTENT, server.receive_request(first).code)
+        response = server.receive_request(second)
+        self.assertEqual(piccata.constants.SERVICE_UNAVAILABLE, response.code)
+        self.assertEqual(piccata.constants.NON, response.mtype)
+        self.assertEqual(second.token, response.token)
+        self.assertEqual([ThreadDfuServer.RETRY_DELAY],
+                         [option.value for option in response.opt.get_option(piccata.constants.MAX_AGE)])
+
+        # The slot frees up when the first node has requested the last block
+        server.receive_request(make_block_2_request(ThreadDfuServer.IMAGE_URI, 3, 2))
+        response = server.receive_request(second)
+        self.assertEqual(piccata.constants.CONTENT, response.code)
+        self.assertEqual(bytes(64), response.payload)
+
+        summary = server.nodes.summary()
+        self.assertEqual([('init', 0), ('waiting', 0), ('active', 1), ('done', 1), ('stale', 0)],
+                         list(summary['phases'].items()))
+
+
+class TestMultiImage(unittest.TestCase):
+    def setUp(self):
+        self.protocol = FakeProtocol()
+        self.server = ThreadDfuServer(self.protocol, b'init-a' * 10, bytes(range(256)) * 2,
+                                      Namespace(rate=None, mcast_dfu=False, reset_suppress=None), 'application')
+        self.other = self.server.add_image(b'init-b' * 10, bytes(range(256)) * 2, 'softdevice')
+
+    def request(self, path, num=0, remote='fd00::1'):
+        request = make_block_2_request(path[0], num, 2)
+        request.opt.uri_path = path
+        request.remote = piccata.types.Endpoint(ip_address(remote), piccata.constants.COAP_PORT)
+        return self.server.receive_request(request)
+
+    def test_resources(self):
+        first = self.server.images[0]
+        self.assertEqual((b'f',), first.image_resource.path)
+        self.assertEqual((b'f', self.other.key), self.other.image_resource.path)
+        self.assertEqual('{:08x}'.format(binascii.crc32(b'init-b' * 10)).encode(), self.other.key)
+        self.assertEqual('f/' + self.other.key.decode(), self.other.image_resource.name)
+
+        # Equal image data shares the block cache
+        self.assertIs(first.image_resource.blocks(2), self.other.image_resource.blocks(2))
+
+        with self.assertRaises(ValueError):
+            self.server.add_image(b'init-b' * 10, bytes(10))
+
+    def test_routing(self):
+        self.assertEqual(b'init-a' * 10, self.request((b'i',)).payload)
+        self.assertEqual(b'init-b' * 10, self.request((b'i', b'softdevice'), remote='fd00::2').payload)
+        self.assertEqual(b'init-b' * 10, self.request((b'i', self.other.key), remote='fd00::3').payload)
+        self.assertEqual(piccata.constants.NOT_FOUND, self.request((b'i', b'bootloader')).code)
+
+        # A node fetching an image by its key keeps fetching it under the plain URIs
+        self.request((b'f',), 1, remote='fd00::2')
+        self.request((b'f',), 1, remote='fd00::4')
+        remote = piccata.types.Endpoint(ip_address('fd00::2'), piccata.constants.COAP_PORT)
+        self.assertEqual(128, self.other.nodes.get(remote).offset)
+        self.assertEqual(2, len(self.server.nodes))
+        self.assertEqual(2, len(self.other.nodes))
+
+    def test_trigger(self):
+        response = self.request((b't', b'softdevice'))
+        self.assertEqual(self.other.make_trigger(), response.payload)
+        self.assertNotEqual(self.server.images[0].make_trigger(), response.payload)
+
+        self.server.trigger(ip_address('fd00::1'), 3)
+        self.assertEqual([img.make_trigger() for img in self.server.images],
+                         [request.payload for request in self.protocol.requests])
+        self.assertEqual([(b't',), (b't', self.other.key)],
+                         [tuple(request.opt.uri_path) for request in self.protocol.requests])
+
+    def test_trigger_plain_node(self):
+        # A node using the plain URIs is not triggered for the second image
+        self.server.trigger(ip_address('fd00::1'), 3, [self.other])
+        self.assertEqual([(b't', self.other.key)], [tuple(request.opt.uri_path) for request in self.protocol.requests])
+
+        # It is triggered for the first image, and served the image of the trigger CRCs
+        self.server.trigger(ip_address('fd00::1'), 3)
+        plain = [request for request in self.protocol.requests if tuple(request.opt.uri_path) == (b't',)]
+        self.assertEqual(1, len(plain))
+        _, init_size, init_crc, _, _ = struct.unpack('>BIIII', plain[0].payload)
+        init = self.request((b'i',)).payload
+        self.assertEqual((init_size, init_crc), (len(init), binascii.crc32(init) & 0xffffffff))
+
+    def test_trigger_request(self):
+        # A node asking for a trigger is answered on the URI it asked on
+        request = make_block_2_request(b't', 0, 2, piccata.constants.NON)
+        request.opt.uri_path = (b't', b'softdevice')
+        self.server.receive_request(request)
+
+        self.assertEqual([(b't', b'softdevice')], [tuple(request.opt.uri_path) for request in self.protocol.requests])
+        self.assertEqual(self.other.make_trigger(), self.protocol.requests[0].payload)
+
+    def test_bitmap_request(self):
+        self.server.receive_request(make_bitmap_request(ThreadDfuServer.IMAGE_URI, 0, 1 << 63))
+        request = make_bitmap_request(ThreadDfuServer.IMAGE_URI, 0, 1 << 62)
+        request.opt.uri_path = (ThreadDfuServer.BITMAP_URI, ThreadDfuServer.IMAGE_URI, self.other.key)
+        self.server.receive_request(request)
+
+        self.assertEqual([(self.server.image_resource, 0), (self.other.image_resource, 1)],
+                         [self.server.missing_blocks.pop(), self.server.missing_blocks.pop()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import threading
+import time
+import unittest
+from ipaddress import ip_address
+from unittest import mock
+
+from spinel.const import SPINEL
+
+from nordicsemi.thread.tncp import NCPTransport
+
+
+class FakeWpan:
+    '''Stands in for spinel.codec.WpanApi, answers property gets with the current role.'''
+    def __init__(self, role):
+        self.role = role
+        self.gets = 0
+
+    def prop_get_value(self, prop_id):
+        assert prop_id == SPINEL.PROP_NET_ROLE
+        self.gets += 1
+        return self.role
+
+
+class TestNCPTransport(unittest.TestCase):
+    def setUp(self):
+        self.transport = NCPTransport(5683, 'u:/dev/null')
+        self.transport._wpan = FakeWpan(NCPTransport.ROLE_DETACHED)
+
+    def test_role_known(self):
+        self.transport._wpan.role = NCPTransport.ROLE_LEADER
+        self.assertTrue(self.transport.wait_for_role((NCPTransport.ROLE_ROUTER, NCPTransport.ROLE_LEADER), 1))
+        self.assertEqual(NCPTransport.ROLE_LEADER, self.transport.role)
+
+    def test_role_changed(self):
+        def promote():
+            time.sleep(0.05)
+            self.transport._wpan_role_changed(SPINEL.PROP_NET_ROLE, NCPTransport.ROLE_ROUTER, SPINEL.HEADER_ASYNC)
+
+        thread = threading.Thread(target=promote)
+        thread.start()
+        start = time.monotonic()
+        self.assertTrue(self.transport.wait_for_role((NCPTransport.ROLE_ROUTER,), 10))
+        thread.join()
+
+        # The asynchronous role update ends the wait, not a poll of the role
+        self.assertLess(time.monotonic() - start, NCPTransport.ROLE_POLL_INTERVAL)
+        self.assertEqual(1, self.transport._wpan.gets)
+
+    @mock.patch.object(NCPTransport, 'ROLE_POLL_INTERVAL', 0.01)
+    def test_role_polled(self):
+        timer = threading.Timer(0.05, setattr, (self.transport._wpan, 'role', NCPTransport.ROLE_CHILD))
+        timer.start()
+        self.assertTrue(self.transport.wait_for_role((NCPTransport.ROLE_CHILD,), 10))
+        self.assertGreater(self.transport._wpan.gets, 1)
+
+    def test_timeout(self):
+        start = time.monotonic()
+        self.assertFalse(self.transport.wait_for_role((NCPTransport.ROLE_ROUTER,), 0.05))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(NCPTransport.ROLE_DETACHED, self.transport.role)
+
+    def test_role_update_not_consumed(self):
+        self.assertFalse(self.transport._wpan_role_changed(SPINEL.PROP_NET_ROLE, NCPTransport.ROLE_CHILD,
+                                                           SPINEL.HEADER_DEFAULT))
+
+
+class Receiver:
+    def __init__(self):
+        self.datagrams = []
+
+    def receive(self, payload, src, dst):
+        self.datagrams.append((payload, src, dst))
+
+
+class TestReceive(unittest.TestCase):
+    SRC = ip_address('fd00::1')
+    DST = ip_address('fd00::2')
+
+    def setUp(self):
+        self.transport = NCPTransport(5683, 'u:/dev/null')
+        self.receiver = Receiver()
+        self.transport.register_receiver(self.receiver)
+
+    def make_packet(self, dport=5683, payload=b'coap message'):
+        # Spinel frames are bytes
+        return bytes(self.transport._build_udp_datagram(self.SRC, 61631, self.DST, dport, payload).to_bytes())
+
+    def receive(self, packet):
+        return self.transport._wpan_receive(SPINEL.PROP_STREAM_NET, packet, SPINEL.HEADER_ASYNC)
+
+    def test_receive(self):
+        packet = self.make_packet()
+        self.assertTrue(self.receive(packet))
+
+        self.assertEqual(1, len(self.receiver.datagrams))
+        payload, src, dst = self.receiver.datagrams[0]
+        self.assertIsInstance(payload, memoryview)
+        self.assertIs(packet, payload.obj)
+        self.assertEqual(b'coap message', payload)
+        self.assertEqual((self.SRC, 61631), src)
+        self.assertEqual((self.DST, 5683), dst)
+        self.assertEqual(self.SRC, src.addr)
+        self.assertEqual(5683, dst.port)
+
+    def test_receive_mutable(self):
+        self.assertTrue(self.receive(bytearray(self.make_packet())))
+        payload, _, _ = self.receiver.datagrams[0]
+        self.assertEqual(hash(b'coap message'), hash(payload))
+
+    def test_ignored(self):
+        packet = self.make_packet()
+        not_udp = packet[:6] + bytes([58]) + packet[7:]
+        too_long = packet[:44] + (len(packet) - 39).to_bytes(2, 'big') + packet[46:]
+
+        for value in (self.make_packet(dport=5684), not_udp, too_long, packet[:47]):
+            self.assertTrue(self.receive(value))
+        self.assertEqual([], self.receiver.datagrams)
+
+    def test_unexpected_property(self):
+        self.assertFalse(self.transport._wpan_receive(SPINEL.PROP_NET_ROLE, 1, SPINEL.HEADER_ASYNC))
+        self.assertEqual([], self.receiver.datagrams)
+
+    def test_propid_to_str(self):
+        self.assertEqual('PROP_STREAM_NET', NCPTransport._propid_to_str(SPINEL.PROP_STREAM_NET))
+        self.assertEqual('PROP_NET_ROLE', NCPTransport._propid_to_str(SPINEL.PROP_NET_ROLE))
+        self.assertIsNone(NCPTransport._propid_to_str(-1))
+
+
+if __name__ == '__main__':
+    unittest.main()
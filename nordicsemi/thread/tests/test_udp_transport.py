@@ -0,0 +1,192 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import socket
+import threading
+import unittest
+from argparse import Namespace
+from ipaddress import ip_address
+from unittest import mock
+
+import piccata.core
+from piccata.types import Endpoint
+
+from nordicsemi.thread.dfu_server import ThreadDfuServer
+from nordicsemi.thread.sim_client import SimulatedDfuClient
+from nordicsemi.thread.udp_transport import UDPTransport
+
+
+def _has_ipv6_loopback():
+    try:
+        with socket.socket(socket.AF_INET6, socket.SOCK_DGRAM) as sock:
+            sock.bind(('::1', 0))
+        return True
+    except OSError:
+        return False
+
+
+class Receiver:
+    def __init__(self):
+        self.datagrams = []
+        self.event = threading.Event()
+
+    def receive(self, data, remote, local):
+        self.datagrams.append((data, remote, local))
+        self.event.set()
+
+
+@unittest.skipUnless(_has_ipv6_loopback(), "IPv6 loopback not available")
+class TestUDPTransport(unittest.TestCase):
+    def open_transport(self, **kwargs):
+        transport = UDPTransport(**kwargs)
+        transport.open()
+        self.addCleanup(transport.close)
+        return transport
+
+    def test_send_receive(self):
+        sender = self.open_transport()
+        transport = self.open_transport()
+        receiver = Receiver()
+        transport.register_receiver(receiver)
+
+        sender.send(b'hello', transport.endpoint)
+
+        self.assertTrue(receiver.event.wait(5))
+        data, remote, local = receiver.datagrams[0]
+        self.assertEqual(b'hello', data)
+        self.assertEqual(Endpoint(ip_address('::1'), sender.endpoint.port), remote)
+        self.assertEqual(transport.endpoint, local)
+
+    def test_multicast(self):
+        sender = self.open_transport()
+        receivers = []
+        for _ in range(3):
+            transport = self.open_transport()
+            receiver = Receiver()
+            transport.register_receiver(receiver)
+            sender.join('ff03::1', transport.endpoint)
+            receivers.append(receiver)
+
+        sender.send(b'all', Endpoint(ip_address('ff03::1'), piccata.constants.COAP_PORT))
+        sender.send(b'none', Endpoint(ip_address('ff03::2'), piccata.constants.COAP_PORT))
+
+        for receiver in receivers:
+            self.assertTrue(receiver.event.wait(5))
+        sender.close()
+        for receiver in receivers:
+            self.assertEqual([b'all'], [data for data, _, _ in receiver.datagrams])
+
+    def test_loss(self):
+        sender = self.open_transport()
+        transport = self.open_transport(loss=1.0)
+        receiver = Receiver()
+        transport.register_receiver(receiver)
+
+        for _ in range(10):
+            sender.send(b'lost', transport.endpoint)
+        sender.close()
+        sender.send(b'closed', transport.endpoint)
+
+        self.assertFalse(receiver.event.wait(0.2))
+        self.assertEqual(10, transport.received)
+        self.assertEqual(10, transport.dropped)
+
+
+@unittest.skipUnless(_has_ipv6_loopback(), "IPv6 loopback not available")
+class TestLoopbackDfu(unittest.TestCase):
+    def setUp(self):
+        self.init = bytes(range(100))
+        self.image = os.urandom(64 * 80 + 7)
+
+    def open_transport(self, **kwargs):
+        transport = UDPTransport(latency=0.001, **kwargs)
+        transport.open()
+        self.addCleanup(transport.close)
+        return transport
+
+    def create_server(self, mcast_dfu, loss=0.0):
+        transport = self.open_transport(loss=loss, seed=0)
+        protocol = piccata.core.Coap(transport)
+        transport.register_receiver(protocol)
+        opts = Namespace(rate=1000, mcast_dfu=mcast_dfu, reset_suppress=None)
+        return ThreadDfuServer(protocol, self.init, self.image, opts), transport
+
+    def create_clients(self, server_transport, count, loss):
+        clients = []
+        for seed in range(count):
+            transport = self.open_transport(loss=loss, seed=seed + 1)
+            server_transport.join('ff03::1', transport.endpoint)
+            clients.append(SimulatedDfuClient(transport, request_timeout=0.1, bmp_timeout=0.3))
+        return clients
+
+    def test_unicast(self):
+        server, transport = self.create_server(False, loss=0.1)
+        clients = self.create_clients(transport, 2, loss=0.1)
+
+        threads = [threading.Thread(target=client.fetch, args=(transport.endpoint,), daemon=True)
+                   for client in clients]
+        for thread in threads:
+            thread.start()
+
+        for client in clients:
+            self.assertTrue(client.done_event.wait(30))
+            self.assertEqual(bytes(self.image), bytes(client.downloads[1].data))
+            self.assertGreaterEqual(client.stats()['requests'], 2 + 81)
+        self.assertEqual(2, server.nodes.done)
+
+    @mock.patch.object(ThreadDfuServer, 'ERASE_DELAY', 0.001)
+    @mock.patch.object(ThreadDfuServer, 'POST_UPLOAD_DELAY', 1)
+    @mock.patch.object(ThreadDfuServer, 'SPBLK_BMP_TIMEOUT', 0.2)
+    def test_multicast(self):
+        server, transport = self.create_server(True)
+        clients = self.create_clients(transport, 3, loss=0.1)
+
+        server.trigger(ip_address('ff03::1'), 3)
+
+        for client in clients:
+            self.assertTrue(client.done_event.wait(30))
+            self.assertEqual(bytes(self.init), bytes(client.downloads[0].data))
+            self.assertEqual(bytes(self.image), bytes(client.downloads[1].data))
+
+        # The lost blocks are reported and sent again
+        self.assertTrue(any(client.bitmaps_sent for client in clients))
+        self.assertTrue(server.first_bmp_event.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import json
+import unittest
+
+from nordicsemi.thread.upload_rate import UploadRateController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+class TestUploadRateController(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def controller(self, rate, max_rate=None, min_rate=None, burst=1):
+        return UploadRateController(rate, max_rate, min_rate, burst, clock=self.clock, sleep=self.clock.sleep)
+
+    def send(self, controller, count):
+        times = []
+        for _ in range(count):
+            controller.wait()
+            times.append(self.clock.now)
+        return times
+
+    def test_fixed_rate(self):
+        controller = self.controller(5)
+        times = self.send(controller, 11)
+        self.assertAlmostEqual(2.0, times[-1] - times[0])
+
+        # Time spent between the blocks counts against the interval
+        self.clock.now += 0.1
+        self.assertAlmostEqual(0.2, self.send(controller, 1)[0] - times[-1])
+
+    def test_burst(self):
+        controller = self.controller(10, burst=4)
+        self.send(controller, 1)
+        self.clock.now += 10
+        times = self.send(controller, 6)
+        self.assertEqual([times[0]] * 4, times[:4])
+        self.assertAlmostEqual(0.2, times[5] - times[3])
+
+    def test_pause(self):
+        controller = self.controller(10)
+        start = self.send(controller, 1)[0]
+        controller.pause(0.5)
+        self.assertAlmostEqual(0.5, self.send(controller, 1)[0] - start)
+
+    def test_ramp_up(self):
+        controller = self.controller(4, max_rate=6)
+        for superblock in range(4):
+            controller.block_sent('f', superblock, 64)
+            controller.superblock_done('f', superblock)
+        self.assertAlmostEqual(6, controller.rate)
+
+        # Without a maximum the rate is fixed
+        controller = self.controller(4)
+        controller.block_sent('f', 0, 64)
+        controller.superblock_done('f', 0)
+        controller.block_sent('f', 1, 64)
+        controller.superblock_done('f', 1)
+        self.assertEqual(4, controller.rate)
+
+    def test_back_off(self):
+        controller = self.controller(8, max_rate=16, min_rate=3)
+        controller.block_sent('f', 0, 64)
+        controller.report('f', 0, 1, 64)
+        self.assertEqual(8, controller.rate)
+
+        # Once per superblock, however many nodes report it
+        controller.report('f', 0, 20, 64)
+        controller.report('f', 0, 10, 64)
+        self.assertEqual(4, controller.rate)
+        controller.report('f', 1, 20, 64)
+        self.assertEqual(3, controller.rate)
+
+        # No ramp up after a lossy superblock
+        controller.superblock_done('f', 0)
+        controller.superblock_done('f', 1)
+        self.assertEqual(3, controller.rate)
+
+    def test_stats(self):
+        controller = self.controller(2, max_rate=4)
+        for num in range(70):
+            controller.wait()
+            controller.block_sent('f', num // 64, 64 if num < 64 else 6)
+        controller.report('f', 1, 3, 6)
+
+        stats = json.loads(json.dumps(controller.stats()))
+        self.assertEqual(70, stats['blocks_sent'])
+        self.assertAlmostEqual(2, stats['effective_rate'])
+        self.assertEqual([0, 1], [x['superblock'] for x in stats['superblocks']])
+        self.assertEqual({'resource': 'f', 'superblock': 1, 'sent': 6, 'size': 6, 'missing': 3, 'loss': 0.5,
+                          'rate': 2.0}, stats['superblocks'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
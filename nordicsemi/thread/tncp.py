@@ -37,20 +37,40 @@
 import time
 import logging
 import ipaddress
+import functools
 import struct
+import threading
 
-import io
-import spinel.common
 import spinel.ipv6
 
+from piccata.types import Endpoint
 from spinel.stream import StreamOpen
 from spinel.codec import WpanApi
 from spinel.const import SPINEL
-import collections
 import spinel.util as util
 
 logger = logging.getLogger(__name__)
 
+IPV6_HEADER_LEN = 40
+UDP_HEADER_LEN = 8
+UDP_PROTOCOL = 17
+
+_UDP_HEADER = struct.Struct('>HHH')     # source port, destination port, length
+
+# Property names by value, the first name of a value wins
+_PROP_NAMES = {}
+for _name, _value in SPINEL.__dict__.items():
+    if _name.startswith('PROP_'):
+        _PROP_NAMES.setdefault(_value, _name)
+del _name, _value
+
+
+@functools.lru_cache(maxsize=256)
+def _ipv6_address(packed):
+    '''Return the address of 16 packed bytes. The nodes of a network are few, so their addresses are cached.'''
+    return ipaddress.IPv6Address(packed)
+
+
 class NCPTransport:
     '''A CoAP Toolkit compatible transport'''
     CFG_KEY_CHANNEL = 'channel'
@@ -58,29 +78,29 @@ class NCPTransport:
     CFG_KEY_RESET = 'reset'
     CFG_KEY_MASTERKEY = 'masterkey'
 
+    # Values of SPINEL.PROP_NET_ROLE
+    ROLE_DETACHED = 0
+    ROLE_CHILD    = 1
+    ROLE_ROUTER   = 2
+    ROLE_LEADER   = 3
+
+    ATTACH_TIMEOUT     = 120    # in seconds
+    ROUTER_TIMEOUT     = 10     # in seconds, for the NCP to be promoted to a router
+    ROLE_POLL_INTERVAL = 5      # in seconds, in case the NCP does not report a role change
+
     def __init__(self, port, stream_descriptor, config = None):
         self._port = port
         self._stream_descriptor = stream_descriptor.split(":")
         self._config = config if config is not None else self.get_default_config()
         self._attached = False
-
-        self._udp6_parser = spinel.ipv6.IPv6PacketFactory(
-                            ulpf = {
-                                17: spinel.ipv6.UDPDatagramFactory(
-                                    udp_header_factory = spinel.ipv6.UDPHeaderFactory(),
-                                    dst_port_factories = {
-                                        port: spinel.ipv6.UDPBytesPayloadFactory()
-                                        }
-                                    ),
-                            })
+        self._role = None
+        self._role_changed = threading.Condition()
 
         self._receivers = []
 
     @staticmethod
     def _propid_to_str(propid):
-        for name, value in SPINEL.__dict__.items():
-            if (name.startswith('PROP_') and value == propid):
-                return name
+        return _PROP_NAMES.get(propid)
 
     def _set_property(self, *args):
         for propid, value, py_format in args:
@@ -106,34 +126,77 @@ class NCPTransport:
         ]
         self._set_property(*props)
 
-        while True:
-            role = self._wpan.prop_get_value(SPINEL.PROP_NET_ROLE)
-            if (role != 0):
-                self._attached = True
-                return True
-            time.sleep(1)
+        self._attached = self.wait_for_role((self.ROLE_CHILD, self.ROLE_ROUTER, self.ROLE_LEADER),
+                                            self.ATTACH_TIMEOUT)
+        return self._attached
+
+    def _wpan_role_changed(self, prop, value, tid):
+        with self._role_changed:
+            self._role = value
+            self._role_changed.notify_all()
 
+        # Not consumed, so that the value still answers a pending property get
         return False
 
+    @property
+    def role(self):
+        '''The role of the NCP in the Thread network, one of the ROLE_ values, or None if not known yet.'''
+        return self._role
+
+    def wait_for_role(self, roles, timeout):
+        '''
+        Wait until the NCP takes one of the given roles. The NCP reports role changes
+        asynchronously; the role is also read every ROLE_POLL_INTERVAL seconds.
+        Return True if the NCP took one of the roles within timeout seconds.
+        '''
+        deadline = time.monotonic() + timeout
+        while True:
+            self._wpan_role_changed(SPINEL.PROP_NET_ROLE, self._wpan.prop_get_value(SPINEL.PROP_NET_ROLE), None)
+            with self._role_changed:
+                while self._role not in roles:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    if not self._role_changed.wait(min(remaining, self.ROLE_POLL_INTERVAL)):
+                        break
+                else:
+                    return True
+
+    def _parse_datagram(self, value):
+        '''
+        Return the payload, source and destination endpoints of an IPv6 packet carrying a UDP
+        datagram to the transport port, or None for any other packet. The payload is a
+        memoryview of the packet, so nothing is copied.
+        '''
+        if not isinstance(value, bytes):
+            # Views of a mutable buffer cannot be hashed, as the CoAP toolkit does with tokens
+            value = bytes(value)
+
+        packet = memoryview(value)
+        if (len(packet) < IPV6_HEADER_LEN + UDP_HEADER_LEN or packet[6] != UDP_PROTOCOL):
+            # Not UDP, or with extension headers
+            return None
+
+        src_port, dst_port, length = _UDP_HEADER.unpack_from(packet, IPV6_HEADER_LEN)
+        if (dst_port != self._port or
+                not UDP_HEADER_LEN <= length <= len(packet) - IPV6_HEADER_LEN):
+            return None
+
+        payload = packet[IPV6_HEADER_LEN + UDP_HEADER_LEN:IPV6_HEADER_LEN + length]
+        src = Endpoint(_ipv6_address(bytes(packet[8:24])), src_port)
+        dst = Endpoint(_ipv6_address(bytes(packet[24:40])), dst_port)
+        return payload, src, dst
+
     def _wpan_receive(self, prop, value, tid):
         consumed = False
         if prop == SPINEL.PROP_STREAM_NET:
             consumed = True
             try:
-                pkt = self._udp6_parser.parse(io.BytesIO(value),
-                                              spinel.common.MessageInfo())
-                endpoint = collections.namedtuple('endpoint', 'addr port')
-                payload = pkt.upper_layer_protocol.payload.to_bytes()
-                src = endpoint(pkt.ipv6_header.source_address,
-                               pkt.upper_layer_protocol.header.src_port)
-                dst = endpoint(pkt.ipv6_header.destination_address,
-                               pkt.upper_layer_protocol.header.dst_port)
-
-                for receiver in self._receivers:
-                    receiver.receive(payload, src, dst)
-
-            except RuntimeError:
-                pass
+                datagram = self._parse_datagram(value)
+                if datagram is not None:
+                    for receiver in self._receivers:
+                        receiver.receive(*datagram)
+
             except Exception as e:
                 logging.exception(e)
         else:
@@ -203,8 +266,8 @@ class NCPTransport:
 
     def register_receiver(self, callback):
         '''Registers a receiver, that will get all the data received from the transport.
-           The callback function shall be in format:
-           receive_callback(src_addr, src_port, dest_port, dest_addr, payload)'''
+           The receiver shall have a method receive(payload, src, dst), where payload is
+           a memoryview and src and dst are endpoints of address and port.'''
         self._receivers.append(callback)
 
     def remove_receiver(self, callback):
@@ -219,6 +282,7 @@ class NCPTransport:
         self._wpan.queue_register(SPINEL.HEADER_DEFAULT)
         self._wpan.queue_register(SPINEL.HEADER_ASYNC)
         self._wpan.callback_register(SPINEL.PROP_STREAM_NET, self._wpan_receive)
+        self._wpan.callback_register(SPINEL.PROP_NET_ROLE, self._wpan_role_changed)
 
         if (self._config[NCPTransport.CFG_KEY_RESET]) and not self._wpan.cmd_reset():
             raise Exception('Failed to reset NCP. Please flash connectivity firmware.')
@@ -0,0 +1,189 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+A CoAP Toolkit compatible transport over plain UDP sockets, to run the Thread DFU server and
+simulated nodes on loopback, without an NCP.
+"""
+
+import ipaddress
+import logging
+import queue
+import random
+import socket
+import threading
+import time
+
+from piccata.types import Endpoint
+
+logger = logging.getLogger(__name__)
+
+
+class UDPTransport:
+    '''
+    A CoAP Toolkit compatible transport with the interface of NCPTransport, over a UDP socket.
+
+    Loopback has no mesh to flood multicast datagrams, so a datagram sent to a multicast address
+    is sent to each endpoint that joined the group instead. Received datagrams may be dropped
+    with the given probability, to simulate a lossy network.
+
+    Sent datagrams leave after the given latency. The CoAP Toolkit registers a transaction only
+    once its request has been sent, so without latency a response on loopback may arrive before
+    the transaction it belongs to.
+    '''
+    MAX_DATAGRAM = 2048
+    POLL_INTERVAL = 0.1     # how often the receiving thread checks for close, in seconds
+
+    def __init__(self, port = 0, address = '::1', loss = 0.0, seed = None, latency = 0.005):
+        '''
+        :param port: The port to bind to, 0 for any free port.
+        :param address: The address to bind to, IPv6 or IPv4.
+        :param loss: Probability of dropping a received datagram.
+        :param seed: Seed of the random drops.
+        :param latency: Delay of sent datagrams, in seconds.
+        '''
+        self._address = ipaddress.ip_address(address)
+        self._port = port
+        self._loss = loss
+        self._random = random.Random(seed)
+        self._latency = latency
+        self._receivers = []
+        self._groups = {}
+        self._socket = None
+        self._thread = None
+        self._sender = None
+        self._outgoing = queue.Queue()
+        self.received = 0
+        self.dropped = 0
+
+    @property
+    def endpoint(self):
+        '''The local endpoint, known once the transport is open.'''
+        return Endpoint(self._address, self._port)
+
+    def join(self, group, endpoint):
+        '''Deliver the datagrams sent to the multicast group address to endpoint.'''
+        self._groups.setdefault(ipaddress.ip_address(group), []).append(endpoint)
+
+    def register_receiver(self, callback):
+        '''Registers a receiver, that will get all the data received from the transport.'''
+        self._receivers.append(callback)
+
+    def remove_receiver(self, callback):
+        '''Remove a receiver callback'''
+        self._receivers.remove(callback)
+
+    def open(self):
+        '''Opens transport for communication.'''
+        family = socket.AF_INET6 if self._address.version == 6 else socket.AF_INET
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.bind((str(self._address), self._port))
+        self._socket.settimeout(UDPTransport.POLL_INTERVAL)
+        self._port = self._socket.getsockname()[1]
+
+        self._thread = threading.Thread(target = self._receive, name = 'UDP transport {}'.format(self._port))
+        self._thread.daemon = True
+        self._thread.start()
+
+        self._sender = threading.Thread(target = self._send, name = 'UDP transport {} sender'.format(self._port))
+        self._sender.daemon = True
+        self._sender.start()
+
+    def close(self):
+        '''Closes transport for communication.'''
+        if self._socket is None:
+            return
+
+        sock, self._socket = self._socket, None
+        self._outgoing.put(None)
+        for thread in (self._thread, self._sender):
+            if thread is not threading.current_thread():
+                thread.join()
+        sock.close()
+
+    def send(self, payload, dest):
+        if self._socket is None:
+            return
+
+        if dest.addr.is_multicast:
+            destinations = self._groups.get(dest.addr, [])
+        else:
+            destinations = [dest]
+
+        due = time.monotonic() + self._latency
+        for endpoint in destinations:
+            self._outgoing.put((due, bytes(payload), (str(endpoint.addr), endpoint.port)))
+
+    def _send(self):
+        sock = self._socket
+        while True:
+            # Datagrams sent before close are flushed
+            item = self._outgoing.get()
+            if item is None:
+                break
+
+            due, payload, address = item
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                sock.sendto(payload, address)
+            except OSError as e:
+                logger.debug("Sending to {} failed: {}".format(address, e))
+
+    def _receive(self):
+        local = self.endpoint
+        sock = self._socket
+        while self._socket is not None:
+            try:
+                data, address = sock.recvfrom(UDPTransport.MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self.received += 1
+            if self._loss and self._random.random() < self._loss:
+                self.dropped += 1
+                continue
+
+            remote = Endpoint(ipaddress.ip_address(address[0]), address[1])
+            for receiver in self._receivers:
+                try:
+                    receiver.receive(data, remote, local)
+                except Exception as e:
+                    logger.exception(e)
@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Rate control for the multicast upload of the Thread DFU server.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class UploadRateController:
+    '''
+    Token bucket pacing of the multicast blocks, with a rate that adapts to the loss that the
+    nodes report in their bitmaps.
+
+    The rate starts at the configured value. When a superblock ends and the superblock before it
+    was reported with less than LOW_LOSS of its blocks missing, the rate grows by INCREASE up to
+    max_rate. A report with more than HIGH_LOSS missing cuts the rate by DECREASE, at most once
+    per superblock, down to min_rate. Erase pauses at superblock edges are kept with pause().
+
+    Superblocks are identified by the resource name and the superblock number. For each of them
+    the blocks sent, the worst loss reported and the rate it was started with are kept for stats().
+    '''
+    LOW_LOSS  = 0.02
+    HIGH_LOSS = 0.10
+    INCREASE  = 1.25
+    DECREASE  = 0.5
+    EPSILON   = 1e-9    # tokens lost to rounding
+
+    def __init__(self, rate, max_rate=None, min_rate=None, burst=1, clock=time.monotonic, sleep=time.sleep):
+        '''
+        :param rate: Initial rate in blocks per second.
+        :param max_rate: Highest rate to ramp up to. Defaults to rate, which disables the ramp up.
+        :param min_rate: Lowest rate to back off to. Defaults to a tenth of rate.
+        :param burst: Number of blocks that may be sent back to back after an idle period.
+        '''
+        self.rate = float(rate)
+        self.max_rate = max(self.rate, float(max_rate)) if max_rate else self.rate
+        self.min_rate = min(self.rate, float(min_rate)) if min_rate else self.rate / 10
+        self.burst = burst
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._last = None
+        self._not_before = None
+        self._first_sent = None
+        self._last_sent = None
+        self._sent = 0
+        self._superblocks = OrderedDict()
+        self._backed_off = set()
+        self._last_done = None
+
+    def _superblock(self, key):
+        superblock = self._superblocks.get(key)
+        if superblock is None:
+            superblock = {'sent': 0, 'size': 0, 'missing': 0, 'loss': 0.0, 'rate': self.rate}
+            self._superblocks[key] = superblock
+        return superblock
+
+    def wait(self):
+        '''Block until the next block may be sent.'''
+        now = self._clock()
+        while True:
+            with self._lock:
+                if self._last is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                delay = 0.0
+                if self._not_before is not None and now < self._not_before:
+                    delay = self._not_before - now
+                if self._tokens < 1 - self.EPSILON:
+                    delay = max(delay, (1 - self._tokens) / self.rate)
+                if delay <= 0:
+                    self._tokens -= 1
+                    if self._first_sent is None:
+                        self._first_sent = now
+                    self._last_sent = now
+                    return
+
+            self._sleep(delay)
+            now = self._clock()
+
+    def pause(self, delay):
+        '''Send nothing for delay seconds, e.g. while the nodes erase a flash page.'''
+        self._not_before = self._clock() + delay
+
+    def block_sent(self, resource, superblock, size):
+        '''Record a block sent in a superblock of size blocks.'''
+        with self._lock:
+            self._sent += 1
+            entry = self._superblock((resource, superblock))
+            entry['sent'] += 1
+            entry['size'] = size
+
+    def report(self, resource, superblock, missing, size):
+        '''Record a bitmap report of missing blocks out of the size blocks of a superblock.'''
+        key = (resource, superblock)
+        loss = missing / size if size else 0.0
+        with self._lock:
+            entry = self._superblock(key)
+            entry['missing'] = max(entry['missing'], missing)
+            entry['loss'] = max(entry['loss'], loss)
+
+            if loss > self.HIGH_LOSS and key not in self._backed_off:
+                self._backed_off.add(key)
+                self.rate = max(self.min_rate, self.rate * self.DECREASE)
+
+    def superblock_done(self, resource, superblock):
+        '''
+        Called when the last block of a superblock was sent. The reports for the superblock before
+        it had the time of a whole superblock to arrive, if they show little loss the rate is raised.
+        '''
+        key = (resource, superblock)
+        with self._lock:
+            previous, self._last_done = self._last_done, key
+            if previous is None or previous == key:
+                return
+            if self._superblocks[previous]['loss'] < self.LOW_LOSS and previous not in self._backed_off:
+                self.rate = min(self.max_rate, self.rate * self.INCREASE)
+
+    def effective_rate(self):
+        '''Blocks sent per second, from the first to the last block sent.'''
+        if self._sent < 2 or self._last_sent <= self._first_sent:
+            return 0.0
+        return (self._sent - 1) / (self._last_sent - self._first_sent)
+
+    def stats(self):
+        '''Return the rates and the per-superblock loss as a JSON serializable dict.'''
+        with self._lock:
+            superblocks = []
+            for (resource, superblock), entry in self._superblocks.items():
+                superblocks.append(OrderedDict([('resource', resource), ('superblock', superblock)] +
+                                               sorted(entry.items())))
+
+        return OrderedDict([
+            ('rate', self.rate),
+            ('max_rate', self.max_rate),
+            ('min_rate', self.min_rate),
+            ('effective_rate', self.effective_rate()),
+            ('blocks_sent', self._sent),
+            ('superblocks', superblocks),
+        ])
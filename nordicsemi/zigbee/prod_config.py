@@ -35,10 +35,7 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
-import crcmod.predefined
 import struct
-import intelhex
-import yaml
 
 
 class ProductionConfigWrongException(Exception):
@@ -74,6 +71,10 @@ class ProductionConfig:
         return format_offsets(cls.OFFSETS)
 
     def __init__(self, path):
+        # Imported here, the class constants are used by the nrfutil command line at startup
+        import crcmod.predefined
+        import yaml
+
         self._parsed_values = {}
         self._crc16 = crcmod.predefined.mkPredefinedCrcFun('x-25')
 
@@ -139,7 +140,10 @@ class ProductionConfig:
             crc = (0xFFFFFFFF & ((crc >> 8) ^ c))
         return (~crc & 0xFFFFFFFF)
 
-    def generate(self, path, offset=DEFAULT_OFFSET):
+    def tobytes(self):
+        """
+        Returns the Production Config as it is stored in flash.
+        """
         # Calculate the CRC-16 of the install code
         self._struct = (struct.pack(self.HEADER_FORMAT,
                                     struct.calcsize(self.HEADER_FORMAT) + 4 + self._ad_len,  # Plus the CRC-32; plus the app_data
@@ -158,8 +162,13 @@ class ProductionConfig:
         if len(output) > self.SIZE_MAX + 4: # 4 is for Magic Number
             raise ProductionConfigTooLargeException(len(output))
 
+        return output
+
+    def generate(self, path, offset=DEFAULT_OFFSET):
+        import intelhex
+
         ih = intelhex.IntelHex()
-        ih.puts(offset, output)
+        ih.puts(offset, self.tobytes())
         ih.write_hex_file(path)
 
 
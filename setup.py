@@ -150,10 +150,16 @@ setup(
     },
     python_requires='>=3.7, <3.11',
     install_requires=reqs,
+    extras_require={
+        # Faster signing, with the same (deterministic) signatures as the default ecdsa backend
+        'crypto': ['cryptography >= 44.0'],
+    },
     zipfile=None,
     tests_require=[
         "nose >= 1.3.4",
-        "behave"
+        "behave",
+        # The init packet codec tests compare against the generated protobuf code
+        "protobuf >=3.17.3, < 4.0.0"
     ],
     zip_safe=False,
     classifiers=[
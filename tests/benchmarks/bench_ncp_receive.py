@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Measures the receive path of NCPTransport on synthetic Spinel PROP_STREAM_NET frames: IPv6 packets
+carrying UDP datagrams from --sources nodes, a --foreign fraction of them to another port. The
+packets are passed to NCPTransport._wpan_receive as the Spinel codec passes them, and compared with
+the previous receive path, which parsed each packet through the generic spinel.ipv6 factories.
+
+Also compares the property name lookup used when logging properties with the previous linear
+scan of the SPINEL constants.
+
+Usage: python tests/benchmarks/bench_ncp_receive.py [--frames N] [--sources N] [--size BYTES] [--foreign P]
+"""
+
+import argparse
+import collections
+import io
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from ipaddress import ip_address
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+import spinel.common
+import spinel.ipv6
+from spinel.const import SPINEL
+
+from nordicsemi.thread.tncp import NCPTransport
+
+PORT = 5683
+
+
+class NullReceiver:
+    def __init__(self):
+        self.count = 0
+
+    def receive(self, payload, src, dst):
+        self.count += 1
+
+
+class LegacyReceive:
+    '''The previous receive path of NCPTransport.'''
+    def __init__(self, port, receiver):
+        self._receivers = [receiver]
+        self._udp6_parser = spinel.ipv6.IPv6PacketFactory(
+                            ulpf = {
+                                17: spinel.ipv6.UDPDatagramFactory(
+                                    udp_header_factory = spinel.ipv6.UDPHeaderFactory(),
+                                    dst_port_factories = {
+                                        port: spinel.ipv6.UDPBytesPayloadFactory()
+                                        }
+                                    ),
+                            })
+
+    def _wpan_receive(self, prop, value, tid):
+        try:
+            pkt = self._udp6_parser.parse(io.BytesIO(value), spinel.common.MessageInfo())
+            endpoint = collections.namedtuple('endpoint', 'addr port')
+            payload = pkt.upper_layer_protocol.payload.to_bytes()
+            src = endpoint(pkt.ipv6_header.source_address, pkt.upper_layer_protocol.header.src_port)
+            dst = endpoint(pkt.ipv6_header.destination_address, pkt.upper_layer_protocol.header.dst_port)
+            for receiver in self._receivers:
+                receiver.receive(payload, src, dst)
+        except RuntimeError:
+            pass
+        return True
+
+
+def legacy_propid_to_str(propid):
+    for name, value in SPINEL.__dict__.items():
+        if (name.startswith('PROP_') and value == propid):
+            return name
+
+
+def make_frames(transport, args):
+    rnd = random.Random(args.seed)
+    dst = ip_address('fd00::ff:fe00:fc00')
+    sources = [ip_address('fd00::ff:fe00:{:x}'.format(0x400 * (i + 1))) for i in range(args.sources)]
+    frames = []
+    for _ in range(args.frames):
+        port = PORT + 1 if rnd.random() < args.foreign else PORT
+        payload = bytes(rnd.getrandbits(8) for _ in range(args.size))
+        packet = transport._build_udp_datagram(rnd.choice(sources), PORT, dst, port, payload)
+        frames.append(bytes(packet.to_bytes()))
+    return frames
+
+
+def measure(receive, frames, repeat):
+    def run():
+        for frame in frames:
+            receive(SPINEL.PROP_STREAM_NET, frame, SPINEL.HEADER_ASYNC)
+
+    run()   # warm up the caches
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=20000, help='Number of frames, default: 20000')
+    parser.add_argument('--sources', type=int, default=32, help='Number of source nodes, default: 32')
+    parser.add_argument('--size', type=int, default=80, help='UDP payload size in bytes, default: 80')
+    parser.add_argument('--foreign', type=float, default=0.1,
+                        help='Fraction of frames to another port, default: 0.1')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions, best is reported, default: 5')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    if not 0 <= args.foreign <= 1:
+        parser.error("invalid foreign fraction: {0}".format(args.foreign))
+
+    transport = NCPTransport(PORT, 'u:/dev/null')
+    frames = make_frames(transport, args)
+    print("{0} frames of {1} byte payloads from {2} nodes, {3:.0%} to another port".format(
+          args.frames, args.size, args.sources, args.foreign))
+    print("  {0:<8} {1:>12} {2:>10} {3:>16}".format("path", "frames/s", "us/frame", "peak memory (B)"))
+
+    for name, receive_factory in (('legacy', lambda receiver: LegacyReceive(PORT, receiver)._wpan_receive),
+                                  ('current', lambda receiver: transport._wpan_receive)):
+        receiver = NullReceiver()
+        transport._receivers = [receiver]
+        best, peak = measure(receive_factory(receiver), frames, args.repeat)
+        print("  {0:<8} {1:>12.0f} {2:>10.2f} {3:>16}".format(
+              name, len(frames) / best, 1e6 * best / len(frames), peak))
+
+    props = [value for name, value in SPINEL.__dict__.items() if name.startswith('PROP_')]
+    for name, lookup in (('legacy', legacy_propid_to_str), ('current', NCPTransport._propid_to_str)):
+        best = min(timeit.repeat(lambda: [lookup(prop) for prop in props], number=10, repeat=args.repeat))
+        print("  property name lookup, {0:<8} {1:>8.2f} us".format(name, 1e6 * best / (10 * len(props))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Compares the zip compression strategies of Package.write_zip_package on the
+sample packages in tests/resources: package size, time to write the package
+and time to read all members back (as a DFU transport does).
+
+Usage: python tests/benchmarks/bench_package_zip.py [-n REPEAT] [package.zip ...]
+"""
+
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+from zipfile import ZipFile
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+from nordicsemi.dfu.package import Package
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+STRATEGIES = [
+    ('stored', None),
+    ('deflated', 1),
+    ('deflated', 6),
+    ('deflated', 9),
+]
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def read_members(data):
+    with ZipFile(io.BytesIO(data), 'r') as pkg:
+        return [pkg.read(name) for name in pkg.namelist()]
+
+
+def bench_package(path, repeat):
+    with ZipFile(path, 'r') as pkg:
+        contents = {name: pkg.read(name) for name in pkg.namelist()}
+
+    print("{0} ({1} members, {2} bytes uncompressed)".format(
+        os.path.basename(path), len(contents), sum(len(data) for data in contents.values())))
+    print("  {0:<12} {1:>10} {2:>12} {3:>12}".format("strategy", "size", "write (ms)", "read (ms)"))
+
+    for compression, level in STRATEGIES:
+        def write():
+            out = io.BytesIO()
+            Package.write_zip_package(contents, out, compression, level)
+            return out.getvalue()
+
+        write_time, data = best_of(repeat, write)
+        read_time, _ = best_of(repeat, lambda: read_members(data))
+
+        name = compression if level is None else "{0}-{1}".format(compression, level)
+        print("  {0:<12} {1:>10} {2:>12.2f} {3:>12.2f}".format(name, len(data), write_time * 1000, read_time * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--repeat', type=int, default=20, help='Repetitions per measurement, best is reported')
+    parser.add_argument('packages', nargs='*', help='Packages to benchmark, default: tests/resources/*.zip')
+    args = parser.parse_args()
+
+    packages = args.packages or sorted(glob.glob(os.path.join(RESOURCES_DIR, '*.zip')))
+    for path in packages:
+        bench_package(path, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
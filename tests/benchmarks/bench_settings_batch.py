@@ -0,0 +1,136 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Compares generating many bootloader settings pages one by one, each converting
+and hashing its images again as 'nrfutil settings generate' does, with the
+batch mode of nordicsemi.dfu.settings_batch. The combinations are made from the
+application and SoftDevice images in tests/resources.
+
+Usage: python tests/benchmarks/bench_settings_batch.py [-j JOBS] [--versions N]
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+from nordicsemi.dfu.bl_dfu_sett import BLDFUSettings
+from nordicsemi.dfu.settings_batch import spec_to_settings_args, generate_settings
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+
+FAMILIES = ['NRF52', 'NRF52840']
+
+
+def make_specs(out_dir, versions):
+    applications = sorted(glob.glob(os.path.join(RESOURCES_DIR, 'dfu_test_app_*.hex')))
+    softdevice = os.path.join(RESOURCES_DIR, 'dfu_test_softdevice_b.hex')
+
+    specs = []
+    for i, (family, application, app_ver, bl_ver) in enumerate(
+            itertools.product(FAMILIES, applications, range(1, versions + 1), range(1, versions + 1))):
+        specs.append({'hex_file': os.path.join(out_dir, 'settings_{0}.hex'.format(i)),
+                      'family': family,
+                      'application': application,
+                      'application_version': app_ver,
+                      'bootloader_version': bl_ver,
+                      'bl_settings_version': 2,
+                      'app_boot_validation': 'VALIDATE_GENERATED_SHA256',
+                      'softdevice': softdevice,
+                      'sd_boot_validation': 'VALIDATE_GENERATED_CRC'})
+    return specs
+
+
+def generate_one_by_one(specs):
+    for spec in specs:
+        sett = BLDFUSettings()
+        sett.generate(signer=None, **spec_to_settings_args(spec))
+        sett.tohexfile(spec['hex_file'])
+
+
+def read_outputs(specs):
+    outputs = []
+    for spec in specs:
+        with open(spec['hex_file'], 'rb') as f:
+            outputs.append(f.read())
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes of the batch, default: CPUs')
+    parser.add_argument('--versions', type=int, default=4, help='Application and bootloader versions per image')
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp(prefix='nrf_bench_settings_')
+    try:
+        specs = make_specs(out_dir, args.versions)
+        print("{0} settings pages".format(len(specs)))
+
+        start = time.perf_counter()
+        generate_one_by_one(specs)
+        one_by_one = time.perf_counter() - start
+        expected = read_outputs(specs)
+        print("  {0:<20} {1:>10.2f} s".format("one by one", one_by_one))
+
+        for jobs in (1, args.jobs or os.cpu_count()):
+            start = time.perf_counter()
+            generate_settings(specs, jobs=jobs)
+            batch = time.perf_counter() - start
+            assert read_outputs(specs) == expected
+
+            print("  {0:<20} {1:>10.2f} s  ({2:.1f}x)".format(
+                "batch, jobs={0}".format(jobs), batch, one_by_one / batch))
+    finally:
+        shutil.rmtree(out_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Compares the sign and verify throughput of the available signing backends,
+and the cost of loading a key.
+
+Usage: python tests/benchmarks/bench_signing.py [-n COUNT] [--size BYTES]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+from nordicsemi.dfu.signing import Signing, SIGNING_BACKENDS, available_backends
+
+KEY_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'nordicsemi', 'dfu', 'tests', 'key.pem')
+
+
+def rate(count, func):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--count', type=int, default=200, help='Operations per measurement')
+    parser.add_argument('--size', type=int, default=64, help='Size of the signed data, in bytes')
+    args = parser.parse_args()
+
+    data = os.urandom(args.size)
+    backends = available_backends()
+
+    print("key loading: {0:.0f} keys/s".format(rate(args.count, lambda: Signing().load_key(KEY_FILE))))
+    print("{0:<14} {1:>12} {2:>12}".format("backend", "sign/s", "verify/s"))
+
+    for name in SIGNING_BACKENDS:
+        if name not in backends:
+            print("{0:<14} {1:>12}".format(name, "unavailable"))
+            continue
+
+        signing = Signing(backend=name)
+        signing.load_key(KEY_FILE)
+        signature = signing.sign(data)
+        signature_be = signature[31::-1] + signature[63:31:-1]
+        assert signing.verify(data, signature_be)
+
+        sign_rate = rate(args.count, lambda: signing.sign(data))
+        verify_rate = rate(args.count, lambda: signing.verify(data, signature_be))
+        print("{0:<14} {1:>12.0f} {2:>12.0f}".format(name, sign_rate, verify_rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Measures the startup of nrfutil commands: wall time of the whole process and the import
+time reported by 'python -X importtime', with the modules that take the longest to import.
+
+With --budget the benchmark fails if the import time of a command exceeds the budget, for
+checking the startup on a machine with stable timings.
+
+Usage: python tests/benchmarks/bench_startup.py [-n REPEAT] [--top N] [--budget MS] [command ...]
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+RESOURCES_DIR = os.path.join(ROOT_DIR, 'tests', 'resources')
+
+COMMANDS = [
+    'version',
+    '--help',
+    'pkg generate --help',
+    'pkg display {0}'.format(os.path.join(RESOURCES_DIR, 'test_package.zip')),
+    'settings display {0}'.format(os.path.join(RESOURCES_DIR, 'dfu_test_app_hrm_s130.hex')),
+]
+
+
+def run(args, importtime):
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-m', 'nordicsemi'] + args
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    return time.perf_counter() - start, result.stderr
+
+
+def parse_importtime(output):
+    """
+    Returns a list of (module, cumulative time in ms) of the top level imports after the
+    interpreter startup, and the total import time.
+    """
+    modules = []
+    startup = True
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if startup:
+            # The interpreter startup ends with the import of site
+            startup = name.strip() != 'site'
+            continue
+        if not name.startswith('  '):
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return modules, sum(cumulative for _, cumulative in modules)
+
+
+def bench_command(command, repeat, top):
+    args = shlex.split(command)
+    best_wall = min(run(args, False)[0] for _ in range(repeat))
+
+    best = None
+    for _ in range(repeat):
+        _, output = run(args, True)
+        modules, total = parse_importtime(output)
+        if best is None or total < best[1]:
+            best = (modules, total)
+    modules, total = best
+
+    print("nrfutil {0}".format(command if len(command) < 60 else command[:57] + '...'))
+    print("  wall time {0:8.1f} ms, imports {1:8.1f} ms".format(best_wall * 1000, total))
+    for name, cumulative in sorted(modules, key=lambda m: -m[1])[:top]:
+        print("    {0:>8.1f} ms  {1}".format(cumulative, name))
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='Runs per command, best is reported')
+    parser.add_argument('--top', type=int, default=5, help='Number of slowest imports to list')
+    parser.add_argument('--budget', type=float, help='Import time budget per command in ms')
+    parser.add_argument('commands', nargs='*', help='Commands to measure, quoted, e.g. "pkg display x.zip"')
+    args = parser.parse_args()
+
+    over_budget = []
+    for command in args.commands or COMMANDS:
+        total = bench_command(command, args.repeat, args.top)
+        if args.budget is not None and total > args.budget:
+            over_budget.append(command)
+
+    if over_budget:
+        sys.exit("Over the {0} ms import budget: {1}".format(args.budget, ', '.join(over_budget)))
+
+
+if __name__ == '__main__':
+    main()
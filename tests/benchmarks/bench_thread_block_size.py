@@ -0,0 +1,302 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Simulates a multicast Thread DFU upload over a lossy 802.15.4 mesh and compares the completion
+time for each multicast block size. The ThreadDfuServer uploads the blocks as it does on a real
+network, paced by its rate controller, but on a simulated clock, so a run takes seconds.
+
+The network model:
+  * A packet carries the block plus about 30 bytes of compressed IPv6, UDP and CoAP headers and
+    is split into 802.15.4 frames of at most 127 bytes (6LoWPAN fragmentation). Each frame takes
+    its airtime at 250 kbit/s plus a CSMA backoff, once on every hop (MPL forwarding).
+  * A frame is lost with probability --loss on every hop, and a packet is lost when any of its
+    frames is. Packets sent faster than the mesh forwards them queue up, and are dropped for all
+    nodes once more than --queue packets wait.
+  * A node reports the missing blocks of a superblock when a block of a later superblock or the
+    last block of the superblock arrives, and of all superblocks when the server goes quiet for the
+    bitmap timeout.
+
+Usage: python tests/benchmarks/bench_thread_block_size.py [--image-size BYTES] [--nodes N] [--loss P] [SIZE ...]
+"""
+
+import argparse
+import math
+import os
+import random
+import struct
+import sys
+from argparse import Namespace
+from ipaddress import ip_address
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+os.environ.setdefault('TQDM_DISABLE', '1')
+
+import piccata
+from piccata.message import Message
+
+from nordicsemi.thread.dfu_server import ThreadDfuServer, ThreadDfuClient, _block_count
+from nordicsemi.thread.upload_rate import UploadRateController
+
+BLOCK_SIZES = [16, 32, 64, 128, 256, 512, 1024]
+
+BYTE_TIME = 8 / 250000.0    # 250 kbit/s
+PHY_OVERHEAD = 6            # preamble, SFD and length
+MAC_OVERHEAD = 25           # MAC header with security, MIC and FCS
+MAX_FRAME = 127
+FRAG1_HEADER = 4
+FRAGN_HEADER = 5
+PACKET_OVERHEAD = 30        # compressed IPv6 and UDP headers, MPL option, CoAP header and options
+FRAME_GAP = 0.0015          # mean CSMA backoff and turnaround, in seconds
+
+
+def frame_count(payload):
+    '''Return the number of 802.15.4 frames a packet with the given CoAP payload takes.'''
+    length = payload + PACKET_OVERHEAD
+    room = MAX_FRAME - MAC_OVERHEAD
+    if length <= room:
+        return 1
+    # Fragment payloads are multiples of 8 bytes
+    first = (room - FRAG1_HEADER) // 8 * 8
+    rest = (room - FRAGN_HEADER) // 8 * 8
+    return 1 + math.ceil((length - first) / rest)
+
+
+def frame_time(frames, payload):
+    '''Return the channel time of a packet sent once.'''
+    length = payload + PACKET_OVERHEAD + frames * (MAC_OVERHEAD + PHY_OVERHEAD + FRAGN_HEADER)
+    return length * BYTE_TIME + frames * FRAME_GAP
+
+
+class Done(Exception):
+    pass
+
+
+class Node:
+    def __init__(self, address, hops, counts):
+        self.remote = piccata.types.Endpoint(address, piccata.constants.COAP_PORT)
+        self.hops = hops
+        self.received = [bytearray(count) for count in counts]
+        self.last = None
+
+    def missing(self, index, superblock):
+        '''Return the bitmap of the blocks missing in a superblock, MSB first.'''
+        first = superblock * ThreadDfuServer.SPBLK_SIZE
+        blocks = self.received[index][first:first + ThreadDfuServer.SPBLK_SIZE]
+        bitmap = 0
+        for i, received in enumerate(blocks):
+            if not received:
+                bitmap |= 1 << (ThreadDfuServer.SPBLK_SIZE - 1 - i)
+        return bitmap
+
+    def complete(self):
+        return all(all(received) for received in self.received)
+
+
+class SimNetwork:
+    '''Stands in for piccata.core.Coap, delivers the blocks to the simulated nodes.'''
+    PATHS = (ThreadDfuServer.INIT_URI, ThreadDfuServer.IMAGE_URI)
+
+    def __init__(self, counts, nodes, max_hops, loss, queue, seed):
+        self.rnd = random.Random(seed)
+        self.counts = counts
+        self.nodes = [Node(ip_address('fd00::{:x}'.format(i + 1)), self.rnd.randint(1, max_hops), counts)
+                      for i in range(nodes)]
+        self.max_hops = max_hops
+        self.loss = loss
+        self.queue = queue
+        self.now = 0.0
+        self.busy_until = 0.0
+        self.server = None
+        self.sent = 0
+        self.dropped = 0
+        self.air_time = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+    def register_request_handler(self, handler):
+        self.server = handler
+
+    def _transmit(self, channel_time):
+        '''Queue a transmission on the channel, return False if the queue overflows.'''
+        start = max(self.now, self.busy_until)
+        if start - self.now > self.queue * channel_time:
+            return False
+        self.busy_until = start + channel_time
+        self.air_time += channel_time
+        return True
+
+    def request(self, request, callback=None, callback_args=None):
+        num, _, szx = request.opt.block1
+        index = self.PATHS.index(request.opt.uri_path[0])
+        frames = frame_count(len(request.payload))
+        self.sent += 1
+
+        if not self._transmit(frame_time(frames, len(request.payload)) * self.max_hops):
+            self.dropped += 1
+            return
+
+        key = (index, num // ThreadDfuServer.SPBLK_SIZE)
+        last = num == self.counts[index] - 1 or (num + 1) % ThreadDfuServer.SPBLK_SIZE == 0
+        for node in self.nodes:
+            if self.rnd.random() < 1 - (1 - self.loss) ** (frames * node.hops):
+                continue
+            node.received[index][num] = 1
+            if node.last is not None and key < node.last:
+                # A block sent again, the upload of the current superblock goes on
+                continue
+            if node.last is not None and node.last != key:
+                self.report(node, *node.last)
+            node.last = key
+            if last:
+                self.report(node, *key)
+                node.last = None
+
+    def report(self, node, index, superblock):
+        bitmap = node.missing(index, superblock)
+        self._transmit(frame_time(1, 10) * node.hops)
+        if self.rnd.random() < 1 - (1 - self.loss) ** node.hops:
+            return
+
+        request = Message(mtype=piccata.constants.NON, code=piccata.constants.PUT)
+        request.opt.uri_path = (ThreadDfuServer.BITMAP_URI, self.PATHS[index])
+        request.payload = struct.pack('!HQ', superblock * ThreadDfuServer.SPBLK_SIZE, bitmap)
+        request.remote = node.remote
+        self.server.receive_request(request)
+
+    def timeout(self):
+        '''The server went quiet: every node reports all superblocks it misses blocks of.'''
+        self.now = max(self.now, self.busy_until) + ThreadDfuServer.SPBLK_BMP_TIMEOUT
+        reported = False
+        for node in self.nodes:
+            node.last = None
+            for index, count in enumerate(self.counts):
+                for superblock in range(math.ceil(count / ThreadDfuServer.SPBLK_SIZE)):
+                    if node.missing(index, superblock):
+                        self.report(node, index, superblock)
+                        reported = True
+        if not reported:
+            raise Done()
+
+
+class TimeoutEvent:
+    '''Replaces the bitmap event of the server: waiting on it lets the simulated nodes time out.'''
+    def __init__(self, network):
+        self.network = network
+
+    def set(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def wait(self, timeout=None):
+        self.network.timeout()
+        return True
+
+
+def simulate(block_size, init, image, args):
+    opts = Namespace(rate=args.rate, max_rate=args.max_rate, mcast_dfu=True, reset_suppress=None,
+                     block_size=block_size)
+    szx = block_size.bit_length() - 5
+    counts = [_block_count(len(init), szx), _block_count(len(image), szx)]
+    network = SimNetwork(counts, args.nodes, args.hops, args.loss, args.queue, args.seed)
+
+    server = ThreadDfuServer(network, init, image, opts)
+    server.rate_controller = UploadRateController(args.rate, args.max_rate,
+                                                  clock=network.clock, sleep=network.sleep)
+    server.bmp_received_event = TimeoutEvent(network)
+
+    remote = piccata.types.Endpoint(ThreadDfuServer.REALM_LOCAL_ADDR, piccata.constants.COAP_PORT)
+    server.clients[remote] = ThreadDfuClient()
+    server.missing_blocks.add_all(server.init_resource)
+    server.missing_blocks.add_all(server.image_resource)
+
+    try:
+        server._upload(remote, server.missing_blocks)
+    except Done:
+        pass
+
+    assert all(node.complete() for node in network.nodes)
+    return network, server.rate_controller.stats(), sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--image-size', type=int, default=128 * 1024, help='Image size in bytes, default: 128 KB')
+    parser.add_argument('--nodes', type=int, default=10, help='Number of nodes, default: 10')
+    parser.add_argument('--hops', type=int, default=3, help='Largest number of hops to a node, default: 3')
+    parser.add_argument('--loss', type=float, default=0.01, help='Frame loss probability per hop, default: 0.01')
+    parser.add_argument('--queue', type=int, default=4, help='Packets queued in the mesh before drops, default: 4')
+    parser.add_argument('--rate', type=float, default=5, help='Initial upload rate in blocks/s, default: 5')
+    parser.add_argument('--max-rate', type=float, default=100, help='Highest upload rate in blocks/s, default: 100')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('sizes', nargs='*', type=int, help='Block sizes to compare: {0}, default: all'.format(
+                        ', '.join(str(size) for size in BLOCK_SIZES)))
+    args = parser.parse_args()
+    for size in args.sizes:
+        if size not in BLOCK_SIZES:
+            parser.error("invalid block size: {0}".format(size))
+
+    rnd = random.Random(args.seed)
+    init = bytes(rnd.getrandbits(8) for _ in range(140))
+    image = bytes(rnd.getrandbits(8) for _ in range(args.image_size))
+    print("Image {0} bytes, {1} nodes up to {2} hops, frame loss {3}, rate {4}-{5} blocks/s".format(
+        args.image_size, args.nodes, args.hops, args.loss, args.rate, args.max_rate))
+    print("  {0:>6} {1:>7} {2:>8} {3:>8} {4:>8} {5:>8} {6:>10} {7:>12}".format(
+          "block", "frames", "blocks", "sent", "dropped", "air (%)", "rate (B/s)", "complete (s)"))
+
+    for size in args.sizes or BLOCK_SIZES:
+        network, stats, blocks = simulate(size, init, image, args)
+        print("  {0:>6} {1:>7} {2:>8} {3:>8} {4:>8} {5:>8.1f} {6:>10.0f} {7:>12.1f}".format(
+              size, frame_count(size), blocks, network.sent, network.dropped,
+              100 * network.air_time / network.now, len(image) / network.now, network.now))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Runs a Thread DFU upload over UDP on loopback: the ThreadDfuServer on a UDPTransport, and simulated
+nodes, each on a UDPTransport of its own, dropping received datagrams with probability --loss. Unlike
+the simulated mesh of bench_thread_block_size.py, this exercises the CoAP stack, the sockets and
+the threads of both ends in real time, so the results show the overhead of the server itself.
+
+In unicast mode the nodes fetch the trigger, the init packet and the image concurrently. In multicast
+mode the server triggers the nodes and uploads to all of them at --rate blocks/s, then sends again
+the blocks they report missing.
+
+Usage: python tests/benchmarks/bench_thread_loopback.py [--mode unicast|multicast] [--nodes N] [--loss P]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from argparse import Namespace
+from ipaddress import ip_address
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+os.environ.setdefault('TQDM_DISABLE', '1')
+
+import piccata.core
+
+from nordicsemi.thread.dfu_server import ThreadDfuServer
+from nordicsemi.thread.sim_client import SimulatedDfuClient
+from nordicsemi.thread.udp_transport import UDPTransport
+
+MODES = ('unicast', 'multicast')
+GROUP = 'ff03::1'
+
+
+def run(init, image, args):
+    transports = []
+
+    def open_transport(**kwargs):
+        transport = UDPTransport(latency=args.latency, **kwargs)
+        transport.open()
+        transports.append(transport)
+        return transport
+
+    try:
+        server_transport = open_transport(loss=args.loss, seed=args.seed)
+        protocol = piccata.core.Coap(server_transport)
+        server_transport.register_receiver(protocol)
+        opts = Namespace(rate=args.rate, max_rate=args.max_rate, mcast_dfu=args.mode == 'multicast',
+                         reset_suppress=None, block_size=args.block_size, metrics=args.metrics)
+        server = ThreadDfuServer(protocol, init, image, opts)
+
+        clients = []
+        for i in range(args.nodes):
+            transport = open_transport(loss=args.loss, seed=args.seed + i + 1)
+            server_transport.join(GROUP, transport.endpoint)
+            clients.append(SimulatedDfuClient(transport,
+                                              block_szx=server.block_szx,
+                                              request_timeout=args.request_timeout,
+                                              bmp_timeout=ThreadDfuServer.SPBLK_BMP_TIMEOUT))
+
+        start = time.monotonic()
+        if args.mode == 'multicast':
+            server.trigger(ip_address(GROUP), 3)
+        else:
+            for client in clients:
+                thread = threading.Thread(target=client.fetch, args=(server_transport.endpoint,))
+                thread.daemon = True
+                thread.start()
+
+        for client in clients:
+            if not client.done_event.wait(max(0, start + args.timeout - time.monotonic())):
+                break
+        elapsed = time.monotonic() - start
+        server.metrics.close()
+
+        return clients, elapsed, server_transport
+    finally:
+        for transport in transports:
+            transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', default='unicast', help='Upload mode: {0}, default: unicast'.format(
+                        ', '.join(MODES)))
+    parser.add_argument('--image-size', type=int, default=32 * 1024, help='Image size in bytes, default: 32 KB')
+    parser.add_argument('--nodes', type=int, default=5, help='Number of nodes, default: 5')
+    parser.add_argument('--loss', type=float, default=0.05, help='Datagram loss probability, default: 0.05')
+    parser.add_argument('--latency', type=float, default=0.005, help='One-way latency in seconds, default: 0.005')
+    parser.add_argument('--block-size', type=int, default=64, help='Block size in bytes, default: 64')
+    parser.add_argument('--rate', type=float, default=200, help='Initial multicast rate in blocks/s, default: 200')
+    parser.add_argument('--max-rate', type=float, default=1000, help='Highest multicast rate in blocks/s, default: 1000')
+    parser.add_argument('--request-timeout', type=float, default=0.2,
+                        help='Unicast request timeout of the nodes in seconds, default: 0.2')
+    parser.add_argument('--bmp-timeout', type=float, default=0.5,
+                        help='Multicast bitmap timeout in seconds, default: 0.5')
+    parser.add_argument('--timeout', type=float, default=300, help='Time to give up after in seconds, default: 300')
+    parser.add_argument('--metrics', help='Store the events and the summary of the server in this JSON Lines file')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    if args.mode not in MODES:
+        parser.error("invalid mode: {0}".format(args.mode))
+
+    # Scale the multicast timing down to loopback
+    ThreadDfuServer.SPBLK_BMP_TIMEOUT = args.bmp_timeout
+    ThreadDfuServer.POST_UPLOAD_DELAY = 2 * args.bmp_timeout
+    ThreadDfuServer.ERASE_DELAY = 0.01
+
+    rnd = random.Random(args.seed)
+    init = bytes(rnd.getrandbits(8) for _ in range(140))
+    image = bytes(rnd.getrandbits(8) for _ in range(args.image_size))
+    print("{0} upload of {1} bytes to {2} nodes, loss {3}, latency {4}s, {5} byte blocks".format(
+          args.mode.capitalize(), args.image_size, args.nodes, args.loss, args.latency, args.block_size))
+
+    clients, elapsed, server_transport = run(init, image, args)
+
+    print("  {0:>4} {1:>5} {2:>9} {3:>9} {4:>10} {5:>8} {6:>12}".format(
+          "node", "done", "requests", "received", "duplicates", "bitmaps", "complete (s)"))
+    for i, client in enumerate(clients):
+        stats = client.stats()
+        print("  {0:>4} {1:>5} {2:>9} {3:>9} {4:>10} {5:>8} {6:>12}".format(
+              i, 'yes' if stats['done'] else 'no', stats['requests'], stats['blocks_received'],
+              stats['duplicates'], stats['bitmaps_sent'],
+              '{0:.2f}'.format(stats['duration']) if stats['duration'] is not None else '-'))
+
+    done = sum(client.done_event.is_set() for client in clients)
+    print("{0}/{1} nodes done in {2:.2f}s, {3:.0f} B/s per node, server received {4} datagrams".format(
+          done, len(clients), elapsed, len(image) / elapsed, server_transport.received))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Replays a multicast Thread DFU upload with synthetic bitmap storms, without a network and
+without the pacing delays, and measures the CPU time the server spends on tracking the
+missing blocks. After each superblock every node reports a bitmap of the blocks it lost,
+repeated --storm times, as many nodes answering the same superblock do.
+
+Compares the MissingBlocks tracker of the server with the list based tracking it replaced.
+
+Usage: python tests/benchmarks/bench_thread_missing_blocks.py [--image-size BYTES] [--nodes N] [--loss P]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(
+    os.path.normpath(
+        os.path.join(
+            os.path.dirname(__file__), '..', '..'
+        )
+    )
+)
+
+from nordicsemi.thread.dfu_server import ThreadDfuServer, MissingBlocks, Resource, _block_count
+
+
+class ListMissingBlocks:
+    '''The list of (resource, num) tuples the server used before MissingBlocks.'''
+    def __init__(self, resources, block_szx):
+        self.block_szx = block_szx
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def add_all(self, resource):
+        self.items.extend((resource, i) for i in range(_block_count(len(resource.data), self.block_szx)))
+
+    def add_bitmap(self, resource, num, bitmap, size):
+        added = 0
+        for i in range(size):
+            item = (resource, num + i)
+            if (bitmap & (1 << (size - 1 - i)) and item not in self.items):
+                self.items.append(item)
+                added += 1
+        return added
+
+    def pop(self):
+        self.items.sort(key = lambda item : (item[0].path[0] == ThreadDfuServer.IMAGE_URI, item[1]))
+        return self.items.pop(0)
+
+
+STRATEGIES = {
+    'list': ListMissingBlocks,
+    'missing-blocks': MissingBlocks,
+}
+
+
+def replay(tracker_class, init, image, nodes, loss, storm, seed):
+    rnd = random.Random(seed)
+    spblk_size = ThreadDfuServer.SPBLK_SIZE
+    tracker = tracker_class((init, image), ThreadDfuServer.BLOCK_SZX)
+
+    start = time.process_time()
+    tracker.add_all(init)
+    tracker.add_all(image)
+
+    sent = 0
+    bitmaps = 0
+    while len(tracker):
+        resource, num = tracker.pop()
+        sent += 1
+
+        last = _block_count(len(resource.data), ThreadDfuServer.BLOCK_SZX) - 1
+        if (num + 1) % spblk_size == 0 or num == last:
+            # Every node reports the blocks of this superblock it has lost
+            first = num - num % spblk_size
+            for _ in range(nodes):
+                bitmap = 0
+                for i in range(min(spblk_size, last - first + 1)):
+                    if rnd.random() < loss:
+                        bitmap |= 1 << (spblk_size - 1 - i)
+                for _ in range(storm):
+                    tracker.add_bitmap(resource, first, bitmap, spblk_size)
+                    bitmaps += 1
+
+    return time.process_time() - start, sent, bitmaps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--image-size', type=int, default=128 * 1024, help='Image size in bytes, default: 128 KB')
+    parser.add_argument('--nodes', type=int, default=10, help='Number of nodes reporting bitmaps, default: 10')
+    parser.add_argument('--loss', type=float, default=0.05, help='Block loss probability per node, default: 0.05')
+    parser.add_argument('--storm', type=int, default=3, help='Times each bitmap is received, default: 3')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('strategies', nargs='*', help='Trackers to compare: {0}, default: all'.format(
+                        ', '.join(STRATEGIES)))
+    args = parser.parse_args()
+    for name in args.strategies:
+        if name not in STRATEGIES:
+            parser.error("unknown tracker: {0}".format(name))
+
+    init = Resource((ThreadDfuServer.INIT_URI,), bytes(140))
+    image = Resource((ThreadDfuServer.IMAGE_URI,), bytes(args.image_size))
+    print("Image {0} bytes ({1} blocks), {2} nodes, loss {3}, storm {4}".format(
+        args.image_size, _block_count(args.image_size, ThreadDfuServer.BLOCK_SZX), args.nodes, args.loss, args.storm))
+    print("  {0:<16} {1:>10} {2:>10} {3:>12}".format("tracker", "sent", "bitmaps", "cpu (ms)"))
+
+    for name in args.strategies or STRATEGIES:
+        elapsed, sent, bitmaps = replay(STRATEGIES[name], init, image, args.nodes, args.loss, args.storm, args.seed)
+        print("  {0:<16} {1:>10} {2:>10} {3:>12.1f}".format(name, sent, bitmaps, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
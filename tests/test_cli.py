@@ -7,6 +7,7 @@ The behavior is inconsistent between 3.9 and 3.7 (3.7 fails)
 """
 import os
 import unittest
+from unittest import mock
 from click.testing import CliRunner
 from nordicsemi import __main__
 
@@ -35,6 +36,18 @@ class TestManifest(unittest.TestCase):
                                      '0', '--sd-id', '0x008C', 'test.zip'])
         self.assertIsNone(result.exception)
 
+    def test_pkg_gen_compression_level(self):
+        args = ['pkg', 'generate', '--application', 'resources/dfu_test_app_hrm_s130.hex',
+                '--hw-version', '52', '--sd-req', '0', '--application-version', '0', 'test.zip',
+                '--compression-level', '9']
+
+        result = self.runner.invoke(self.cli, args)
+        self.assertIn('--compression-level requires --compression deflated', result.output)
+        self.assertEqual(2, result.exit_code)
+
+        result = self.runner.invoke(self.cli, args + ['--compression', 'deflated'])
+        self.assertIsNone(result.exception)
+
     def test_dfu_ble_address(self):
         argumentList = ['dfu', 'ble', '-ic', 'NRF52', '-p', 'port', '-pkg',
                         'resources/test_package.zip', '--address']
@@ -61,6 +74,13 @@ class TestManifest(unittest.TestCase):
         self.assertIsInstance(result.exception, SystemExit)
         self.assertEqual(result.exception.code, SystemExit(2).code)
 
+    @mock.patch('nordicsemi.lister.device_lister.DeviceLister.get_device', return_value=None)
+    def test_dfu_serial_snr(self, get_device):
+        result = self.runner.invoke(self.cli, ['dfu', 'serial', '-pkg', 'resources/test_package.zip',
+                                               '-snr', '000123456789'])
+        get_device.assert_called_once_with(serial_number='000123456789')
+        self.assertIn('A device with serial number 000123456789 is not connected', str(result.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2026 Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#   1. Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+#   2. Redistributions in binary form must reproduce the above copyright notice, this
+#   list of conditions and the following disclaimer in the documentation and/or
+#   other materials provided with the distribution.
+#
+#   3. Neither the name of Nordic Semiconductor ASA nor the names of other
+#   contributors to this software may be used to endorse or promote products
+#   derived from this software without specific prior written permission.
+#
+#   4. This software must only be used in or with a processor manufactured by Nordic
+#   Semiconductor ASA, or in or with a processor manufactured by a third party that
+#   is used in combination with a processor manufactured by Nordic Semiconductor.
+#
+#   5. Any software provided in binary or object form under this license must not be
+#   reverse engineered, decompiled, modified and/or disassembled.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+Start nrfutil in a fresh interpreter with 'python -X importtime' and check that the commands
+only import what they use. The startup time itself is measured by tests/benchmarks/bench_startup.py.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Modules that are only needed by some commands
+HEAVY_MODULES = [
+    'concurrent.futures.process',
+    'cryptography',
+    'ecdsa',
+    'google.protobuf',
+    'intelhex',
+    'nordicsemi.dfu.dfu',
+    'nordicsemi.dfu.signing',
+    'nordicsemi.lister.device_lister',
+    'pc_ble_driver_py.ble_driver',
+    'serial',
+    'spinel',
+    'yaml',
+]
+
+
+def imported_modules(*args):
+    """
+    Run nrfutil with the given arguments and return the set of modules imported after the interpreter startup.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'nordicsemi'] + list(args),
+                            cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            universal_newlines=True, check=True)
+    modules = set()
+    startup = True
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        name = line.split('|')[-1].strip()
+        if startup:
+            # The interpreter startup ends with the import of site
+            startup = name != 'site'
+            continue
+        modules.add(name)
+    return modules
+
+
+class TestStartup(unittest.TestCase):
+    def assertNotImported(self, modules, names):
+        imported = [name for name in names if any(m == name or m.startswith(name + '.') for m in modules)]
+        self.assertEqual([], imported)
+
+    def test_version(self):
+        modules = imported_modules('version')
+        self.assertIn('nordicsemi.version', modules)
+        self.assertNotImported(modules, HEAVY_MODULES + ['nordicsemi.dfu.package'])
+
+    def test_pkg_display(self):
+        modules = imported_modules('pkg', 'display', os.path.join('tests', 'resources', 'test_package.zip'))
+        self.assertIn('nordicsemi.dfu.package', modules)
+        self.assertNotImported(modules, [name for name in HEAVY_MODULES if name != 'intelhex'])
+
+    def test_help(self):
+        modules = imported_modules('pkg', 'generate', '--help')
+        self.assertNotImported(modules, HEAVY_MODULES + ['nordicsemi.dfu.package'])
+
+    def test_option_choices(self):
+        # The command line repeats these to not import Package at startup
+        from nordicsemi import __main__
+        from nordicsemi.dfu.package import Package
+
+        self.assertEqual(list(Package.ZIP_COMPRESSION_TYPES), __main__.ZIP_COMPRESSION_ARGS)
+        self.assertEqual(Package.DEFAULT_ZIP_COMPRESSION, __main__.DEFAULT_ZIP_COMPRESSION)
+
+
+if __name__ == '__main__':
+    unittest.main()